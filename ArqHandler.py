@@ -7,17 +7,30 @@ Created on Jun 8, 2016
 
 
 This module is responsible for sending the incoming messages (data) to the given destination address using
-a simple Stop-and-Go ARQ technique.
+a simple Stop-and-Go ARQ technique. The retransmissions of all the messages are scheduled on a single
+TimerWheel.TimerWheel scheduler thread.
+The reliable data packets can also be sent using a sliding window Selective-Repeat ARQ technique, where up to
+ARQ_WINDOW_SIZE packets per neighbor are in flight at once, and the receiver acknowledges them with the cumulative and
+selective ACKs (SACK messages).
+The retransmission timeout (RTO) towards each neighbor is derived from the measured round-trip time (RTT) of the
+messages, using the Jacobson/Karels algorithm, and is exponentially backed off upon the retransmission timeouts, until
+the next valid RTT sample is received. As the retransmission timer of TCP is restarted by each ACK of new data, the
+retransmission of a Stop-and-Go message is postponed, while the neighbor keeps acknowledging the messages sent before
+it, so the bursts queued up at the neighbor are not retransmitted spuriously.
 """
 
 # Import necessary python modules from the standard library
 import threading
-import hashlib
 import time
+from random import randint
+from collections import deque
 
 # Import the necessary modules of the program
 import Messages
+import MessageHash
 import routing_logging
+from Transport import mac_to_str
+from conf import ARQ_WINDOW_SIZE, ARQ_INITIAL_RTO, ARQ_MIN_RTO, ARQ_MAX_RTO, TIMER_TICK_INTERVAL
 
 ## @var lock
 # Store the global threading.Lock object.
@@ -27,9 +40,16 @@ lock = threading.Lock()
 # Global routing_logging.LogWrapper object for logging ArqHandler activity.
 ARQ_HANDLER_LOG = routing_logging.create_routing_log("routing.arq_handler.log", "arq_handler")
 
-## @var max_int32
-# 32-bit mask constant.
-max_int32 = 0xFFFFFFFF
+## @var MAX_SEQ
+# 16-bit mask constant of the sequence numbers of the windowed data packets.
+MAX_SEQ = 0xFFFF
+## @var HALF_SEQ
+# Half of the sequence number space. A sequence number is considered to be "behind" the other one, if it is less than
+# HALF_SEQ steps behind it.
+HALF_SEQ = 0x8000
+## @var SACK_BITMAP_SIZE
+# Number of packets after the cumulative ACK, which are acknowledged by the SACK bitmap. It also limits the window size.
+SACK_BITMAP_SIZE = 32
 
 
 ## Main class for sending data and processing the corresponding ACKs.
@@ -38,18 +58,72 @@ class ArqHandler:
     # @param self The object pointer.
     # @param raw_transport Reference to Transport.RawTransport object.
     # @param table Reference to RouteTable.Table object.
+    # @param timer_wheel Reference to TimerWheel.TimerWheel object, which schedules the retransmissions.
+    # @param control_handler Reference to ControlHandler.ControlHandler object, or None if the aggregation of the
+    # control messages is disabled.
     # @return None
-    def __init__(self, raw_transport, table):
+    def __init__(self, raw_transport, table, timer_wheel, control_handler=None):
         # Create a dictionary which will contain a map between a (msg.id + dest_address) pair and the ArqRoutine object
         ## @var msg_thread_map
-        # Dictionary with {hash(msg.id + dest_address) : ArqHandler.ArqRoutine object}.
+        # Dictionary with {hash(msg.id + dest_address) : ArqHandler.ArqRoutine object}. A routine is stored under each
+        # of the hashes, which the receiver may reply with.
         self.msg_thread_map = {}
+        ## @var hash_modes
+        # MessageHash.HashModes object, which provides the hashing mode of the ACKs of each neighbor.
+        self.hash_modes = MessageHash.HashModes(table)
         ## @var raw_transport
         # Reference to Transport.RawTransport object.
         self.raw_transport = raw_transport
+        ## @var data_transport
+        # Reference to the object, which sends the frames of the ARQ-transmitted messages: ControlHandler.ControlHandler
+        # object, which piggybacks the pending control messages on them, or Transport.RawTransport object.
+        self.data_transport = raw_transport if control_handler is None else control_handler
+        ## @var send_ack_hash
+        # Create a reference to the default self.send_ack_hash method, depending on whether the aggregation of the
+        # control messages is enabled or not.
+        if control_handler is not None:
+            self.send_ack_hash = control_handler.add_ack
         ## @var table
         # Reference to RouteTable.Table object.
         self.table = table
+        ## @var timer_wheel
+        # Reference to TimerWheel.TimerWheel object, which schedules the retransmissions.
+        self.timer_wheel = timer_wheel
+        ## @var node_mac
+        # The node's own MAC address, as a 6-byte binary string, which is used for generating the ACK hashes.
+        self.node_mac = raw_transport.node_mac
+        ## @var window_size
+        # Maximum span of the sequence numbers of the windowed data packets, which are in flight towards a single
+        # neighbor.
+        self.window_size = max(1, min(ARQ_WINDOW_SIZE, SACK_BITMAP_SIZE))
+        ## @var send_windows
+        # Dictionary with the sending windows of the neighbors. Format: {mac: ArqHandler.SendWindow object}.
+        self.send_windows = dict()
+        ## @var receive_windows
+        # Dictionary with the receiving windows of the neighbors. Format: {mac: ArqHandler.ReceiveWindow object}.
+        self.receive_windows = dict()
+        ## @var rtt_estimators
+        # Dictionary with the RTT estimators of the neighbors. Format: {mac: ArqHandler.RttEstimator object}.
+        self.rtt_estimators = dict()
+
+    ## Get the RTT estimator of the given neighbor. The estimator is created, if it doesn't exist yet.
+    # @param self The object pointer.
+    # @param mac MAC address of the neighbor, as a 6-byte binary string.
+    # @return ArqHandler.RttEstimator object.
+    def get_rtt_estimator(self, mac):
+        if mac not in self.rtt_estimators:
+            lock.acquire()
+            if mac not in self.rtt_estimators:
+                self.rtt_estimators[mac] = RttEstimator()
+            lock.release()
+        return self.rtt_estimators[mac]
+
+    ## Get the current RTT statistics of all the neighbors.
+    # @param self The object pointer.
+    # @return dict() with {mac: dict() of the statistics}, where mac is in "xx:xx:xx:xx:xx:xx" format.
+    def get_rtt_stats(self):
+        return dict([(mac_to_str(mac), rtt_estimator.get_stats())
+                     for mac, rtt_estimator in self.rtt_estimators.items()])
 
     # TODO: refactor those two methods into a single one to remove code redundancy.
     ## Start the ARQ send for the given message and for each destination address in the dest_list.
@@ -61,17 +135,17 @@ class ArqHandler:
     # @return None
     def arq_send(self, message, dest_mac_list, payload=""):
         for dst_address in dest_mac_list:
-            ARQ_HANDLER_LOG.debug("ARQ_SEND for %s", dst_address)
-            # Add an entry to msg_thread_map and create a ArqRoutine thread
-            hash_str = hashlib.md5(str(message.id) + dst_address).hexdigest()
-            # Convert hash_str from hex to 32-bit integer
-            hash_int = int(hash_str, 16) & max_int32
+            if ARQ_HANDLER_LOG.debug_enabled:
+                ARQ_HANDLER_LOG.debug("ARQ_SEND for %s", mac_to_str(dst_address))
+            # Add the entries to msg_thread_map and create a ArqRoutine object.
+            # The hashes are generated from the receiver's MAC address, as it is done on the receiving side.
+            hash_mode = self.hash_modes.get_mode(dst_address)
+            hash_ints = MessageHash.get_ack_hashes(message.id, dst_address, hash_mode)
 
-            lock.acquire()
-            self.msg_thread_map[hash_int] = ArqRoutine(hash_int, self.msg_thread_map, self.raw_transport,
-                                                       message, payload, dst_address)
-            lock.release()
-            self.msg_thread_map[hash_int].start()
+            arq_routine = ArqRoutine(hash_ints, hash_mode, self.msg_thread_map, self.data_transport, self.timer_wheel,
+                                     self.get_rtt_estimator(dst_address), message, payload, dst_address)
+            self.register_routine(arq_routine)
+            arq_routine.start()
 
     ## Start the ARQ broadcast send for the given message.
     # The message will be sent to ALL current neighbors of the node.
@@ -83,17 +157,36 @@ class ArqHandler:
     def arq_broadcast_send(self, message, payload=""):
         dest_mac_list = self.table.get_neighbors()
         for dst_address in dest_mac_list:
-            ARQ_HANDLER_LOG.debug("ARQ_SEND for %s", dst_address)
-            # Add an entry to msg_thread_map and create a ArqRoutine thread
-            hash_str = hashlib.md5(str(message.id) + dst_address).hexdigest()
-            # Convert hash_str from hex to 32-bit integer
-            hash_int = int(hash_str, 16) & max_int32
+            if ARQ_HANDLER_LOG.debug_enabled:
+                ARQ_HANDLER_LOG.debug("ARQ_SEND for %s", mac_to_str(dst_address))
+            # Add the entries to msg_thread_map and create a ArqRoutine object.
+            # The hashes are generated from the receiver's MAC address, as it is done on the receiving side.
+            hash_mode = self.hash_modes.get_mode(dst_address)
+            hash_ints = MessageHash.get_ack_hashes(message.id, dst_address, hash_mode)
 
-            lock.acquire()
-            self.msg_thread_map[hash_int] = ArqRoutine(hash_int, self.msg_thread_map, self.raw_transport,
-                                                       message, payload, dst_address)
-            lock.release()
-            self.msg_thread_map[hash_int].start()
+            arq_routine = ArqRoutine(hash_ints, hash_mode, self.msg_thread_map, self.data_transport, self.timer_wheel,
+                                     self.get_rtt_estimator(dst_address), message, payload, dst_address)
+            self.register_routine(arq_routine)
+            arq_routine.start()
+
+    ## Add the routine to the msg_thread_map under all its hashes. The routine, which has been started earlier for the
+    # same message and the same receiver (e.g., a duplicate of the message, forwarded again), is replaced and stopped,
+    # since it would never get its ACK, and would retransmit the message until the maximum number of retries.
+    # @param self The object pointer.
+    # @param arq_routine ArqHandler.ArqRoutine object.
+    # @return None
+    def register_routine(self, arq_routine):
+        replaced = list()
+        lock.acquire()
+        for hash_int in arq_routine.hash_ints:
+            previous = self.msg_thread_map.get(hash_int)
+            if previous is not None:
+                replaced.append(previous)
+            self.msg_thread_map[hash_int] = arq_routine
+        lock.release()
+        for previous in replaced:
+            previous.quit()
+            previous.remove()
 
     ## Process the ACK message, received from the transport or some another receiving thread.
     # @param self The object pointer.
@@ -101,15 +194,22 @@ class ArqHandler:
     # @return None
     def process_ack(self, ack_message):
         hash_int = ack_message.msg_hash
+        arq_routine = self.msg_thread_map.get(hash_int)
         # Check if the given hash_int is in the msg_thread_map
-        if hash_int in self.msg_thread_map:
-            # If yes, stop the corresponding thread
-            self.msg_thread_map[hash_int].quit()
-            # Delete the entry
-            lock.acquire()
-            if self.msg_thread_map.get(hash_int):
-                del self.msg_thread_map[hash_int]
-            lock.release()
+        if arq_routine is not None:
+            # Keep the mode of the ACK, if it could come in either of the modes
+            if len(arq_routine.hash_ints) > 1:
+                self.hash_modes.on_reply(arq_routine.dst_address,
+                                         arq_routine.ack_modes[arq_routine.hash_ints.index(hash_int)])
+            # Karn's algorithm: the RTT is sampled only from the messages, which have been sent exactly once
+            if arq_routine.count == 1:
+                arq_routine.rtt_estimator.add_sample(time.time() - arq_routine.send_time)
+            # The ACK of a retransmitted message may belong to any of its send attempts, so its send time is unknown
+            arq_routine.rtt_estimator.on_ack(arq_routine.send_time if arq_routine.count == 1 else 0.0)
+            # Cancel the pending retransmission of the corresponding routine
+            arq_routine.quit()
+            # Delete the entries
+            arq_routine.remove()
         else:
             # If no such hash in the map, just ignore it, and do nothing
             ARQ_HANDLER_LOG.info("No such ACK with this hash!!! Do nothing...")
@@ -120,44 +220,115 @@ class ArqHandler:
     # @param dst_mac Destination MAC address to send the ACK message to.
     # @return None
     def send_ack(self, message, dst_mac):
-        ARQ_HANDLER_LOG.info("Sending ACK back on the message %s", str(message))
-        # Generate hash from the given message id
-        hash_str = hashlib.md5(str(message.id) + self.raw_transport.node_mac).hexdigest()
-        # Convert hash_str from hex to 32-bit integer
-        hash_int = int(hash_str, 16) & max_int32
+        if ARQ_HANDLER_LOG.info_enabled:
+            ARQ_HANDLER_LOG.info("Sending ACK back on the message %s", str(message))
+        # Generate hash from the given message id, in the hashing mode supported by the sender of the message
+        hash_int = MessageHash.get_ack_hash(message.id, self.node_mac, self.table.get_neighbor_version(dst_mac))
+        self.send_ack_hash(dst_mac, hash_int)
+
+    ## Default method for sending the ACK with the given hash to the dst_mac in a separate frame.
+    # It is being overridden in the constructor, if the aggregation of the control messages is enabled.
+    # @param self The object pointer.
+    # @param dst_mac Destination MAC address to send the ACK message to.
+    # @param hash_int 32-bit hash value of the acknowledged message.
+    # @return None
+    def send_ack_hash(self, dst_mac, hash_int):
         # Create ACK message object
         ack_message = Messages.AckMessage()
         ack_message.msg_hash = hash_int
         # Send the message
         self.raw_transport.send_raw_frame(dst_mac, ack_message, "")
 
+    ## Send the data packet to the dst_mac using the sliding window Selective-Repeat ARQ.
+    # If the window towards the dst_mac is full, the packet is queued until the window slides. If the neighbor doesn't
+    # support the windowed data packets, the packet is sent using the Stop-and-Go ARQ instead.
+    # @param self The object pointer.
+    # @param dst_mac Destination MAC address, as a 6-byte binary string.
+    # @param payload Payload of the transmitted frame.
+    # @param hop_count Hop count value of the packet.
+    # @return None
+    def window_send(self, dst_mac, payload, hop_count):
+        if self.table.get_neighbor_version(dst_mac) < Messages.WINDOWED_ARQ_VERSION:
+            dsr_message = Messages.ReliableDataPacket()
+            dsr_message.hop_count = hop_count
+            self.arq_send(dsr_message, [dst_mac], payload)
+            return
+
+        if dst_mac not in self.send_windows:
+            rtt_estimator = self.get_rtt_estimator(dst_mac)
+            lock.acquire()
+            if dst_mac not in self.send_windows:
+                self.send_windows[dst_mac] = SendWindow(dst_mac, self.data_transport, self.timer_wheel,
+                                                        rtt_estimator, self.window_size)
+            lock.release()
+        self.send_windows[dst_mac].send(payload, hop_count)
+
+    ## Process the windowed data packet, received from the src_mac, and send the SACK back.
+    # @param self The object pointer.
+    # @param src_mac Source MAC address of the packet, as a 6-byte binary string.
+    # @param dsr_message Messages.WindowedDataPacket object received from the network.
+    # @return True if the packet is received for the first time, False if it is a duplicate.
+    def window_receive(self, src_mac, dsr_message):
+        if src_mac not in self.receive_windows:
+            self.receive_windows[src_mac] = ReceiveWindow()
+        receive_window = self.receive_windows[src_mac]
+        is_new = receive_window.receive(dsr_message)
+        # Send back the SACK on the received packet in ALL cases
+        self.data_transport.send_raw_frame(src_mac, receive_window.get_sack(), "")
+        return is_new
+
+    ## Process the SACK message, received from the src_mac.
+    # @param self The object pointer.
+    # @param src_mac Source MAC address of the SACK, as a 6-byte binary string.
+    # @param sack_message Messages.SackMessage object received from the network.
+    # @return None
+    def process_sack(self, src_mac, sack_message):
+        send_window = self.send_windows.get(src_mac)
+        if send_window is None:
+            ARQ_HANDLER_LOG.info("No sending window for this SACK!!! Do nothing...")
+        else:
+            send_window.process_sack(sack_message)
+
 
-## A routine ARQ thread class which is responsible for sending the given message/data periodically in a timeout
-# interval, until the corresponding ARQ has been received.
-class ArqRoutine(threading.Thread):
+## A routine ARQ class which is responsible for sending the given message/data periodically in a timeout
+# interval, until the corresponding ARQ has been received. The retransmissions are scheduled on the shared
+# TimerWheel.TimerWheel object, instead of running a separate thread for each message.
+class ArqRoutine:
     ## Constructor.
     # @param self The object pointer.
-    # @param hash_int 32-bit hash value of message ID and destination IP pair.
+    # @param hash_ints Tuple of 32-bit hash values of message ID and destination MAC pair, which the ACK may carry.
+    # @param hash_mode Mode mask of the hash_ints, see MessageHash.HashModes.
     # @param msg_thread_map Reference to ArqHandler.ArqHandler.msg_thread_map dictionary.
     # @param raw_transport Reference to Transport.RawTransport object.
+    # @param timer_wheel Reference to TimerWheel.TimerWheel object, which schedules the retransmissions.
+    # @param rtt_estimator Reference to ArqHandler.RttEstimator object of the destination neighbor.
     # @param message Message from Messages module to send.
     # @param payload Payload string to the message.
-    # @param dst_address Destination MAC address string.
+    # @param dst_address Destination MAC address as a 6-byte binary string.
     # @return None
-    def __init__(self, hash_int, msg_thread_map, raw_transport, message, payload, dst_address):
-        super(ArqRoutine, self).__init__()
+    def __init__(self, hash_ints, hash_mode, msg_thread_map, raw_transport, timer_wheel, rtt_estimator, message,
+                 payload, dst_address):
         ## @var running
-        # Thread running state bool() flag.
+        # Routine running state bool() flag.
         self.running = False
-        ## @var hash_int
-        # 32-bit hash value of message ID and destination IP pair.
-        self.hash_int = hash_int
+        ## @var hash_ints
+        # Tuple of 32-bit hash values of message ID and destination MAC pair, which the ACK may carry.
+        self.hash_ints = hash_ints
+        ## @var ack_modes
+        # Tuple of the hashing modes of the hash_ints, in the same order.
+        self.ack_modes = MessageHash.MODE_ORDERS[hash_mode]
         ## @var msg_thread_map
         # Reference to ArqHandler.ArqHandler.msg_thread_map dictionary.
         self.msg_thread_map = msg_thread_map
         ## @var raw_transport
         # Reference to Transport.RawTransport object.
         self.raw_transport = raw_transport
+        ## @var timer_wheel
+        # Reference to TimerWheel.TimerWheel object, which schedules the retransmissions.
+        self.timer_wheel = timer_wheel
+        ## @var rtt_estimator
+        # Reference to ArqHandler.RttEstimator object of the destination neighbor, which provides the timeout interval.
+        self.rtt_estimator = rtt_estimator
         ## @var dsr_message
         # Message from Messages module to send.
         self.dsr_message = message
@@ -171,42 +342,443 @@ class ArqRoutine(threading.Thread):
         ## @var max_retries
         # A number of maximum possible send retires if the ACK hasn't been received. int().
         self.max_retries = 5
-        ## @var timeout_interval
-        # Timeout interval after which the ACK message is considered to be lost, and, therefore, a message
-        # retransmission attempt should be performed. float().
-        self.timeout_interval = 0.5
+        ## @var count
+        # A number of performed send attempts. int().
+        self.count = 0
+        ## @var send_time
+        # Timestamp of the last send attempt, which is used for the RTT sampling.
+        self.send_time = 0.0
+        ## @var timeout
+        # Retransmission timeout (in seconds) of the last send attempt.
+        self.timeout = 0.0
+        ## @var timer
+        # TimerWheel.Timer object of the pending retransmission, or None.
+        self.timer = None
 
-    ## Main thread routine.
+    ## Send the message for the first time, and schedule its retransmission.
     # @param self The object pointer.
     # @return None
-    def run(self):
+    def start(self):
         self.running = True
-        count = 0
-        while self.running:
-            if count < self.max_retries:
-                self.send_msg()
-                time.sleep(self.timeout_interval)
-            else:
-                # Max retries reached. Delete corresponding message hashes msg_thread_map, stop the thread
-                ARQ_HANDLER_LOG.info("Maximum ARQ retries reached!!! Deleting the ARQ thread...")
-                lock.acquire()
-                if self.msg_thread_map.get(self.hash_int):
-                    del self.msg_thread_map[self.hash_int]
-                lock.release()
-                # Stop the thread
-                self.quit()
-
-            count += 1
+        self.on_timeout()
+
+    ## Perform the next send attempt upon the timeout, or drop the message if the maximum number of retries has
+    # been reached.
+    # @param self The object pointer.
+    # @return None
+    def on_timeout(self):
+        if not self.running:
+            return
+        # The message is still queued up at the neighbor behind the acknowledged ones, so the timeout is restarted
+        if self.count and self.rtt_estimator.is_draining(self.send_time, self.timeout):
+            self.timer = self.timer_wheel.schedule(self.timeout, self.on_timeout)
+            return
+        # The ACK hasn't been received within the timeout
+        if self.count:
+            self.rtt_estimator.on_timeout(self.timeout, self.send_time)
+        # The receiver may reply in the other mode, so the ACKs of the retransmissions are accepted in both modes
+        if self.count == 1 and len(self.ack_modes) == 1:
+            self.add_fallback_hash()
+        if self.count < self.max_retries:
+            # The attempt is counted before sending, so the ACK, processed on the receiving thread, always sees it
+            self.count += 1
+            self.send_time = time.time()
+            self.timeout = self.rtt_estimator.get_timeout()
+            self.send_msg()
+            self.timer = self.timer_wheel.schedule(self.timeout, self.on_timeout)
+        else:
+            # Max retries reached. Delete corresponding message hashes msg_thread_map, stop the routine
+            ARQ_HANDLER_LOG.info("Maximum ARQ retries reached!!! Deleting the ARQ routine...")
+            self.remove()
+            # Stop the routine
+            self.quit()
+
+    ## Add the hash of the other hashing mode to the routine and to the msg_thread_map.
+    # @param self The object pointer.
+    # @return None
+    def add_fallback_hash(self):
+        fallback_mode = MessageHash.ANY_MODE ^ self.ack_modes[0]
+        hash_int = MessageHash.get_ack_hashes(self.dsr_message.id, self.dst_address, fallback_mode)[0]
+        lock.acquire()
+        self.hash_ints += (hash_int,)
+        self.ack_modes += (fallback_mode,)
+        self.msg_thread_map.setdefault(hash_int, self)
+        lock.release()
 
     ## Send message with the dsr header to the dst_address.
     # @param self The object pointer.
     # @return None
     def send_msg(self):
         self.raw_transport.send_raw_frame(self.dst_address, self.dsr_message, self.payload)
-        ARQ_HANDLER_LOG.debug("Sent raw frame on: %s", self.dst_address)
+        if ARQ_HANDLER_LOG.debug_enabled:
+            ARQ_HANDLER_LOG.debug("Sent raw frame on: %s", mac_to_str(self.dst_address))
 
-    ## Stop and quit the thread operation.
+    ## Delete all the hashes of the routine from the msg_thread_map.
+    # @param self The object pointer.
+    # @return None
+    def remove(self):
+        lock.acquire()
+        for hash_int in self.hash_ints:
+            if self.msg_thread_map.get(hash_int) is self:
+                del self.msg_thread_map[hash_int]
+        lock.release()
+
+    ## Stop the routine and cancel its pending retransmission.
     # @param self The object pointer.
     # @return None
     def quit(self):
         self.running = False
+        if self.timer is not None:
+            self.timer.cancel()
+
+
+## A class which represents a single windowed data packet in flight.
+class WindowSlot:
+    ## Constructor.
+    # @param self The object pointer.
+    # @param message Messages.WindowedDataPacket object.
+    # @param payload Payload string to the message.
+    # @return None
+    def __init__(self, message, payload):
+        ## @var message
+        # Messages.WindowedDataPacket object.
+        self.message = message
+        ## @var payload
+        # Payload string to the message.
+        self.payload = payload
+        ## @var count
+        # A number of performed send attempts. int().
+        self.count = 0
+        ## @var send_time
+        # Timestamp of the last send attempt.
+        self.send_time = 0.0
+        ## @var timeout
+        # Retransmission timeout (in seconds) of the last send attempt.
+        self.timeout = 0.0
+        ## @var timer
+        # TimerWheel.Timer object of the pending retransmission, or None.
+        self.timer = None
+
+
+## Sending window of the Selective-Repeat ARQ towards a single neighbor.
+# The packets within window_size sequence numbers from the oldest unacknowledged one are sent without waiting for the
+# ACKs, each of them is retransmitted on its own timeout,
+# until it is acknowledged by a SACK message, or until the maximum number of retries is reached.
+class SendWindow:
+    ## Constructor.
+    # @param self The object pointer.
+    # @param dst_mac Destination MAC address as a 6-byte binary string.
+    # @param raw_transport Reference to Transport.RawTransport object.
+    # @param timer_wheel Reference to TimerWheel.TimerWheel object, which schedules the retransmissions.
+    # @param rtt_estimator Reference to ArqHandler.RttEstimator object of the destination neighbor.
+    # @param window_size Maximum span of the sequence numbers in flight.
+    # @return None
+    def __init__(self, dst_mac, raw_transport, timer_wheel, rtt_estimator, window_size):
+        ## @var dst_mac
+        # Destination MAC address as a 6-byte binary string.
+        self.dst_mac = dst_mac
+        ## @var raw_transport
+        # Reference to Transport.RawTransport object.
+        self.raw_transport = raw_transport
+        ## @var timer_wheel
+        # Reference to TimerWheel.TimerWheel object, which schedules the retransmissions.
+        self.timer_wheel = timer_wheel
+        ## @var rtt_estimator
+        # Reference to ArqHandler.RttEstimator object of the destination neighbor, which provides the timeout interval.
+        self.rtt_estimator = rtt_estimator
+        ## @var window_size
+        # Maximum span of the sequence numbers in flight, from the oldest unacknowledged packet to the next new one.
+        self.window_size = window_size
+        ## @var session_id
+        # Random ID of the window session. It lets the receiver detect the restart of the sender.
+        self.session_id = randint(0, Messages.MAX_ID)
+        ## @var next_seq
+        # Sequence number of the next new packet.
+        self.next_seq = 0
+        ## @var base
+        # Sequence number of the oldest unacknowledged packet.
+        self.base = 0
+        ## @var in_flight
+        # Dictionary with the unacknowledged packets. Format: {seq: ArqHandler.WindowSlot object}.
+        self.in_flight = dict()
+        ## @var backlog
+        # Queue of (payload, hop_count) of the packets, which are waiting for the window to slide.
+        # The oldest packets are dropped, if the queue is full.
+        self.backlog = deque(maxlen=window_size * 16)
+        ## @var max_retries
+        # A number of maximum possible send retires if the ACK hasn't been received. int().
+        self.max_retries = 5
+        ## @var lock
+        # threading.Lock object, which protects the window state.
+        self.lock = threading.Lock()
+
+    ## Send the packet, or queue it, if the window is full.
+    # @param self The object pointer.
+    # @param payload Payload of the transmitted frame.
+    # @param hop_count Hop count value of the packet.
+    # @return None
+    def send(self, payload, hop_count):
+        self.lock.acquire()
+        # The window is limited by the span of the sequence numbers, rather than by the number of the packets in flight,
+        # so that every packet in flight can be acknowledged by the SACK bitmap
+        if (self.next_seq - self.base) & MAX_SEQ < self.window_size:
+            self.send_new(payload, hop_count)
+        else:
+            self.backlog.append((payload, hop_count))
+        self.lock.release()
+
+    ## Assign the next sequence number to the packet, and send it. Must be called under the window lock.
+    # @param self The object pointer.
+    # @param payload Payload of the transmitted frame.
+    # @param hop_count Hop count value of the packet.
+    # @return None
+    def send_new(self, payload, hop_count):
+        message = Messages.WindowedDataPacket()
+        message.id = self.session_id
+        message.hop_count = hop_count
+        message.seq = self.next_seq
+        self.next_seq = (self.next_seq + 1) & MAX_SEQ
+        window_slot = WindowSlot(message, payload)
+        self.in_flight[message.seq] = window_slot
+        self.transmit(window_slot)
+
+    ## Transmit the packet, and schedule its retransmission. Must be called under the window lock.
+    # @param self The object pointer.
+    # @param window_slot ArqHandler.WindowSlot object of the packet.
+    # @return None
+    def transmit(self, window_slot):
+        window_slot.message.base = self.base
+        window_slot.count += 1
+        window_slot.send_time = time.time()
+        window_slot.timeout = self.rtt_estimator.get_timeout()
+        self.raw_transport.send_raw_frame(self.dst_mac, window_slot.message, window_slot.payload)
+        window_slot.timer = self.timer_wheel.schedule(window_slot.timeout, self.on_timeout, window_slot)
+
+    ## Retransmit the packet upon the timeout, or drop it, if the maximum number of retries has been reached.
+    # @param self The object pointer.
+    # @param window_slot ArqHandler.WindowSlot object of the packet.
+    # @return None
+    def on_timeout(self, window_slot):
+        self.lock.acquire()
+        # The packet has been acknowledged right before the timeout
+        if self.in_flight.get(window_slot.message.seq) is not window_slot:
+            self.lock.release()
+            return
+        # The SACK hasn't been received within the timeout
+        self.rtt_estimator.on_timeout(window_slot.timeout, window_slot.send_time)
+        if window_slot.count < self.max_retries:
+            self.transmit(window_slot)
+        else:
+            ARQ_HANDLER_LOG.info("Maximum ARQ retries reached!!! Dropping the packet from the window...")
+            del self.in_flight[window_slot.message.seq]
+            self.slide()
+        self.lock.release()
+
+    ## Remove all the packets, acknowledged by the SACK message, from the window.
+    # @param self The object pointer.
+    # @param sack_message Messages.SackMessage object.
+    # @return None
+    def process_sack(self, sack_message):
+        # The SACK belongs to the previous session of the window
+        if sack_message.id != self.session_id:
+            return
+        self.lock.acquire()
+        # Timestamp of the latest acknowledged packet, which hasn't been retransmitted (Karn's algorithm)
+        last_send_time = None
+        for seq in self.in_flight.keys():
+            offset = (seq - sack_message.cum_seq) & MAX_SEQ
+            # Either acknowledged cumulatively, or marked in the SACK bitmap
+            if offset >= HALF_SEQ or (0 < offset <= SACK_BITMAP_SIZE and sack_message.sack_bitmap >> (offset - 1) & 1):
+                window_slot = self.in_flight.pop(seq)
+                window_slot.timer.cancel()
+                if window_slot.count == 1 and (last_send_time is None or window_slot.send_time > last_send_time):
+                    last_send_time = window_slot.send_time
+        if last_send_time is not None:
+            self.rtt_estimator.add_sample(time.time() - last_send_time)
+        self.slide()
+        self.lock.release()
+
+    ## Move the base of the window to the oldest unacknowledged packet, and send the queued packets, while the window
+    # isn't full. Must be called under the window lock.
+    # @param self The object pointer.
+    # @return None
+    def slide(self):
+        if self.in_flight:
+            self.base = min(self.in_flight, key=lambda seq: (seq - self.base) & MAX_SEQ)
+        else:
+            self.base = self.next_seq
+        while self.backlog and (self.next_seq - self.base) & MAX_SEQ < self.window_size:
+            self.send_new(*self.backlog.popleft())
+
+
+## Receiving window of the Selective-Repeat ARQ from a single neighbor.
+# The packets are delivered right away upon the first reception, in any order, and the duplicates are filtered out.
+class ReceiveWindow:
+    ## Constructor.
+    # @param self The object pointer.
+    # @return None
+    def __init__(self):
+        ## @var session_id
+        # ID of the sender's window session, or None, if nothing has been received yet.
+        self.session_id = None
+        ## @var expected_seq
+        # Sequence number of the next expected packet. All the packets before it have been received.
+        self.expected_seq = 0
+        ## @var received
+        # Set of the sequence numbers of the received packets after the expected_seq.
+        self.received = set()
+
+    ## Register the received packet in the window.
+    # @param self The object pointer.
+    # @param dsr_message Messages.WindowedDataPacket object.
+    # @return True if the packet is received for the first time, False if it is a duplicate.
+    def receive(self, dsr_message):
+        # A new session of the sender's window has been started
+        if dsr_message.id != self.session_id:
+            self.session_id = dsr_message.id
+            self.expected_seq = dsr_message.base
+            self.received.clear()
+
+        # The sender has dropped the packets before its base, so they won't be received anymore
+        if 0 < (dsr_message.base - self.expected_seq) & MAX_SEQ < HALF_SEQ:
+            self.expected_seq = dsr_message.base
+            self.received = set([seq for seq in self.received if (seq - self.expected_seq) & MAX_SEQ < HALF_SEQ])
+            self.advance()
+
+        offset = (dsr_message.seq - self.expected_seq) & MAX_SEQ
+        if offset >= HALF_SEQ or dsr_message.seq in self.received:
+            return False
+
+        if offset == 0:
+            self.expected_seq = (self.expected_seq + 1) & MAX_SEQ
+            self.advance()
+        else:
+            self.received.add(dsr_message.seq)
+        return True
+
+    ## Move the expected_seq over the already received packets.
+    # @param self The object pointer.
+    # @return None
+    def advance(self):
+        while self.expected_seq in self.received:
+            self.received.remove(self.expected_seq)
+            self.expected_seq = (self.expected_seq + 1) & MAX_SEQ
+
+    ## Generate the SACK message with the current state of the window.
+    # @param self The object pointer.
+    # @return Messages.SackMessage object.
+    def get_sack(self):
+        sack_message = Messages.SackMessage()
+        sack_message.id = self.session_id
+        sack_message.cum_seq = self.expected_seq
+        for seq in self.received:
+            offset = (seq - self.expected_seq) & MAX_SEQ
+            if offset <= SACK_BITMAP_SIZE:
+                sack_message.sack_bitmap |= 1 << (offset - 1)
+        return sack_message
+
+
+## Round-trip time estimator of a single neighbor.
+# The smoothed RTT (SRTT) and the RTT variation (RTTVAR) are calculated from the RTT samples with the Jacobson/Karels
+# algorithm, and the retransmission timeout is RTO = SRTT + max(G, K * RTTVAR), where G is the timer granularity.
+# The RTO is doubled upon a retransmission timeout (exponential backoff), and the backed off value is kept until the
+# next valid RTT sample is received. See RFC 6298, sections 5.5 and 5.7.
+class RttEstimator:
+    ## Gain of the SRTT update.
+    alpha = 0.125
+    ## Gain of the RTTVAR update.
+    beta = 0.25
+    ## RTTVAR multiplier of the RTO.
+    k = 4
+
+    ## Constructor.
+    # @param self The object pointer.
+    # @return None
+    def __init__(self):
+        ## @var srtt
+        # Smoothed RTT value (in seconds), or None, if no RTT samples have been received yet.
+        self.srtt = None
+        ## @var rttvar
+        # RTT variation value (in seconds).
+        self.rttvar = 0.0
+        ## @var rto
+        # Current retransmission timeout (in seconds) of the send attempts of the messages.
+        self.rto = ARQ_INITIAL_RTO
+        ## @var last_rtt
+        # Last RTT sample value (in seconds), or None.
+        self.last_rtt = None
+        ## @var samples
+        # Number of the received RTT samples.
+        self.samples = 0
+        ## @var timeouts
+        # Number of the retransmission timeouts.
+        self.timeouts = 0
+        ## @var sample_time
+        # Timestamp of the last RTT sample.
+        self.sample_time = 0.0
+        ## @var ack_time
+        # Timestamp of the last received ACK.
+        self.ack_time = 0.0
+        ## @var acked_send_time
+        # Send timestamp of the latest sent message, which has been acknowledged after a single send attempt.
+        self.acked_send_time = 0.0
+
+    ## Update the estimation with the new RTT sample, and recalculate the RTO.
+    # @param self The object pointer.
+    # @param rtt RTT sample value (in seconds).
+    # @return None
+    def add_sample(self, rtt):
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar += self.beta * (abs(self.srtt - rtt) - self.rttvar)
+            self.srtt += self.alpha * (rtt - self.srtt)
+        self.rto = min(max(self.srtt + max(TIMER_TICK_INTERVAL, self.k * self.rttvar), ARQ_MIN_RTO), ARQ_MAX_RTO)
+        self.last_rtt = rtt
+        self.samples += 1
+        self.sample_time = time.time()
+
+    ## Register the received ACK of a message.
+    # @param self The object pointer.
+    # @param send_time Timestamp of the acknowledged send attempt, or 0 if it is ambiguous (Karn's algorithm).
+    # @return None
+    def on_ack(self, send_time):
+        self.ack_time = time.time()
+        self.acked_send_time = max(self.acked_send_time, send_time)
+
+    ## Check whether the neighbor is still processing the messages, which have been sent before the given send attempt.
+    # It is the case, if the neighbor has acknowledged some message within the last timeout, and none of the messages
+    # sent after the attempt. Otherwise, the attempt (or its ACK) is considered lost.
+    # @param self The object pointer.
+    # @param send_time Timestamp of the send attempt.
+    # @param timeout Timeout value (in seconds) of the send attempt.
+    # @return True or False.
+    def is_draining(self, send_time, timeout):
+        return self.acked_send_time < send_time and time.time() - self.ack_time < timeout
+
+    ## Get the timeout of the next send attempt of a message.
+    # @param self The object pointer.
+    # @return Timeout value (in seconds).
+    def get_timeout(self):
+        return self.rto
+
+    ## Back off the RTO upon the retransmission timeout of a message.
+    # The RTO is doubled from the timeout of the expired send attempt, so the messages, which have been sent with the
+    # same RTO and expire together, back it off only once. The send attempts made before the last RTT sample don't
+    # back off the RTO, which has already been re-calculated from the newer sample.
+    # @param self The object pointer.
+    # @param timeout Timeout value (in seconds) of the expired send attempt.
+    # @param send_time Timestamp of the expired send attempt.
+    # @return None
+    def on_timeout(self, timeout, send_time):
+        if send_time >= self.sample_time:
+            self.rto = min(max(self.rto, 2 * timeout), ARQ_MAX_RTO)
+        self.timeouts += 1
+
+    ## Get the current statistics of the estimator.
+    # @param self The object pointer.
+    # @return dict() with "srtt", "rttvar", "rto", "last_rtt", "samples" and "timeouts" values.
+    def get_stats(self):
+        return {"srtt": self.srtt, "rttvar": self.rttvar, "rto": self.rto, "last_rtt": self.last_rtt,
+                "samples": self.samples, "timeouts": self.timeouts}
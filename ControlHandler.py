@@ -0,0 +1,160 @@
+#!/usr/bin/python
+"""
+@package ControlHandler
+Created on Oct 16, 2026
+
+@author: Dmitrii Dugaev
+
+
+This module is responsible for the aggregation of the small service messages - ACKs and rewards - which are destined
+to the same neighbor. Instead of sending each of them in a separate frame, they are collected into a single
+Messages.ControlMessage, which is sent either after a short flush interval, or once it is full. If another frame is
+sent to the same neighbor in the meantime, the pending control message is piggybacked on it, chained in front of
+its DSR header.
+The neighbors, which don't advertise the support of the control messages in their HELLO messages, get the ACKs and
+rewards in the separate frames, as before.
+"""
+
+# Import necessary python modules from the standard library
+import threading
+
+# Import the necessary modules of the program
+import Messages
+from conf import CONTROL_FLUSH_INTERVAL
+
+
+## A class which aggregates the ACKs and rewards, and sends them to the neighbors.
+# It provides the same send_raw_frame interface as Transport.RawTransport, so it can be used in its place by the senders
+# of the frames, on which the pending control messages should be piggybacked.
+class ControlHandler:
+    ## Constructor.
+    # @param self The object pointer.
+    # @param raw_transport Reference to Transport.RawTransport object.
+    # @param timer_wheel Reference to TimerWheel.TimerWheel object, which schedules the flushes.
+    # @param table Reference to RouteTable.Table object, which provides the protocol versions of the neighbors.
+    # @return None
+    def __init__(self, raw_transport, timer_wheel, table):
+        ## @var raw_transport
+        # Reference to Transport.RawTransport object.
+        self.raw_transport = raw_transport
+        ## @var timer_wheel
+        # Reference to TimerWheel.TimerWheel object, which schedules the flushes.
+        self.timer_wheel = timer_wheel
+        ## @var table
+        # Reference to RouteTable.Table object, which provides the protocol versions of the neighbors.
+        self.table = table
+        ## @var pending
+        # Dictionary with the pending control messages of the neighbors.
+        # Format: {mac: (Messages.ControlMessage object, TimerWheel.Timer object of its flush)}.
+        self.pending = dict()
+        ## @var flush_interval
+        # Maximum time interval (in seconds) a pending control message is held back, waiting for the other ACKs and
+        # rewards or for a frame to be piggybacked on.
+        self.flush_interval = CONTROL_FLUSH_INTERVAL
+        ## @var lock
+        # threading.Lock object, which protects the pending control messages.
+        self.lock = threading.Lock()
+
+    ## Add the ACK hash to the pending control message of the given neighbor.
+    # @param self The object pointer.
+    # @param dst_mac Destination MAC address, as a 6-byte binary string.
+    # @param msg_hash Hash value of the acknowledged message.
+    # @return None
+    def add_ack(self, dst_mac, msg_hash):
+        if not self.is_supported(dst_mac):
+            ack_message = Messages.AckMessage()
+            ack_message.msg_hash = msg_hash
+            self.raw_transport.send_raw_frame(dst_mac, ack_message, "")
+            return
+
+        self.lock.acquire()
+        control_message = self.get_pending(dst_mac)
+        control_message.ack_hashes.append(msg_hash)
+        self.check_full(dst_mac, control_message)
+        self.lock.release()
+
+    ## Add the reward to the pending control message of the given neighbor.
+    # @param self The object pointer.
+    # @param dst_mac Destination MAC address, as a 6-byte binary string.
+    # @param reward_message Messages.RewardMessage object.
+    # @return None
+    def add_reward(self, dst_mac, reward_message):
+        if not self.is_supported(dst_mac):
+            self.raw_transport.send_raw_frame(dst_mac, reward_message, "")
+            return
+
+        self.lock.acquire()
+        control_message = self.get_pending(dst_mac)
+        control_message.rewards.append((reward_message.reward_value, reward_message.msg_hash))
+        self.check_full(dst_mac, control_message)
+        self.lock.release()
+
+    ## Check whether the given neighbor supports the control messages.
+    # @param self The object pointer.
+    # @param dst_mac MAC address of the neighbor, as a 6-byte binary string.
+    # @return True or False.
+    def is_supported(self, dst_mac):
+        return self.table.get_neighbor_version(dst_mac) >= Messages.CONTROL_MESSAGE_VERSION
+
+    ## Get the pending control message of the given neighbor. If there is no such one, create it, and schedule its
+    # flush. Must be called under the lock.
+    # @param self The object pointer.
+    # @param dst_mac Destination MAC address, as a 6-byte binary string.
+    # @return Messages.ControlMessage object.
+    def get_pending(self, dst_mac):
+        if dst_mac not in self.pending:
+            control_message = Messages.ControlMessage()
+            timer = self.timer_wheel.schedule(self.flush_interval, self.flush, dst_mac, control_message)
+            self.pending[dst_mac] = (control_message, timer)
+        return self.pending[dst_mac][0]
+
+    ## Send the pending control message right away, if it is full. Must be called under the lock.
+    # @param self The object pointer.
+    # @param dst_mac Destination MAC address, as a 6-byte binary string.
+    # @param control_message Messages.ControlMessage object.
+    # @return None
+    def check_full(self, dst_mac, control_message):
+        if control_message.is_full():
+            self.pending.pop(dst_mac)[1].cancel()
+            self.raw_transport.send_raw_frame(dst_mac, control_message, "")
+
+    ## Send the pending control message upon the flush interval expiration.
+    # @param self The object pointer.
+    # @param dst_mac Destination MAC address, as a 6-byte binary string.
+    # @param control_message Messages.ControlMessage object, which the flush has been scheduled for.
+    # @return None
+    def flush(self, dst_mac, control_message):
+        self.lock.acquire()
+        # The message has been already sent or piggybacked
+        if dst_mac not in self.pending or self.pending[dst_mac][0] is not control_message:
+            self.lock.release()
+            return
+        del self.pending[dst_mac]
+        self.lock.release()
+        self.raw_transport.send_raw_frame(dst_mac, control_message, "")
+
+    ## Send raw frame to the network, with the pending control message of the neighbor piggybacked on it.
+    # @param self The object pointer.
+    # @param dst_mac Destination MAC address as a 6-byte binary string.
+    # @param dsr_message Message object from Messages module.
+    # @param payload User/Service payload after the protocol's header.
+    # @return None
+    def send_raw_frame(self, dst_mac, dsr_message, payload):
+        if dst_mac not in self.pending:
+            self.raw_transport.send_raw_frame(dst_mac, dsr_message, payload)
+            return
+
+        self.lock.acquire()
+        try:
+            control_message, timer = self.pending.pop(dst_mac)
+        # The message has been flushed in the meantime
+        except KeyError:
+            self.lock.release()
+            self.raw_transport.send_raw_frame(dst_mac, dsr_message, payload)
+            return
+
+        self.lock.release()
+        timer.cancel()
+        control_message.chained = 1
+        self.raw_transport.send_packed_frame(dst_mac, Messages.pack_message(control_message) +
+                                             Messages.pack_message(dsr_message), payload)
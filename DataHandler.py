@@ -18,12 +18,15 @@ import PathDiscovery
 import NeighborDiscovery
 import ArqHandler
 import RewardHandler
+import TimerWheel
+import ControlHandler
 import threading
+import time
 from collections import deque
 
 # Import the necessary modules of the program
 import routing_logging
-from conf import MONITORING_MODE_FLAG, ENABLE_ARQ, ARQ_LIST, GW_TYPE, DEFAULT_IPS
+from conf import MONITORING_MODE_FLAG, ENABLE_ARQ, ARQ_LIST, ARQ_MODE, GW_TYPE, DEFAULT_IPS, CONTROL_AGGREGATION_FLAG
 
 ## @var lock
 # Store the global threading.Lock object.
@@ -42,8 +45,9 @@ class DataHandler:
     # @param app_transport Reference to Transport.VirtualTransport object.
     # @param raw_transport Reference to Transport.RawTransport object.
     # @param table Reference to RouteTable.Table object.
+    # @param packet_trace Reference to PacketTrace.TraceRing object, or None if the packet trace is disabled.
     # @return None
-    def __init__(self, app_transport, raw_transport, table):
+    def __init__(self, app_transport, raw_transport, table, packet_trace=None):
         # Creating handlers instances
         ## @var app_handler
         # Create and store the object of DataHandler.AppHandler class.
@@ -54,12 +58,14 @@ class DataHandler:
         self.neighbor_routine = NeighborDiscovery.NeighborDiscovery(raw_transport, table)
         ## @var incoming_traffic_handler_thread
         # Create and store the object of DataHandler.IncomingTrafficHandler class.
-        self.incoming_traffic_handler_thread = IncomingTrafficHandler(self.app_handler, self.neighbor_routine)
+        self.incoming_traffic_handler_thread = IncomingTrafficHandler(self.app_handler, self.neighbor_routine,
+                                                                      packet_trace)
 
     ## Start the main threads.
     # @param self The object pointer.
     # @return None
     def run(self):
+        self.app_handler.timer_wheel.start()
         self.neighbor_routine.run()
         self.incoming_traffic_handler_thread.start()
 
@@ -69,6 +75,7 @@ class DataHandler:
     def stop_threads(self):
         self.neighbor_routine.stop_threads()
         self.incoming_traffic_handler_thread.quit()
+        self.app_handler.timer_wheel.quit()
         DATA_LOG.info("Traffic handlers are stopped")
 
 
@@ -208,13 +215,27 @@ class AppHandler:
         ## @var broadcast_mac
         # Store the default MAC broadcast value, referenced from Transport.RawTransport.broadcast_mac.
         self.broadcast_mac = raw_transport.broadcast_mac
+        ## @var timer_wheel
+        # Create and store a TimerWheel.TimerWheel scheduler thread, shared by the handlers for their delayed actions.
+        self.timer_wheel = TimerWheel.TimerWheel()
+        ## @var control_handler
+        # Create and store a ControlHandler.ControlHandler object for aggregating the ACKs and rewards, if the
+        # CONTROL_AGGREGATION_FLAG is True. Otherwise, None.
+        self.control_handler = None
+        ## @var data_transport
+        # Reference to the object, which sends the unicast data frames: ControlHandler.ControlHandler object, which
+        # piggybacks the pending control messages on them, or Transport.RawTransport object.
+        self.data_transport = raw_transport
+        if CONTROL_AGGREGATION_FLAG:
+            self.control_handler = ControlHandler.ControlHandler(raw_transport, self.timer_wheel, table)
+            self.data_transport = self.control_handler
         ## @var arq_handler
         # Create and store an ArqHandler.ArqHandler instance.
-        self.arq_handler = ArqHandler.ArqHandler(raw_transport, table)
+        self.arq_handler = ArqHandler.ArqHandler(raw_transport, table, self.timer_wheel, self.control_handler)
         ## @var reward_wait_handler
         # Create and store a RewardHandler.RewardWaitHandler object for waiting for an incoming reward of previously
         # sent packets.
-        self.reward_wait_handler = RewardHandler.RewardWaitHandler(table)
+        self.reward_wait_handler = RewardHandler.RewardWaitHandler(table, self.timer_wheel)
         ## @var path_discovery_handler
         # Create and store a PathDiscovery.PathDiscoveryHandler object for dealing with the packets with no next hop
         # node.
@@ -228,6 +249,10 @@ class AppHandler:
             self.send_unicast_packet = self.send_packet_with_arq
         else:
             self.send_unicast_packet = self.send_packet
+        ## @var send_reliable_packet
+        # Create a reference to the default self.send_reliable_packet method, depending on the ARQ_MODE value.
+        if ARQ_MODE == "selective-repeat":
+            self.send_reliable_packet = self.send_reliable_packet_windowed
 
     ## Process an incoming data packet from the upper application layer.
     # @param self The object pointer.
@@ -301,7 +326,8 @@ class AppHandler:
         # Check if the packet should be transmitted using ARQ.
         # Forward packet to the next hop. Start a thread for waiting an ACK with reward.
         else:
-            DATA_LOG.debug("For DST_IP: %s found a next_hop_mac: %s", dst_ip, next_hop_mac)
+            if DATA_LOG.debug_enabled:
+                DATA_LOG.debug("For DST_IP: %s found a next_hop_mac: %s", dst_ip, Transport.mac_to_str(next_hop_mac))
             self.send_unicast_packet(packet, dst_ip, next_hop_mac)
 
     ## Send a packet to a next_hop_mac.
@@ -315,7 +341,7 @@ class AppHandler:
         dsr_message = Messages.UnicastPacket()
         dsr_message.hop_count = 1
         # Send the raw data with dsr_header to the next hop
-        self.raw_transport.send_raw_frame(next_hop_mac, dsr_message, packet)
+        self.data_transport.send_raw_frame(next_hop_mac, dsr_message, packet)
         # Process the packet through the reward_wait_handler
         self.reward_wait_handler.wait_for_reward(dst_ip, next_hop_mac)
 
@@ -331,17 +357,34 @@ class AppHandler:
         if (upper_proto in ARQ_LIST) and (src_port in ARQ_LIST[upper_proto] or dst_port in ARQ_LIST[upper_proto]):
             # Transmit the packet reliably
             DATA_LOG.debug("This packet should be transmitted reliably: %s, %s, %s", upper_proto, src_port, dst_port)
-            # Create reliable dsr data message with proper values
-            dsr_message = Messages.ReliableDataPacket()
-            dsr_message.hop_count = 1
-            # Send the message using ARQ
-            self.arq_handler.arq_send(dsr_message, [next_hop_mac], payload=packet)
+            self.send_reliable_packet(packet, next_hop_mac)
             # Process the packet through the reward_wait_handler
             self.reward_wait_handler.wait_for_reward(dst_ip, next_hop_mac)
         # Else, transmit the data packet normally
         else:
             self.send_packet(packet, dst_ip, next_hop_mac)
 
+    ## Default method for sending a packet to a next_hop_mac reliably, using the Stop-and-Go ARQ.
+    # It is being overridden in the constructor, depending on the ARQ_MODE value, defined in the configuration file.
+    # @param self The object pointer.
+    # @param packet Received raw packet from the virtual network interface.
+    # @param next_hop_mac MAC address of a next hop node.
+    # @return None
+    def send_reliable_packet(self, packet, next_hop_mac):
+        # Create reliable dsr data message with proper values
+        dsr_message = Messages.ReliableDataPacket()
+        dsr_message.hop_count = 1
+        # Send the message using ARQ
+        self.arq_handler.arq_send(dsr_message, [next_hop_mac], payload=packet)
+
+    ## Send a packet to a next_hop_mac reliably, using the sliding window Selective-Repeat ARQ.
+    # @param self The object pointer.
+    # @param packet Received raw packet from the virtual network interface.
+    # @param next_hop_mac MAC address of a next hop node.
+    # @return None
+    def send_reliable_packet_windowed(self, packet, next_hop_mac):
+        self.arq_handler.window_send(next_hop_mac, packet, 1)
+
     ## Send the packet back to the virtual network interface.
     # @param self The object pointer.
     # @param packet Received raw packet from the virtual network interface.
@@ -363,8 +406,9 @@ class IncomingTrafficHandler(threading.Thread):
     # @param self The object pointer.
     # @param app_handler_thread Reference to DataHandler.AppHandler object.
     # @param neighbor_routine Reference to NeighborDiscovery.NeighborDiscovery object.
+    # @param packet_trace Reference to PacketTrace.TraceRing object, or None if the packet trace is disabled.
     # @return None
-    def __init__(self, app_handler_thread, neighbor_routine):
+    def __init__(self, app_handler_thread, neighbor_routine, packet_trace=None):
         super(IncomingTrafficHandler, self).__init__()
         ## @var handle_data_packet
         # Create a reference to default self.handle_data_packet method.
@@ -374,6 +418,10 @@ class IncomingTrafficHandler(threading.Thread):
         # Create a reference to default self.handle_reliable_data_packet method.
         # Check the MONITORING_MODE_FLAG.
         # If True - override the self.handle_reliable_data_packet method for working in the monitoring mode.
+        ## @var handle_windowed_data_packet
+        # Create a reference to default self.handle_windowed_data_packet method.
+        # Check the MONITORING_MODE_FLAG.
+        # If True - override the self.handle_windowed_data_packet method for working in the monitoring mode.
         ## @var handle_rreq
         # Create a reference to default self.handle_rreq method.
         # Check the MONITORING_MODE_FLAG.
@@ -385,6 +433,7 @@ class IncomingTrafficHandler(threading.Thread):
         if MONITORING_MODE_FLAG:
             self.handle_data_packet = self.handle_data_packet_monitoring_mode
             self.handle_reliable_data_packet = self.handle_reliable_data_packet_monitoring_mode
+            self.handle_windowed_data_packet = self.handle_windowed_data_packet_monitoring_mode
             self.handle_rreq = self.handle_rreq_monitoring_mode
             self.handle_rrep = self.handle_rrep_monitoring_mode
 
@@ -397,6 +446,9 @@ class IncomingTrafficHandler(threading.Thread):
         ## @var raw_transport
         # Reference to Transport.RawTransport object.
         self.raw_transport = self.app_handler_thread.raw_transport
+        ## @var data_transport
+        # Reference to DataHandler.AppHandler.data_transport object.
+        self.data_transport = self.app_handler_thread.data_transport
         ## @var arq_handler
         # Reference to DataHandler.AppHandler.arq_handler object.
         self.arq_handler = app_handler_thread.arq_handler
@@ -423,7 +475,8 @@ class IncomingTrafficHandler(threading.Thread):
         self.max_broadcast_ttl = 1
         ## @var reward_send_handler
         # Create a handler for generating and sending back a reward to the sender node.
-        self.reward_send_handler = RewardHandler.RewardSendHandler(self.table, self.raw_transport)
+        self.reward_send_handler = RewardHandler.RewardSendHandler(self.table, self.raw_transport,
+                                                                   app_handler_thread.control_handler)
         ## @var reward_wait_handler
         # Create a reference to RewardHandler.RewardWaitHandler object thread.
         self.reward_wait_handler = app_handler_thread.reward_wait_handler
@@ -439,6 +492,44 @@ class IncomingTrafficHandler(threading.Thread):
         # List of all previously processed IDs of data packets have been sent reliably using ARQ.
         # Limit the max length of the list to 100.
         self.reliable_packet_ids = deque(maxlen=100)
+        ## @var packet_trace
+        # Reference to PacketTrace.TraceRing object, or None if the packet trace is disabled.
+        self.packet_trace = packet_trace
+        ## @var next_hop_mac
+        # Next hop MAC address, chosen by the handler of the last forwarded frame. It is recorded to the packet trace.
+        self.next_hop_mac = None
+        ## @var handle_frame
+        # Define which IncomingTrafficHandler.handle_frame method will be used, depending on whether the packet trace
+        # is enabled or not.
+        if packet_trace is not None:
+            self.handle_frame = self.handle_frame_with_trace
+        ## @var handlers
+        # Registered handlers of the incoming messages. Format: {dsr_type: (description, handler)}.
+        # Each handler accepts (src_mac, dsr_message, packet) arguments.
+        self.handlers = dict()
+        self.register_handler(Messages.UnicastPacket.type, "unicast data packet", self.handle_data_packet)
+        self.register_handler(Messages.BroadcastPacket.type, "broadcast data packet",
+                              lambda src_mac, dsr_message, packet: self.handle_broadcast_packet(dsr_message, packet))
+        for dsr_type in (Messages.RreqMessage.ipv4_type, Messages.RreqMessage.ipv6_type):
+            self.register_handler(dsr_type, "RREQ service message",
+                                  lambda src_mac, dsr_message, packet: self.handle_rreq(src_mac, dsr_message))
+        for dsr_type in (Messages.RrepMessage.ipv4_type, Messages.RrepMessage.ipv6_type):
+            self.register_handler(dsr_type, "RREP service message",
+                                  lambda src_mac, dsr_message, packet: self.handle_rrep(src_mac, dsr_message))
+        self.register_handler(Messages.HelloMessage.type, "HELLO service message",
+                              lambda src_mac, dsr_message, packet:
+                              self.listen_neighbors_handler.process_neighbor(src_mac, dsr_message, packet))
+        self.register_handler(Messages.AckMessage.type, "ACK service message",
+                              lambda src_mac, dsr_message, packet: self.handle_ack(dsr_message))
+        self.register_handler(Messages.RewardMessage.type, "REWARD service message",
+                              lambda src_mac, dsr_message, packet: self.handle_reward(dsr_message))
+        self.register_handler(Messages.ReliableDataPacket.type, "reliable data packet",
+                              self.handle_reliable_data_packet)
+        self.register_handler(Messages.WindowedDataPacket.type, "windowed reliable data packet",
+                              self.handle_windowed_data_packet)
+        self.register_handler(Messages.SackMessage.type, "SACK service message",
+                              lambda src_mac, dsr_message, packet: self.arq_handler.process_sack(src_mac, dsr_message))
+        self.register_handler(Messages.ControlMessage.type, "CONTROL service message", self.handle_control_message)
 
     ## Main thread routine.
     # @param self The object pointer.
@@ -446,45 +537,55 @@ class IncomingTrafficHandler(threading.Thread):
     def run(self):
         self.running = True
         while self.running:
-            src_mac, dsr_message, packet = self.raw_transport.recv_data()
-            dsr_type = dsr_message.type
-
-            # If it's a data packet, handle it accordingly
-            if dsr_type == 0:
-                DATA_LOG.debug("Got unicast data packet: %s", str(dsr_message))
-                self.handle_data_packet(src_mac, dsr_message, packet)
+            # Dispatch the whole batch of frames, received during a single wakeup
+            for src_mac, dsr_message, packet in self.raw_transport.recv_data_batch():
+                self.handle_frame(src_mac, dsr_message, packet)
 
-            elif dsr_type == 1:
-                DATA_LOG.debug("Got broadcast data packet: %s", str(dsr_message))
-                self.handle_broadcast_packet(dsr_message, packet)
-
-            elif dsr_type == 2 or dsr_type == 3:
-                DATA_LOG.debug("Got RREQ service message: %s", str(dsr_message))
-                self.handle_rreq(src_mac, dsr_message)
+    ## Dispatch the received frame to the corresponding handler, depending on its DSR type.
+    # @param self The object pointer.
+    # @param src_mac Source MAC address of the received frame.
+    # @param dsr_message Message object from Messages module.
+    # @param packet Raw data packet.
+    # @return None
+    def handle_frame(self, src_mac, dsr_message, packet):
+        try:
+            description, handler = self.handlers[dsr_message.type]
 
-            elif dsr_type == 4 or dsr_type == 5:
-                DATA_LOG.debug("Got RREP service message: %s", str(dsr_message))
-                self.handle_rrep(src_mac, dsr_message)
+        except KeyError:
+            DATA_LOG.error("INVALID DSR TYPE NUMBER HAS BEEN RECEIVED!!!")
+            return None
 
-            elif dsr_type == 6:
-                DATA_LOG.debug("Got HELLO service message: %s", str(dsr_message))
-                # Handle HELLO message
-                self.listen_neighbors_handler.process_neighbor(src_mac, dsr_message)
+        # The message is converted to string in place, since the handler can change it
+        if DATA_LOG.debug_enabled:
+            DATA_LOG.debug("Got %s: %s", description, str(dsr_message))
+        handler(src_mac, dsr_message, packet)
 
-            elif dsr_type == 7:
-                DATA_LOG.debug("Got ACK service message: %s", str(dsr_message))
-                self.handle_ack(dsr_message)
+    ## Dispatch the received frame to the corresponding handler, and record it to the packet trace.
+    # @param self The object pointer.
+    # @param src_mac Source MAC address of the received frame.
+    # @param dsr_message Message object from Messages module.
+    # @param packet Raw data packet.
+    # @return None
+    def handle_frame_with_trace(self, src_mac, dsr_message, packet):
+        # Store the values before the handler changes them
+        hop_count = getattr(dsr_message, "hop_count", 0)
+        self.next_hop_mac = None
+        timestamp = time.time()
 
-            elif dsr_type == 8:
-                DATA_LOG.debug("Got REWARD service message: %s", str(dsr_message))
-                self.handle_reward(dsr_message)
+        IncomingTrafficHandler.handle_frame(self, src_mac, dsr_message, packet)
 
-            elif dsr_type == 9:
-                DATA_LOG.debug("Got reliable data packet: %s", str(dsr_message))
-                self.handle_reliable_data_packet(src_mac, dsr_message, packet)
+        self.packet_trace.record(timestamp, time.time() - timestamp, dsr_message.type, getattr(dsr_message, "id", 0),
+                                 hop_count, src_mac, self.next_hop_mac)
 
-            else:
-                DATA_LOG.error("INVALID DSR TYPE NUMBER HAS BEEN RECEIVED!!!")
+    ## Register the handler of the incoming messages with the given DSR type.
+    # A previously registered handler for the same DSR type is replaced.
+    # @param self The object pointer.
+    # @param dsr_type Type ID of the message.
+    # @param description Description of the message type, used for logging.
+    # @param handler Handler method or function, which accepts (src_mac, dsr_message, packet) arguments.
+    # @return None
+    def register_handler(self, dsr_type, description, handler):
+        self.handlers[dsr_type] = (description, handler)
 
     ## Default method for handling incoming unicast data packets from the network side.
     # Check the dst_mac from dsr_header. If it matches the node's own mac -> send it up to the virtual interface
@@ -513,18 +614,22 @@ class IncomingTrafficHandler(threading.Thread):
         # Else, try to find the next hop in the route table
         else:
             next_hop_mac = self.table.get_next_hop_mac(dst_ip)
-            DATA_LOG.debug("IncomingTraffic: For DST_IP: %s found a next_hop_mac: %s", dst_ip, next_hop_mac)
+            self.next_hop_mac = next_hop_mac
             DATA_LOG.debug("Current entry: %s", self.table.get_entry(dst_ip))
 
             # If no entry is found, put the packet to the initial AppQueue
             if next_hop_mac is None:
+                DATA_LOG.debug("IncomingTraffic: For DST_IP: %s no next_hop_mac is found", dst_ip)
                 self.app_handler_thread.send_back(packet)
 
             # Else, forward the packet to the next_hop. Start a reward wait thread, if necessary.
             else:
+                if DATA_LOG.debug_enabled:
+                    DATA_LOG.debug("IncomingTraffic: For DST_IP: %s found a next_hop_mac: %s", dst_ip,
+                                   Transport.mac_to_str(next_hop_mac))
                 dsr_message.hop_count += 1
                 # Send the raw data with dsr_header to the next hop
-                self.raw_transport.send_raw_frame(next_hop_mac, dsr_message, packet)
+                self.data_transport.send_raw_frame(next_hop_mac, dsr_message, packet)
 
                 # Process the packet through the reward_wait_handler
                 self.reward_wait_handler.wait_for_reward(dst_ip, next_hop_mac)
@@ -592,15 +697,19 @@ class IncomingTrafficHandler(threading.Thread):
         # Else, try to find the next hop in the route table
         else:
             next_hop_mac = self.table.get_next_hop_mac(dst_ip)
-            DATA_LOG.debug("IncomingTraffic: For DST_IP: %s found a next_hop_mac: %s", dst_ip, next_hop_mac)
+            self.next_hop_mac = next_hop_mac
             DATA_LOG.debug("Current entry: %s", self.table.get_entry(dst_ip))
 
             # If no entry is found, put the packet to the initial AppQueue
             if next_hop_mac is None:
+                DATA_LOG.debug("IncomingTraffic: For DST_IP: %s no next_hop_mac is found", dst_ip)
                 self.app_handler_thread.send_back(packet)
 
             # Else, forward the packet to the next_hop. Start a reward wait thread, if necessary.
             else:
+                if DATA_LOG.debug_enabled:
+                    DATA_LOG.debug("IncomingTraffic: For DST_IP: %s found a next_hop_mac: %s", dst_ip,
+                                   Transport.mac_to_str(next_hop_mac))
                 dsr_message.hop_count += 1
                 # Send the raw data with dsr_header to the next hop using ARQ
                 self.arq_handler.arq_send(dsr_message, [next_hop_mac], payload=packet)
@@ -644,6 +753,83 @@ class IncomingTrafficHandler(threading.Thread):
             DATA_LOG.debug("This data packet is not for me. Discarding the data packet, "
                            "since in Monitoring Mode. Dsr header: %s", dsr_message)
 
+    ## Handle data packet, sent via the sliding window Selective-Repeat ARQ.
+    # @param self The object pointer.
+    # @param src_mac Source MAC address of the received packet.
+    # @param dsr_message RLRP windowed data packet header object from Messages module.
+    # @param packet Raw data packet.
+    # @return None
+    def handle_windowed_data_packet(self, src_mac, dsr_message, packet):
+        # Register the packet in the receiving window, the SACK is sent back in ALL cases
+        if not self.arq_handler.window_receive(src_mac, dsr_message):
+            DATA_LOG.info("The Data Packet with this SEQ has been already processed. Sending the SACK back.")
+            return None
+
+        # Get src_ip, dst_ip from the incoming packet
+        src_ip, dst_ip, packet = Transport.get_l3_addresses_from_packet(packet)
+
+        # Check the destination address if it's inside or outside the network
+        dst_ip = self.gateway_handler.check_destination_address(dst_ip)
+
+        # Generate and send back a reward message
+        self.reward_send_handler.send_reward(dst_ip, src_mac)
+
+        # If the dst_ip matches the node's ip, send data to the App
+        if dst_ip in self.table.current_node_ips:
+            DATA_LOG.debug("Sending packet to the App... SRC_IP: %s, DST_IP: %s", src_ip, dst_ip)
+            self.app_handler_thread.send_up(packet)
+
+        # Else, try to find the next hop in the route table
+        else:
+            next_hop_mac = self.table.get_next_hop_mac(dst_ip)
+            self.next_hop_mac = next_hop_mac
+
+            # If no entry is found, put the packet to the initial AppQueue
+            if next_hop_mac is None:
+                DATA_LOG.debug("IncomingTraffic: For DST_IP: %s no next_hop_mac is found", dst_ip)
+                self.app_handler_thread.send_back(packet)
+
+            # Else, forward the packet to the next_hop through its sending window. Start a reward wait, if necessary.
+            else:
+                if DATA_LOG.debug_enabled:
+                    DATA_LOG.debug("IncomingTraffic: For DST_IP: %s found a next_hop_mac: %s", dst_ip,
+                                   Transport.mac_to_str(next_hop_mac))
+                self.arq_handler.window_send(next_hop_mac, packet, dsr_message.hop_count + 1)
+
+                # Process the packet through the reward_wait_handler
+                self.reward_wait_handler.wait_for_reward(dst_ip, next_hop_mac)
+
+    ## Handle data packet, sent via the sliding window Selective-Repeat ARQ, if the monitoring mode is ON.
+    # @param self The object pointer.
+    # @param src_mac Source MAC address of the received packet.
+    # @param dsr_message RLRP windowed data packet header object from Messages module.
+    # @param packet Raw data packet.
+    # @return None
+    def handle_windowed_data_packet_monitoring_mode(self, src_mac, dsr_message, packet):
+        # Register the packet in the receiving window, the SACK is sent back in ALL cases
+        if not self.arq_handler.window_receive(src_mac, dsr_message):
+            DATA_LOG.info("The Data Packet with this SEQ has been already processed. Sending the SACK back.")
+            return None
+
+        # Get src_ip, dst_ip from the incoming packet
+        src_ip, dst_ip, packet = Transport.get_l3_addresses_from_packet(packet)
+
+        # Check the destination address if it's inside or outside the network
+        dst_ip = self.gateway_handler.check_destination_address(dst_ip)
+
+        # Generate and send back a reward message
+        self.reward_send_handler.send_reward(dst_ip, src_mac)
+
+        # If the dst_ip matches the node's ip, send data to the App
+        if dst_ip in self.table.current_node_ips:
+            DATA_LOG.debug("Sending packet to the App... SRC_IP: %s, DST_IP: %s", src_ip, dst_ip)
+            self.app_handler_thread.send_up(packet)
+
+        # In all other cases, discard the packet
+        else:
+            DATA_LOG.debug("This data packet is not for me. Discarding the data packet, "
+                           "since in Monitoring Mode. Dsr header: %s", dsr_message)
+
     ## Handle the broadcast data packets, generated from the network application.
     # Check the broadcast_ttl with the defined max value, and either drop or forward it, accordingly.
     # @param self The object pointer.
@@ -697,8 +883,7 @@ class IncomingTrafficHandler(threading.Thread):
             DATA_LOG.info("Processing the RREQ, generating and sending back the RREP broadcast")
             # Generate and send RREP back to the source
             rrep = Messages.RrepMessage()
-            rrep.src_ip = rreq.dst_ip
-            rrep.dst_ip = rreq.src_ip
+            rrep.set_addresses(rreq.dst_ip, rreq.src_ip)
             rrep.hop_count = 1
             rrep.id = rreq.id
 
@@ -744,8 +929,7 @@ class IncomingTrafficHandler(threading.Thread):
             DATA_LOG.info("Processing the RREQ, generating and sending back the RREP")
             # Generate and send RREP back to the source
             rrep = Messages.RrepMessage()
-            rrep.src_ip = rreq.dst_ip
-            rrep.dst_ip = rreq.src_ip
+            rrep.set_addresses(rreq.dst_ip, rreq.src_ip)
             rrep.hop_count = 1
             rrep.id = rreq.id
 
@@ -832,6 +1016,31 @@ class IncomingTrafficHandler(threading.Thread):
         # Process the ACK by arq_handler
         self.arq_handler.process_ack(ack_message)
 
+    ## Handle incoming control messages: process all the aggregated ACKs and rewards, and then, if another message is
+    # chained after the control message, dispatch it as well.
+    # @param self The object pointer.
+    # @param src_mac Source MAC address of the received frame.
+    # @param control_message RLRP control service message header object from Messages module.
+    # @param packet The rest of the frame after the control message.
+    # @return None
+    def handle_control_message(self, src_mac, control_message, packet):
+        for msg_hash in control_message.ack_hashes:
+            ack_message = Messages.AckMessage()
+            ack_message.msg_hash = msg_hash
+            self.handle_ack(ack_message)
+
+        for reward_value, msg_hash in control_message.rewards:
+            self.handle_reward(Messages.RewardMessage(reward_value, msg_hash))
+
+        if control_message.chained:
+            unpacked_message = Messages.unpack_message(packet)
+            if unpacked_message is None:
+                DATA_LOG.error("INVALID DSR TYPE NUMBER OF THE MESSAGE, CHAINED AFTER THE CONTROL MESSAGE!!!")
+                return None
+
+            dsr_message, length = unpacked_message
+            self.handle_frame(src_mac, dsr_message, packet[length:])
+
     ## Handle incoming reward messages.
     # @param self The object pointer.
     # @param reward_message RLRP reward service message header object from Messages module.
@@ -0,0 +1,533 @@
+#!/usr/bin/python
+"""
+@package Emulator
+Created on Oct 16, 2026
+
+@author: Dmitrii Dugaev
+
+
+This module provides an in-process emulation of a network of the routing nodes. It is used for measuring the
+throughput, latency and convergence of the protocol on a plain Linux machine, without the radio interfaces, the root
+permissions, the tun device and the raw sockets.
+Each emulated node runs the real DataHandler, RouteTable, ArqHandler and NeighborDiscovery code, with the
+Transport.VirtualTransport and Transport.RawTransport objects replaced by the in-memory EmulatedVirtualTransport and
+EmulatedRawTransport objects, which provide the same interface. The frames are passed between the nodes by the Network
+object, according to the configured topology, where each link has its own loss probability and delay. The links can be
+added, changed and removed while the nodes are running.
+The log files of all the nodes are written to the same directory, so it is recommended to point the
+ADHOC_ROUTING_LOG_DIR environment variable to a temporary directory before importing this module.
+
+Usage example:
+    network = Emulator.Network()
+    nodes = [network.add_node() for _ in xrange(3)]
+    network.connect(nodes[0], nodes[1], loss=0.1, delay=0.005)
+    network.connect(nodes[1], nodes[2])
+    network.start()
+    network.wait_for_neighbors(10)
+    nodes[0].send(nodes[2].ip, "data")
+    ...
+    network.stop()
+"""
+
+# Import necessary python modules from the standard library
+import random
+import socket
+import struct
+import threading
+import time
+from collections import deque
+
+# Import the necessary modules of the program
+import DataHandler
+import Messages
+import RouteTable
+import TimerWheel
+import Transport
+import routing_logging
+from conf import RECV_BATCH_SIZE
+
+## @var EMULATOR_LOG
+# Global routing_logging.LogWrapper object for logging the Emulator activity.
+EMULATOR_LOG = routing_logging.create_routing_log("routing.emulator.log", "emulator")
+
+## @var BROADCAST_MAC
+# Broadcast MAC address, as a 6-byte binary string.
+BROADCAST_MAC = b"\xff" * 6
+## @var UDP_PACKET_HEADER
+# Precompiled layout of the headers of a UDP packet, as it is read from the tun interface: the packet information
+# (flags, L3 protocol ID), the IPv4 header without options (version and IHL, TOS, total length, ID, flags and fragment
+# offset, TTL, protocol, checksum, source address, destination address) and the UDP header (source port, destination
+# port, length, checksum).
+UDP_PACKET_HEADER = struct.Struct("!HHBBHHHBBH4s4sHHHH")
+## @var UDP_PAYLOAD_OFFSET
+# Offset of the UDP payload in the packet.
+UDP_PAYLOAD_OFFSET = UDP_PACKET_HEADER.size
+## @var DEFAULT_PORT
+# Default UDP port of the emulated traffic.
+DEFAULT_PORT = 40000
+## @var HELLO_INTERVAL
+# Default time interval (in seconds) between the HELLO messages of the emulated nodes.
+HELLO_INTERVAL = 2
+
+
+## Build a UDP packet, as it is read from the tun interface. The checksums are not calculated.
+# @param src_ip Source IPv4 address.
+# @param dst_ip Destination IPv4 address.
+# @param payload UDP payload.
+# @param src_port Source UDP port.
+# @param dst_port Destination UDP port.
+# @return Raw packet data.
+def build_udp_packet(src_ip, dst_ip, payload, src_port=DEFAULT_PORT, dst_port=DEFAULT_PORT):
+    return UDP_PACKET_HEADER.pack(0, Transport.IP4_ID, 0x45, 0, 28 + len(payload), 0, 0, 64,
+                                  Transport.PROTOCOL_IDS["UDP"], 0, socket.inet_aton(src_ip), socket.inet_aton(dst_ip),
+                                  src_port, dst_port, 8 + len(payload), 0) + payload
+
+
+## Get the UDP payload from the packet, built by build_udp_packet.
+# @param packet Raw packet data.
+# @return UDP payload.
+def get_udp_payload(packet):
+    return packet[UDP_PAYLOAD_OFFSET:]
+
+
+## Class Link represents a one-way link between two emulated nodes.
+class Link:
+    ## Constructor.
+    # @param self The object pointer.
+    # @param loss Probability of a frame loss on the link.
+    # @param delay Delay (in seconds) of the frames on the link.
+    # @return None
+    def __init__(self, loss, delay):
+        ## @var loss
+        # Probability of a frame loss on the link.
+        self.loss = loss
+        ## @var delay
+        # Delay (in seconds) of the frames on the link.
+        self.delay = delay
+
+
+## Class for the emulated network, which passes the frames between the emulated nodes.
+class Network:
+    ## Constructor.
+    # @param self The object pointer.
+    # @param seed Seed of the random generator of the frame losses, or None.
+    # @param tick_interval Time interval (in seconds) of a single tick of the timer wheel, which delays the frames.
+    # @return None
+    def __init__(self, seed=None, tick_interval=0.001):
+        ## @var nodes
+        # List of the Emulator.EmulatedNode objects.
+        self.nodes = list()
+        ## @var links
+        # Links of the nodes. Format: {src_mac: {dst_mac: Emulator.Link object}}. The inner dictionaries are replaced
+        # as a whole on each change, so they can be read without the lock.
+        self.links = dict()
+        ## @var transports
+        # Raw transports of the nodes. Format: {mac: Emulator.EmulatedRawTransport object}.
+        self.transports = dict()
+        ## @var random
+        # random.Random object, which generates the frame losses.
+        self.random = random.Random(seed)
+        ## @var timer_wheel
+        # TimerWheel.TimerWheel object, which delays the frames.
+        self.timer_wheel = TimerWheel.TimerWheel(tick_interval)
+        self.timer_wheel.daemon = True
+        ## @var frame_counts
+        # Number of the sent frames of each message type. Format: {dsr_type: count}.
+        self.frame_counts = dict()
+        ## @var lost_frames
+        # Number of the frames, lost on the links.
+        self.lost_frames = 0
+        ## @var lock
+        # threading.Lock object, which protects the links and the counters.
+        self.lock = threading.Lock()
+
+    ## Create a new emulated node, and add it to the network.
+    # @param self The object pointer.
+    # @param hello_interval Time interval (in seconds) between the HELLO messages of the node.
+    # @return Emulator.EmulatedNode object.
+    def add_node(self, hello_interval=HELLO_INTERVAL):
+        node = EmulatedNode(self, len(self.nodes) + 1, hello_interval)
+        self.nodes.append(node)
+        self.transports[node.mac] = node.raw_transport
+        self.links[node.mac] = dict()
+        return node
+
+    ## Connect two nodes by a pair of links, or change the properties of the existing ones.
+    # @param self The object pointer.
+    # @param node_a Emulator.EmulatedNode object.
+    # @param node_b Emulator.EmulatedNode object.
+    # @param loss Probability of a frame loss on the links.
+    # @param delay Delay (in seconds) of the frames on the links.
+    # @return None
+    def connect(self, node_a, node_b, loss=0.0, delay=0.0):
+        self.lock.acquire()
+        for src, dst in ((node_a, node_b), (node_b, node_a)):
+            links = dict(self.links[src.mac])
+            links[dst.mac] = Link(loss, delay)
+            self.links[src.mac] = links
+        self.lock.release()
+        EMULATOR_LOG.info("Connected the nodes %s and %s: loss %s, delay %s", node_a.ip, node_b.ip, loss, delay)
+
+    ## Disconnect two nodes.
+    # @param self The object pointer.
+    # @param node_a Emulator.EmulatedNode object.
+    # @param node_b Emulator.EmulatedNode object.
+    # @return None
+    def disconnect(self, node_a, node_b):
+        self.lock.acquire()
+        for src, dst in ((node_a, node_b), (node_b, node_a)):
+            links = dict(self.links[src.mac])
+            links.pop(dst.mac, None)
+            self.links[src.mac] = links
+        self.lock.release()
+        EMULATOR_LOG.info("Disconnected the nodes %s and %s", node_a.ip, node_b.ip)
+
+    ## Pass the frame from the node to its neighbors over the links.
+    # The unicast frame is passed only if there is a link to its destination, the broadcast frame is passed to all
+    # the neighbors. On each link, the frame is either lost, or delivered after the link's delay.
+    # @param self The object pointer.
+    # @param src_mac MAC address of the sender, as a 6-byte binary string.
+    # @param frame Raw frame with the ethernet header.
+    # @return None
+    def transmit(self, src_mac, frame):
+        dsr_type = Messages.TYPE_FIELD.unpack_from(frame, 14)[0] & 0x0F
+        self.lock.acquire()
+        self.frame_counts[dsr_type] = self.frame_counts.get(dsr_type, 0) + 1
+        self.lock.release()
+
+        links = self.links.get(src_mac, {})
+        dst_mac = frame[:6]
+        if dst_mac == BROADCAST_MAC:
+            receivers = links.items()
+        elif dst_mac in links:
+            receivers = [(dst_mac, links[dst_mac])]
+        else:
+            receivers = []
+
+        for mac, link in receivers:
+            if link.loss and self.random.random() < link.loss:
+                self.lock.acquire()
+                self.lost_frames += 1
+                self.lock.release()
+                continue
+            if link.delay > 0:
+                self.timer_wheel.schedule(link.delay, self.transports[mac].deliver, frame)
+            else:
+                self.transports[mac].deliver(frame)
+
+    ## Get the number of the sent frames of each message type.
+    # @param self The object pointer.
+    # @return dict() with {dsr_type: count}.
+    def get_frame_counts(self):
+        self.lock.acquire()
+        frame_counts = dict(self.frame_counts)
+        self.lock.release()
+        return frame_counts
+
+    ## Start the network and all its nodes.
+    # @param self The object pointer.
+    # @return None
+    def start(self):
+        self.timer_wheel.start()
+        for node in self.nodes:
+            node.start()
+
+    ## Stop all the nodes and the network.
+    # @param self The object pointer.
+    # @return None
+    def stop(self):
+        for node in self.nodes:
+            node.quit()
+        self.timer_wheel.quit()
+        # Wait for the receiving threads, which have been woken up by closing the transports
+        for node in self.nodes:
+            node.join()
+            node.data_handler.incoming_traffic_handler_thread.join()
+        # Wait for the timer wheels, so that they don't wake up during the interpreter shutdown
+        for node in self.nodes:
+            node.data_handler.app_handler.timer_wheel.join()
+        self.timer_wheel.join()
+
+    ## Wait until each node has discovered all its current neighbors, and only them.
+    # @param self The object pointer.
+    # @param timeout Maximum waiting time (in seconds).
+    # @return True if the neighbors have been discovered, False if the timeout has expired.
+    def wait_for_neighbors(self, timeout):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if all([set(node.table.neighbors_list.keys()) == set(self.links[node.mac].keys()) for node in self.nodes]):
+                return True
+            time.sleep(0.05)
+        return False
+
+
+## Class for the emulated raw transport of a node, which passes the frames via the Emulator.Network object instead of
+# the raw socket. It provides the same interface as Transport.RawTransport, and parses the received frames with its
+# methods. No frames are filtered, since the topology is defined by the links of the network.
+class EmulatedRawTransport(Transport.RawTransport):
+    ## Constructor.
+    # @param self The object pointer.
+    # @param network Reference to Emulator.Network object.
+    # @param node_mac The node's own MAC address, as a 6-byte binary string.
+    # @return None
+    def __init__(self, network, node_mac):
+        ## @var network
+        # Reference to Emulator.Network object.
+        self.network = network
+        ## @var proto
+        # Custom protocol ID on L2 layer.
+        self.proto = b"\x77\x77"
+        ## @var node_mac
+        # The node's own MAC address as a 6-byte binary string.
+        self.node_mac = node_mac
+        ## @var broadcast_mac
+        # Default value of the broadcast MAC address.
+        self.broadcast_mac = BROADCAST_MAC
+        ## @var eth_headers
+        # Cache of the generated ethernet headers. Format: {dst_mac: eth_header}.
+        self.eth_headers = dict()
+        ## @var topology_neighbors
+        # Set of neighbors MAC addresses. It is not used for filtering.
+        self.topology_neighbors = frozenset()
+        ## @var running
+        # Running state bool() flag.
+        self.running = True
+        ## @var batch_size
+        # Maximum number of frames, which are returned per single call of EmulatedRawTransport.recv_data_batch.
+        self.batch_size = max(1, RECV_BATCH_SIZE)
+        ## @var frames
+        # Received frames, which haven't been returned yet.
+        self.frames = deque()
+        ## @var not_empty
+        # Condition object for waiting for the received frames.
+        self.not_empty = threading.Condition(threading.Lock())
+        ## @var process_frame
+        # Parse the received frames without filtering.
+        self.process_frame = self.process_frame_no_filter
+
+    ## Put the frame, received from the network, to the receive queue.
+    # @param self The object pointer.
+    # @param frame Raw frame with the ethernet header.
+    # @return None
+    def deliver(self, frame):
+        self.not_empty.acquire()
+        self.frames.append(frame)
+        self.not_empty.notify()
+        self.not_empty.release()
+
+    ## Receive a batch of frames. Block until the first frame arrives, then take all the queued frames, up to
+    # EmulatedRawTransport.batch_size.
+    # @param self The object pointer.
+    # @return list() of [src_mac, dsr_header_obj, upper_raw_data].
+    def recv_data_batch(self):
+        self.not_empty.acquire()
+        while self.running and not self.frames:
+            self.not_empty.wait()
+        data = [self.frames.popleft() for _ in xrange(min(len(self.frames), self.batch_size))]
+        self.not_empty.release()
+
+        frames = []
+        for frame in data:
+            frame = self.process_frame(frame)
+            if frame is not None:
+                frames.append(frame)
+        return frames
+
+    ## Receive and return a single frame.
+    # @param self The object pointer.
+    # @return [src_mac, dsr_header_obj, upper_raw_data], or None if the transport has been closed.
+    def recv_data(self):
+        while self.running:
+            self.not_empty.acquire()
+            while self.running and not self.frames:
+                self.not_empty.wait()
+            data = self.frames.popleft() if self.frames else None
+            self.not_empty.release()
+
+            if data is not None:
+                frame = self.process_frame(data)
+                if frame is not None:
+                    return frame
+
+    ## Update the list of topology neighbors. The frames are not filtered, so only the list itself is updated.
+    # @param self The object pointer.
+    # @param topology_neighbors List of neighbors MAC addresses in "xx:xx:xx:xx:xx:xx" format.
+    # @return None
+    def update_topology_neighbors(self, topology_neighbors):
+        self.topology_neighbors = frozenset(map(Transport.mac_to_bin, topology_neighbors))
+
+    ## Send raw frame with the already packed dsr header to the network.
+    # @param self The object pointer.
+    # @param dst_mac Destination MAC address as a 6-byte binary string.
+    # @param dsr_bin_header Packed dsr header in binary string (or bytearray) representation.
+    # @param payload User/Service payload after the protocol's header.
+    # @return None
+    def send_packed_frame(self, dst_mac, dsr_bin_header, payload):
+        try:
+            eth_header = self.eth_headers[dst_mac]
+        except KeyError:
+            eth_header = self.gen_eth_header(self.node_mac, dst_mac)
+            self.eth_headers[dst_mac] = eth_header
+        self.network.transmit(self.node_mac, str(eth_header + dsr_bin_header + payload))
+
+    ## Stop receiving the frames, and wake up the waiting receivers.
+    # @param self The object pointer.
+    # @return None
+    def close_raw_recv_socket(self):
+        self.not_empty.acquire()
+        self.running = False
+        self.not_empty.notify_all()
+        self.not_empty.release()
+
+
+## Class for the emulated virtual interface of a node. It provides the same interface as Transport.VirtualTransport.
+# The packets from the application are put to the queue by EmulatedVirtualTransport.put method, and the packets
+# to the application are either passed to the receive callback, or kept in the EmulatedVirtualTransport.app_packets.
+class EmulatedVirtualTransport:
+    ## Constructor.
+    # @param self The object pointer.
+    # @return None
+    def __init__(self):
+        ## @var packets
+        # Packets from the application, which haven't been processed yet.
+        self.packets = deque()
+        ## @var app_packets
+        # Packets, which have been delivered to the application, if there is no receive callback.
+        self.app_packets = deque()
+        ## @var receive_callback
+        # A function, which is called with each packet delivered to the application, or None.
+        self.receive_callback = None
+        ## @var running
+        # Running state bool() flag.
+        self.running = True
+        ## @var not_empty
+        # Condition object for waiting for the packets from the application.
+        self.not_empty = threading.Condition(threading.Lock())
+
+    ## Put the packet from the application to the queue, as if it has been sent to the virtual interface.
+    # @param self The object pointer.
+    # @param packet Raw packet data.
+    # @return None
+    def put(self, packet):
+        self.not_empty.acquire()
+        self.packets.append(packet)
+        self.not_empty.notify()
+        self.not_empty.release()
+
+    ## Send data packet to the application.
+    # @param self The object pointer.
+    # @param packet Raw packet data.
+    # @return None
+    def send_to_app(self, packet):
+        if self.receive_callback is not None:
+            self.receive_callback(packet)
+        else:
+            self.app_packets.append(packet)
+
+    ## Send data packet back to the virtual interface, so it is processed again.
+    # @param self The object pointer.
+    # @param packet Raw packet data.
+    # @return None
+    def send_to_interface(self, packet):
+        self.put(packet)
+
+    ## Receive the packet from the application. Block until the packet arrives.
+    # @param self The object pointer.
+    # @return Raw packet data, or None if the transport has been closed.
+    def recv_from_app(self):
+        self.not_empty.acquire()
+        while self.running and not self.packets:
+            self.not_empty.wait()
+        packet = self.packets.popleft() if self.running else None
+        self.not_empty.release()
+        return packet
+
+    ## Stop receiving the packets, and wake up the waiting receiver.
+    # @param self The object pointer.
+    # @return None
+    def close(self):
+        self.not_empty.acquire()
+        self.running = False
+        self.not_empty.notify_all()
+        self.not_empty.release()
+
+
+## Class for the emulated node. The thread runs the DataHandler.DataHandler of the node, and passes the packets from
+# the application to it, as it is done by Node_init.RoutingDaemon.
+class EmulatedNode(threading.Thread):
+    ## Constructor.
+    # @param self The object pointer.
+    # @param network Reference to Emulator.Network object.
+    # @param number Number of the node, from which its MAC and IP addresses are derived.
+    # @param hello_interval Time interval (in seconds) between the HELLO messages of the node.
+    # @return None
+    def __init__(self, network, number, hello_interval=HELLO_INTERVAL):
+        super(EmulatedNode, self).__init__()
+        # The threads of the nodes don't keep the process running, if the emulation hasn't been stopped properly
+        self.daemon = True
+        ## @var number
+        # Number of the node.
+        self.number = number
+        ## @var mac
+        # MAC address of the node, as a 6-byte binary string.
+        self.mac = "\x02\x00" + struct.pack("!I", number)
+        ## @var ip
+        # IPv4 address of the node.
+        self.ip = socket.inet_ntoa(struct.pack("!I", (10 << 24) + number))
+        ## @var raw_transport
+        # Emulator.EmulatedRawTransport object of the node.
+        self.raw_transport = EmulatedRawTransport(network, self.mac)
+        ## @var app_transport
+        # Emulator.EmulatedVirtualTransport object of the node.
+        self.app_transport = EmulatedVirtualTransport()
+        ## @var table
+        # RouteTable.Table object of the node.
+        self.table = RouteTable.Table(self.mac)
+        self.table.table_filename = "table_%s.txt" % self.ip
+        ## @var data_handler
+        # DataHandler.DataHandler object of the node.
+        self.data_handler = DataHandler.DataHandler(self.app_transport, self.raw_transport, self.table)
+
+        advertise_thread = self.data_handler.neighbor_routine.advertise_thread
+        advertise_thread.get_node_ips = self.get_node_ips
+        advertise_thread.broadcast_interval = hello_interval
+        # Keep the same ratio of the expiry interval to the broadcast interval, as the defaults have
+        self.data_handler.neighbor_routine.listen_neighbors_handler.expiry_interval = 3.5 * hello_interval
+        for thread in (advertise_thread, self.data_handler.incoming_traffic_handler_thread,
+                       self.data_handler.app_handler.timer_wheel):
+            thread.daemon = True
+
+    ## Get the L3 addresses of the node.
+    # @param self The object pointer.
+    # @return list() of the node's IP addresses.
+    def get_node_ips(self):
+        return [self.ip]
+
+    ## Send the UDP packet from the node's application.
+    # @param self The object pointer.
+    # @param dst_ip Destination IP address.
+    # @param payload UDP payload.
+    # @param src_port Source UDP port.
+    # @param dst_port Destination UDP port.
+    # @return None
+    def send(self, dst_ip, payload, src_port=DEFAULT_PORT, dst_port=DEFAULT_PORT):
+        self.app_transport.put(build_udp_packet(self.ip, dst_ip, payload, src_port, dst_port))
+
+    ## Main thread routine.
+    # @param self The object pointer.
+    # @return None
+    def run(self):
+        self.data_handler.run()
+        while True:
+            packet = self.app_transport.recv_from_app()
+            if packet is None:
+                break
+            self.data_handler.app_handler.process_packet(packet)
+
+    ## Stop the node's threads and close its transports.
+    # @param self The object pointer.
+    # @return None
+    def quit(self):
+        self.data_handler.stop_threads()
+        self.raw_transport.close_raw_recv_socket()
+        self.app_transport.close()
@@ -0,0 +1,226 @@
+#!/usr/bin/python
+"""
+@package MessageHash
+Created on Oct 16, 2026
+
+@author: Dmitrii Dugaev
+
+
+This module generates the 32-bit MSG_HASH values, which bind the ACK and REWARD service messages to the messages they
+are sent on. The same hash is calculated on both ends of the link: by the sender of the message from the receiver's MAC
+address, and by the receiver of the message from its own MAC address.
+There are two hashing modes. The legacy mode takes the lower 32 bits of the md5 digest over the text form of the values.
+The fast mode combines a precomputed per-neighbor salt (CRC32 of the binary MAC address) with the message fields by a
+plain integer math. The receiver of a message replies in the fast mode, if it is enabled by FAST_HASH_FLAG, and the
+sender has advertised the protocol version of at least FAST_HASH_VERSION in its HELLO messages.
+The sender of a message expects the reply in a single mode per link, chosen in the same way from the protocol version of
+the receiver (see MessageHash.HashModes). The receiver may not have received the sender's HELLO yet (e.g., at the
+startup, or after a one-sided expiry of the neighbor on a lossy link), so the hash of the other mode is registered as a
+fallback after the first timeout, and the mode of the matched reply is kept for the link from then on. Both hashes are
+registered only towards the neighbors, which haven't been heard from yet.
+The reward hashes of the same (dst_ip, mac) pairs are generated on each forwarded packet, so they are cached.
+"""
+
+# Import necessary python modules from the standard library
+import hashlib
+import zlib
+
+# Import the necessary modules of the program
+from Transport import mac_to_str
+from conf import FAST_HASH_FLAG
+
+## @var MAX_INT32
+# 32-bit mask constant.
+MAX_INT32 = 0xFFFFFFFF
+## @var FAST_HASH_VERSION
+# The lowest protocol version, which supports the fast hashing mode.
+FAST_HASH_VERSION = 2
+## @var ID_MULTIPLIER
+# Odd 32-bit multiplier (golden ratio), which spreads the bits of the 20-bit message ID over the whole 32-bit value.
+# Since the multiplier is odd, the different IDs are never mapped to the same value for the same salt.
+ID_MULTIPLIER = 0x9E3779B1
+## @var MAC_SALTS
+# Cache of the precomputed per-neighbor salts. Format: {mac: 32-bit salt}.
+MAC_SALTS = dict()
+## @var REWARD_HASHES
+# Cache of the reward hashes, returned by get_reward_hashes. Format: {(dst_ip, mac, mode): tuple of 32-bit hashes}.
+REWARD_HASHES = dict()
+## @var MAX_REWARD_HASHES
+# Maximum number of the cached reward hashes. The hashes beyond it are generated without caching.
+MAX_REWARD_HASHES = 4096
+## @var FAST_MODE
+# Bit of the fast hashing mode in the mode mask.
+FAST_MODE = 1
+## @var LEGACY_MODE
+# Bit of the legacy hashing mode in the mode mask.
+LEGACY_MODE = 2
+## @var ANY_MODE
+# Mode mask of a reply, which may come in either of the modes.
+ANY_MODE = FAST_MODE | LEGACY_MODE
+## @var MODE_ORDERS
+# Modes of the hashes, in the order they are returned by get_ack_hashes and get_reward_hashes. Format: {mask: modes}.
+MODE_ORDERS = {FAST_MODE: (FAST_MODE,), LEGACY_MODE: (LEGACY_MODE,), ANY_MODE: (FAST_MODE, LEGACY_MODE)}
+
+
+## Get the salt value of the given MAC address.
+# @param mac MAC address as a 6-byte binary string.
+# @return 32-bit integer salt value.
+def get_salt(mac):
+    salt = MAC_SALTS.get(mac)
+    if salt is None:
+        salt = MAC_SALTS[mac] = zlib.crc32(mac) & MAX_INT32
+    return salt
+
+
+## Check whether the fast hashing mode should be used with the neighbor of the given protocol version.
+# @param protocol_version Protocol version of the neighbor, advertised in its HELLO messages.
+# @return True or False.
+def is_fast(protocol_version):
+    return FAST_HASH_FLAG and protocol_version >= FAST_HASH_VERSION
+
+
+## Generate the ACK hash of the message in the legacy mode.
+# @param msg_id ID of the acknowledged message.
+# @param mac MAC address of the receiver of the message, as a 6-byte binary string.
+# @return 32-bit integer hash value.
+def legacy_ack_hash(msg_id, mac):
+    return int(hashlib.md5(str(msg_id) + mac_to_str(mac)).hexdigest(), 16) & MAX_INT32
+
+
+## Generate the ACK hash of the message in the fast mode.
+# @param msg_id ID of the acknowledged message.
+# @param mac MAC address of the receiver of the message, as a 6-byte binary string.
+# @return 32-bit integer hash value.
+def fast_ack_hash(msg_id, mac):
+    salt = MAC_SALTS.get(mac)
+    if salt is None:
+        salt = get_salt(mac)
+    return (salt ^ msg_id * ID_MULTIPLIER) & MAX_INT32
+
+
+## Generate the reward hash of the packet in the legacy mode.
+# @param dst_ip Destination IP of the route for the packet.
+# @param mac MAC address of the receiver of the packet, as a 6-byte binary string.
+# @return 32-bit integer hash value.
+def legacy_reward_hash(dst_ip, mac):
+    return int(hashlib.md5(dst_ip + mac_to_str(mac)).hexdigest(), 16) & MAX_INT32
+
+
+## Generate the reward hash of the packet in the fast mode.
+# @param dst_ip Destination IP of the route for the packet.
+# @param mac MAC address of the receiver of the packet, as a 6-byte binary string.
+# @return 32-bit integer hash value.
+def fast_reward_hash(dst_ip, mac):
+    return zlib.crc32(dst_ip, get_salt(mac)) & MAX_INT32
+
+
+## Generate the ACK hash of the message in the mode, supported by the given neighbor.
+# @param msg_id ID of the acknowledged message.
+# @param mac MAC address of the receiver of the message, as a 6-byte binary string.
+# @param protocol_version Protocol version of the neighbor on the other end of the link.
+# @return 32-bit integer hash value.
+def get_ack_hash(msg_id, mac, protocol_version):
+    # The check of is_fast and the fast hash are inlined, since it is called on each received reliable message
+    if FAST_HASH_FLAG and protocol_version >= FAST_HASH_VERSION:
+        salt = MAC_SALTS.get(mac)
+        if salt is None:
+            salt = get_salt(mac)
+        return (salt ^ msg_id * ID_MULTIPLIER) & MAX_INT32
+    return legacy_ack_hash(msg_id, mac)
+
+
+## Generate the reward hash of the packet in the mode, supported by the given neighbor.
+# @param dst_ip Destination IP of the route for the packet.
+# @param mac MAC address of the receiver of the packet, as a 6-byte binary string.
+# @param protocol_version Protocol version of the neighbor on the other end of the link.
+# @return 32-bit integer hash value.
+def get_reward_hash(dst_ip, mac, protocol_version):
+    mode = FAST_MODE if FAST_HASH_FLAG and protocol_version >= FAST_HASH_VERSION else LEGACY_MODE
+    hash_values = REWARD_HASHES.get((dst_ip, mac, mode))
+    if hash_values is None:
+        hash_values = get_reward_hashes(dst_ip, mac, mode)
+    return hash_values[0]
+
+
+## Generate the ACK hashes of the sent message in the given modes.
+# @param msg_id ID of the acknowledged message.
+# @param mac MAC address of the receiver of the message, as a 6-byte binary string.
+# @param mode Mode mask of the expected reply, see MessageHash.HashModes.
+# @return Tuple of 32-bit integer hash values, in the order of MODE_ORDERS[mode].
+def get_ack_hashes(msg_id, mac, mode):
+    if mode == FAST_MODE:
+        return fast_ack_hash(msg_id, mac),
+    if mode == LEGACY_MODE:
+        return legacy_ack_hash(msg_id, mac),
+    return fast_ack_hash(msg_id, mac), legacy_ack_hash(msg_id, mac)
+
+
+## Generate the reward hashes of the sent packet in the given modes.
+# @param dst_ip Destination IP of the route for the packet.
+# @param mac MAC address of the receiver of the packet, as a 6-byte binary string.
+# @param mode Mode mask of the expected reply, see MessageHash.HashModes.
+# @return Tuple of 32-bit integer hash values, in the order of MODE_ORDERS[mode].
+def get_reward_hashes(dst_ip, mac, mode):
+    key = (dst_ip, mac, mode)
+    try:
+        return REWARD_HASHES[key]
+    except KeyError:
+        if mode == FAST_MODE:
+            hash_values = fast_reward_hash(dst_ip, mac),
+        elif mode == LEGACY_MODE:
+            hash_values = legacy_reward_hash(dst_ip, mac),
+        else:
+            hash_values = fast_reward_hash(dst_ip, mac), legacy_reward_hash(dst_ip, mac)
+        if len(REWARD_HASHES) < MAX_REWARD_HASHES:
+            REWARD_HASHES[key] = hash_values
+        return hash_values
+
+
+## Class HashModes keeps the hashing mode of the replies of each neighbor on the sending side of the links.
+# The mode of a neighbor is derived from its advertised protocol version, in the same way as the neighbor derives it
+# from the version of this node, so both ends agree, once they have received the HELLO messages of each other.
+# The mode is kept for the neighbor from then on, and is replaced only by the mode of the replies, which have actually
+# been received from the neighbor after a fallback. So a stale mode (e.g., of a neighbor, which has been restarted with
+# another version) is corrected by the fallback as well.
+class HashModes:
+    ## Constructor.
+    # @param self The object pointer.
+    # @param table Reference to RouteTable.Table object, which provides the protocol versions of the neighbors.
+    # @return None
+    def __init__(self, table):
+        ## @var table
+        # Reference to RouteTable.Table object, which provides the protocol versions of the neighbors.
+        self.table = table
+        ## @var modes
+        # Modes of the neighbors, which have advertised their protocol versions. Format: {mac: mode}.
+        self.modes = dict()
+
+    ## Get the mode mask of the replies of the given neighbor.
+    # @param self The object pointer.
+    # @param mac MAC address of the neighbor, as a 6-byte binary string.
+    # @return FAST_MODE, LEGACY_MODE, or ANY_MODE if the mode is uncertain.
+    def get_mode(self, mac):
+        mode = self.modes.get(mac)
+        if mode is None:
+            protocol_version = self.table.get_neighbor_version(mac, None)
+            # The neighbor hasn't been heard from yet
+            if protocol_version is None:
+                return ANY_MODE
+            mode = self.modes[mac] = FAST_MODE if is_fast(protocol_version) else LEGACY_MODE
+        return mode
+
+    ## Keep the mode of the reply, which has been received from the neighbor in either of the expected modes.
+    # @param self The object pointer.
+    # @param mac MAC address of the neighbor, as a 6-byte binary string.
+    # @param mode Mode of the matched hash, FAST_MODE or LEGACY_MODE.
+    # @return None
+    def on_reply(self, mac, mode):
+        self.modes[mac] = mode
+
+    ## Expect the replies of the neighbor in either of the modes, after the reply in a single mode hasn't been
+    # received within the timeout.
+    # @param self The object pointer.
+    # @param mac MAC address of the neighbor, as a 6-byte binary string.
+    # @return None
+    def on_timeout(self, mac):
+        self.modes[mac] = ANY_MODE
@@ -33,26 +33,33 @@ to select a next hop, not being completely relied on a current fixed route table
 |  5   |          RREP6            |        36               |      Route Reply service message for IPv6 destination   |
 |      |                           |                         |                                                         |
 |  6   |          HELLO            |        from 4 to 56     |               Hello service message                     |
+|      |                           |                         |  (can be followed by the VERSION extension - 2 bytes)   |
 |      |                           |                         |                                                         |
 |  7   |           ACK             |        8                |       ACK service message for reliable transmission     |
 |      |                           |                         |                                                         |
 |  8   |          REWARD           |        8                |               Reward service message                    |
 |      |                           |                         |                                                         |
 |  9   |   Reliable Data Packet    |        4                |   Unicast data packet which is transmitted using ARQ    |
+|      |                           |                         |                                                         |
+|  10  |   Windowed Data Packet    |        8                | Unicast data packet, transmitted using sliding window   |
+|      |                           |                         |                       selective-repeat ARQ              |
+|      |                           |                         |                                                         |
+|  11  |           SACK            |        10               |  Cumulative and selective ACK for windowed data packets |
+|      |                           |                         |                                                         |
+|  12  |         CONTROL           |        from 4 to 99     |  Aggregated ACK hashes and reward values. Can be chained|
+|      |                           |                         |     with another DSR header (piggybacked on a frame)    |
 ------------------------------------------------------------------------------------------------------------------------
 
-The messages (headers) are described as CType classes with pre-defined fields, depending on a message type.
+The messages (headers) are described as header classes with pre-defined fields, depending on a message type.
+The fixed-length headers are packed and unpacked with precompiled struct.Struct layouts.
 A detailed description of the fields and its functionality can be found in the documentation.
 """
 
 # Import necessary python modules from the standard library
 from random import randint
 from socket import AF_INET6, inet_pton, inet_aton, inet_ntoa, inet_ntop
-from socket import error as sock_error
 from math import ceil
-import ctypes
 import struct
-import binascii
 
 
 ## @var DEFAULT_ROUTE
@@ -63,103 +70,145 @@ DEFAULT_ROUTE = "0.0.0.0"
 DEFAULT_IPV6 = "fe80::"
 
 
-# Define static functions for packing and unpacking the message object to and from the binary dsr header.
-## Pack the Message object to dsr header. Return the byte array.
-# @param message Message object from Messages module.
-# @return packed byte array bytearray() value.
-def pack_message(message):
-    if isinstance(message, UnicastPacket):
-        return UnicastHeader().pack(message)
-
-    elif isinstance(message, BroadcastPacket):
-        return BroadcastHeader().pack(message)
-
-    elif isinstance(message, RreqMessage):
-        # Try to convert an address into binary form. If failed to convert from IPv4,
-        # then assume that the address is IPv6.
-        try:
-            inet_aton(message.src_ip)
-            message.type = 2
-            return Rreq4Header().pack(message)
+## @var TYPE_FIELD
+# Struct object for reading the first byte of the header, which contains the type ID in its lower 4 bits.
+TYPE_FIELD = struct.Struct("<B")
+## @var IPV6_WORDS
+# Struct object for splitting a binary IPv6 address into four 32-bit words, and merging it back.
+IPV6_WORDS = struct.Struct("!4I")
+## @var MAX_ID
+# 20-bit mask constant of the ID field.
+MAX_ID = 0xFFFFF
+## @var MAX_INT32
+# 32-bit mask constant.
+MAX_INT32 = 0xFFFFFFFF
+
+## @var BASE_PROTOCOL_VERSION
+# Version of the protocol of the nodes, which don't advertise any version in their HELLO messages.
+BASE_PROTOCOL_VERSION = 1
+## @var PROTOCOL_VERSION
+# Current version of the protocol. Version 2 adds the fast hashes of the ACK and reward messages (see MessageHash).
+# Version 3 adds the windowed data packets, the SACK and the control messages, and is advertised regardless of the
+# node's settings.
+PROTOCOL_VERSION = 3
+## @var WINDOWED_ARQ_VERSION
+# The lowest protocol version, which supports the windowed data packets and the SACK messages (types 10 and 11).
+WINDOWED_ARQ_VERSION = 3
+## @var CONTROL_MESSAGE_VERSION
+# The lowest protocol version, which supports the control messages (type 12).
+CONTROL_MESSAGE_VERSION = 3
+## @var HELLO_EXTENSION
+# Struct object of a HELLO extension, which is sent as the payload of the HELLO frame, right after the HELLO header.
+# Fields structure: EXTENSION_TYPE: 8 bits, VALUE: 8 bits. The older nodes ignore the payload of the HELLO frames.
+HELLO_EXTENSION = struct.Struct("<BB")
+## @var VERSION_EXTENSION_TYPE
+# Type of the HELLO extension, which advertises the protocol version of the node. The zero type is never used, so that
+# the padding of the short frames is not taken for an extension.
+VERSION_EXTENSION_TYPE = 1
+
+
+## @var CODECS
+# Registered header codecs, used for packing and unpacking the messages. Format: {type_id: header codec instance}.
+# The codec instance should provide pack, pack_into, unpack and unpack_from methods (see Messages.FixedHeader).
+CODECS = dict()
 
-        except sock_error:
-            message.type = 3
-            return Rreq6Header().pack(message)
 
-    elif isinstance(message, RrepMessage):
-        # Try to convert an address into binary form. If failed to convert from IPv4,
-        # then assume that the address is IPv6.
-        try:
-            inet_aton(message.src_ip)
-            message.type = 4
-            return Rrep4Header().pack(message)
-
-        except sock_error:
-            message.type = 5
-            return Rrep6Header().pack(message)
+# Define static functions for packing and unpacking the message object to and from the binary dsr header.
+## Register the header codec for the given message type ID.
+# A previously registered codec for the same type ID is replaced.
+# @param type_id Type ID of the message.
+# @param codec Header codec instance.
+# @return None
+def register_codec(type_id, codec):
+    CODECS[type_id] = codec
 
-    elif isinstance(message, HelloMessage):
-        return HelloHeader().pack(message)
 
-    elif isinstance(message, AckMessage):
-        return AckHeader().pack(message)
+## Pack the Message object to dsr header. Return the binary string.
+# @param message Message object from Messages module.
+# @return packed binary string value.
+def pack_message(message):
+    if message.type not in CODECS:
+        return None
 
-    elif isinstance(message, RewardMessage):
-        return RewardHeader().pack(message)
+    return CODECS[message.type].pack(message)
 
-    elif isinstance(message, ReliableDataPacket):
-        return ReliableDataHeader().pack(message)
 
-    else:
+## Pack the Message object to dsr header directly into the given buffer.
+# @param message Message object from Messages module.
+# @param buf Writable buffer (bytearray, mmap and so on) to pack the header into.
+# @param offset Position of the header in the buffer. Default is 0.
+# @return Length of the packed header, or None if the message type is unknown.
+def pack_message_into(message, buf, offset=0):
+    if message.type not in CODECS:
         return None
 
+    return CODECS[message.type].pack_into(buf, offset, message)
 
-## Unpack the Message object from the dsr header' bytearray value. Return the message object from Messages module.
-# @param binary_header Binary header (bytearray) with the packed message.
+
+## Unpack the Message object from the dsr header' binary value. Return the message object from Messages module.
+# The header is parsed directly from the given buffer (str, buffer, memoryview, mmap and so on) at the given offset,
+# without copying it out.
+# @param binary_header Buffer with the packed message.
+# @param offset Position of the packed message in the buffer. Default is 0.
 # @return Message object, length of the unpacked message.
-def unpack_message(binary_header):
-    class TypeField(ctypes.LittleEndianStructure):
-        _fields_ = [
-            ("TYPE", ctypes.c_uint32, 4),
-        ]
+def unpack_message(binary_header, offset=0):
+    # The type ID is stored in the lower 4 bits of the first byte
+    type_value = TYPE_FIELD.unpack_from(binary_header, offset)[0] & 0xF
 
-    # Get a field with type value
-    type_binary_field = binary_header[:4]
-    type_field_unpacked = TypeField.from_buffer_copy(type_binary_field)
-    type_value = type_field_unpacked.TYPE
+    if type_value in CODECS:
+        return CODECS[type_value].unpack_from(binary_header, offset)
 
-    if type_value == 0:
-        return UnicastHeader().unpack(binary_header)
+    else:
+        return None
 
-    elif type_value == 1:
-        return BroadcastHeader().unpack(binary_header)
 
-    elif type_value == 2:
-        return Rreq4Header().unpack(binary_header)
+## Pack the reward value into the 8-bit field: NEG_REWARD_FLAG: 1 bit, followed by REWARD_VALUE: 7 bits.
+# @param reward_value Reward value.
+# @return 8-bit integer value of the field.
+def pack_reward_field(reward_value):
+    if reward_value < 0:
+        return 1 | (abs(reward_value) & 0x7F) << 1
+    else:
+        return (reward_value & 0x7F) << 1
 
-    elif type_value == 3:
-        return Rreq6Header().unpack(binary_header)
 
-    elif type_value == 4:
-        return Rrep4Header().unpack(binary_header)
+## Unpack the reward value from the 8-bit field: NEG_REWARD_FLAG: 1 bit, followed by REWARD_VALUE: 7 bits.
+# @param reward_field 8-bit integer value of the field.
+# @return Reward value.
+def unpack_reward_field(reward_field):
+    if reward_field & 1:
+        return -1 * (reward_field >> 1)
+    else:
+        return reward_field >> 1
 
-    elif type_value == 5:
-        return Rrep6Header().unpack(binary_header)
 
-    elif type_value == 6:
-        return HelloHeader().unpack(binary_header)
+## Pack the HELLO extension, which advertises the given protocol version.
+# @param version Protocol version of the node.
+# @return Binary string of the extension.
+def pack_version_extension(version):
+    return HELLO_EXTENSION.pack(VERSION_EXTENSION_TYPE, version)
 
-    elif type_value == 7:
-        return AckHeader().unpack(binary_header)
 
-    elif type_value == 8:
-        return RewardHeader().unpack(binary_header)
+## Unpack the advertised protocol version from the payload of the HELLO frame.
+# @param payload Payload of the HELLO frame, after the HELLO header.
+# @return Protocol version of the node, or BASE_PROTOCOL_VERSION if the payload doesn't contain the version extension.
+def unpack_version_extension(payload):
+    if len(payload) < HELLO_EXTENSION.size:
+        return BASE_PROTOCOL_VERSION
+    extension_type, version = HELLO_EXTENSION.unpack_from(payload, 0)
+    if extension_type != VERSION_EXTENSION_TYPE:
+        return BASE_PROTOCOL_VERSION
+    return version
 
-    elif type_value == 9:
-        return ReliableDataHeader().unpack(binary_header)
 
-    else:
-        return None
+## Pack the common first field of the header: TYPE: 4 bits, ID: 20 bits, and the last 8 bits field.
+# The values are truncated to the size of the fields, as it is done by the ctypes bit fields.
+# @param type_id Type ID of the message.
+# @param id_value ID of the message.
+# @param last_value Value of the last 8 bits field (HOP_COUNT, BROADCAST_TTL, TX_COUNT and so on).
+# @return 32-bit integer value of the field.
+def pack_common_field(type_id, id_value, last_value):
+    return (type_id & 0xF) | (id_value & MAX_ID) << 4 | (last_value & 0xFF) << 24
 
 
 # TODO: make constructors for all messages
@@ -218,10 +267,14 @@ class BroadcastPacket:
 ## Route Request service message.
 # This service message is used for both IPv4 and IPv6 L3 addressing cases.
 class RreqMessage:
+    ## Type ID of RREQ message for IPv4 destination.
+    ipv4_type = 2
+    ## Type ID of RREQ message for IPv6 destination.
+    ipv6_type = 3
     ## Type ID of RREQ message.
-    # This type ID value is being set in Messages.pack_message function, depending on L3 addressing type this
-    # message contains. In case of IPv4 - type ID is 2, in case of IPv6 - type ID is 3.
-    type = int()
+    # This type ID value depends on L3 addressing type this message contains, and is being set in
+    # Messages.RreqMessage.set_addresses method. In case of IPv4 - type ID is 2, in case of IPv6 - type ID is 3.
+    type = ipv4_type
 
     ## Constructor.
     # @param self The object pointer.
@@ -248,14 +301,32 @@ class RreqMessage:
         out_string = "ID: %s, SRC_IP: %s, DST_IP: %s, HOP_COUNT: %s" % out_tuple
         return out_string
 
+    ## Set the source and destination IP addresses, and the corresponding type ID of the message.
+    # The type ID of IPv6 is chosen if any of the addresses is an IPv6 address.
+    # @param self The object pointer.
+    # @param src_ip Source IP address in a string representation form of IPv4 or IPv6 addresses.
+    # @param dst_ip Destination IP address in a string representation form of IPv4 or IPv6 addresses.
+    # @return None
+    def set_addresses(self, src_ip, dst_ip):
+        self.src_ip = src_ip
+        self.dst_ip = dst_ip
+        if ":" in src_ip or ":" in dst_ip:
+            self.type = self.ipv6_type
+        else:
+            self.type = self.ipv4_type
+
 
 ## Route Reply service message.
 # This service message is used for both IPv4 and IPv6 L3 addressing cases.
 class RrepMessage:
+    ## Type ID of RREP message for IPv4 destination.
+    ipv4_type = 4
+    ## Type ID of RREP message for IPv6 destination.
+    ipv6_type = 5
     ## Type ID of RREP message.
-    # This type ID value is being set in Messages.pack_message function, depending on L3 addressing type this
-    # message contains. In case of IPv4 - type ID is 4, in case of IPv6 - type ID is 5.
-    type = int()
+    # This type ID value depends on L3 addressing type this message contains, and is being set in
+    # Messages.RrepMessage.set_addresses method. In case of IPv4 - type ID is 4, in case of IPv6 - type ID is 5.
+    type = ipv4_type
 
     ## Constructor.
     # @param self The object pointer.
@@ -282,6 +353,20 @@ class RrepMessage:
         out_string = "TYPE: %s, ID: %s, SRC_IP: %s, DST_IP: %s, HOP_COUNT: %s" % out_tuple
         return out_string
 
+    ## Set the source and destination IP addresses, and the corresponding type ID of the message.
+    # The type ID of IPv6 is chosen if any of the addresses is an IPv6 address.
+    # @param self The object pointer.
+    # @param src_ip Source IP address in a string representation form of IPv4 or IPv6 addresses.
+    # @param dst_ip Destination IP address in a string representation form of IPv4 or IPv6 addresses.
+    # @return None
+    def set_addresses(self, src_ip, dst_ip):
+        self.src_ip = src_ip
+        self.dst_ip = dst_ip
+        if ":" in src_ip or ":" in dst_ip:
+            self.type = self.ipv6_type
+        else:
+            self.type = self.ipv4_type
+
 
 ## Hello service message.
 class HelloMessage:
@@ -427,415 +512,404 @@ class ReliableDataPacket:
         return out_string
 
 
+## Unicast data packet, transmitted using sliding window selective-repeat ARQ.
+# The packets are numbered with the sequence numbers of the sender's window towards the given neighbor.
+class WindowedDataPacket:
+    ## Type ID of windowed reliable Unicast Data Packet.
+    type = 10
+
+    ## Constructor.
+    # @param self The object pointer.
+    # @return None
+    def __init__(self):
+        ## @var id
+        # ID of the sender's window session. The receiver resets its window, once the session ID changes.
+        # Max value is (2**20 - 1), since the id field size is 20 bits.
+        self.id = 0
+        ## @var hop_count
+        # Current hop count value.
+        self.hop_count = 0
+        ## @var seq
+        # 16-bit sequence number of the packet.
+        self.seq = 0
+        ## @var base
+        # 16-bit sequence number of the oldest unacknowledged packet of the sender's window.
+        self.base = 0
+
+    ## Default print method.
+    # @param self The object pointer.
+    # @return String with "TYPE: , ID: , HOP_COUNT: , SEQ: , BASE: ".
+    def __str__(self):
+        out_tuple = (self.type, self.id, self.hop_count, self.seq, self.base)
+        out_string = "TYPE: %s, ID: %s, HOP_COUNT: %s, SEQ: %s, BASE: %s" % out_tuple
+        return out_string
+
+
+## Selective acknowledgement (SACK) service message.
+# Acknowledges all the windowed data packets before CUM_SEQ, and the packets after it, which are marked in the
+# SACK_BITMAP.
+class SackMessage:
+    ## Type ID of SACK service message.
+    type = 11
+
+    ## Constructor.
+    # @param self The object pointer.
+    # @return None
+    def __init__(self):
+        ## @var id
+        # ID of the acknowledged sender's window session.
+        self.id = 0
+        ## @var tx_count
+        # Number of message retransmission times.
+        self.tx_count = 0
+        ## @var cum_seq
+        # 16-bit sequence number of the next expected packet. All the packets before it have been received.
+        self.cum_seq = 0
+        ## @var sack_bitmap
+        # 32-bit bitmap of the received packets after cum_seq: bit N corresponds to the packet (cum_seq + 1 + N).
+        self.sack_bitmap = 0
+
+    ## Default print method.
+    # @param self The object pointer.
+    # @return String with "TYPE: , ID: , TX_COUNT: , CUM_SEQ: , SACK_BITMAP: ".
+    def __str__(self):
+        out_tuple = (self.type, self.id, self.tx_count, self.cum_seq, self.sack_bitmap)
+        out_string = "TYPE: %s, ID: %s, TX_COUNT: %s, CUM_SEQ: %s, SACK_BITMAP: %s" % out_tuple
+        return out_string
+
+
+## Control service message, which aggregates several ACK hashes and reward values, destined to the same neighbor.
+# The message can be chained with another DSR header, which follows it in the same frame. This way, the pending ACKs and
+# rewards are piggybacked on the outgoing frames.
+class ControlMessage:
+    ## Type ID of control service message.
+    type = 12
+
+    ## Maximum number of ACK hashes in a single message (size of ACK_COUNT field).
+    max_ack_count = 15
+
+    ## Maximum number of rewards in a single message (size of REWARD_COUNT field).
+    max_reward_count = 7
+
+    ## Constructor.
+    # @param self The object pointer.
+    # @return None
+    def __init__(self):
+        ## @var id
+        # Unique message ID.
+        self.id = randint(0, 1048575)
+        ## @var chained
+        # Flag, which shows whether the message is followed by another DSR header in the frame. 0 or 1.
+        self.chained = 0
+        ## @var ack_hashes
+        # List of the hash values of the acknowledged messages. See Messages.AckMessage.msg_hash.
+        self.ack_hashes = list()
+        ## @var rewards
+        # List of the (reward_value, msg_hash) pairs. See Messages.RewardMessage.
+        self.rewards = list()
+
+    ## Check whether the message can't take any more ACK hashes or rewards.
+    # @param self The object pointer.
+    # @return True if the message is full, False otherwise.
+    def is_full(self):
+        return len(self.ack_hashes) >= self.max_ack_count or len(self.rewards) >= self.max_reward_count
+
+    ## Default print method.
+    # @param self The object pointer.
+    # @return String with "TYPE: , ID: , CHAINED: , ACK_HASHES: , REWARDS: ".
+    def __str__(self):
+        out_tuple = (self.type, self.id, self.chained, self.ack_hashes, self.rewards)
+        out_string = "TYPE: %s, ID: %s, CHAINED: %s, ACK_HASHES: %s, REWARDS: %s" % out_tuple
+        return out_string
+
+
 #######################################################################################################################
 # ## Describe DSR headers which will pack the initial message object and return a binary string ## #
-## Unicast header.
-class UnicastHeader:
-    ## Unicast data header structure.
-    # This sub-class describes a header structure for unicast data packet.
-    # Fields structure:
-    # TYPE: 4 bits, ID: 20 bits, HOP_COUNT: 8 bits. Total length: 32 bits.
-    class Header(ctypes.LittleEndianStructure):
-        _fields_ = [
-            ("TYPE", ctypes.c_uint32, 4),
-            ("ID", ctypes.c_uint32, 20),
-            ("HOP_COUNT", ctypes.c_uint32, 8)
-        ]
+## Base class of the headers with a fixed length.
+# The header layout is described by a precompiled struct.Struct object, which is created once per header type.
+# All the bit fields of the ctypes.LittleEndianStructure layout, used by the previous versions of the protocol, are
+# packed into little-endian 32-bit words, so that the binary representation stays the same.
+# The subclasses define the layout and the conversion between the message object and the tuple of the header fields.
+class FixedHeader:
+    ## Struct object with the layout of the header.
+    layout = struct.Struct("<I")
 
     ## Constructor.
     # @param self The object pointer.
     # @return None
     def __init__(self):
+        ## @var size
+        # Length of the header in bytes.
+        self.size = self.layout.size
+
+    ## Get the tuple of the header fields from the message object.
+    # @param self The object pointer.
+    # @param message Message object from Messages module.
+    # @return tuple() of the header fields, in the order of the layout.
+    def get_fields(self, message):
         pass
 
-    ## Pack the message object into the given structure.
+    ## Create the message object from the tuple of the header fields.
     # @param self The object pointer.
-    # @param unicast_message The Messages.UnicastPacket object.
-    # @return A header binary string in hex representation.
-    def pack(self, unicast_message):
-        header = self.Header(unicast_message.type, unicast_message.id, unicast_message.hop_count)
-        # Return the array in byte representation
-        return bytearray(header)
+    # @param fields tuple() of the header fields, in the order of the layout.
+    # @return Message object from Messages module.
+    def create_message(self, fields):
+        pass
+
+    ## Pack the message object into the binary string.
+    # @param self The object pointer.
+    # @param message Message object from Messages module.
+    # @return A header binary string.
+    def pack(self, message):
+        return self.layout.pack(*self.get_fields(message))
+
+    ## Pack the message object into the given buffer.
+    # @param self The object pointer.
+    # @param buf Writable buffer (bytearray, mmap and so on) to pack the header into.
+    # @param offset Position of the header in the buffer.
+    # @param message Message object from Messages module.
+    # @return Length of the packed header.
+    def pack_into(self, buf, offset, message):
+        self.layout.pack_into(buf, offset, *self.get_fields(message))
+        return self.size
 
     ## Unpack the message object from the binary string.
     # @param self The object pointer.
-    # @param binary_header Binary string with the Header structure.
+    # @param binary_header Binary string with the header structure.
     # @return (message object, created from the binary string), (length of the unpacked header structure)
     def unpack(self, binary_header):
-        # Cast the byte_array into the structure
-        header_unpacked = self.Header.from_buffer_copy(binary_header)
-        # Get values and create message object and fill up the fields
+        return self.create_message(self.layout.unpack_from(binary_header, 0)), self.size
+
+    ## Unpack the message object from the given buffer, without copying the header out of it.
+    # @param self The object pointer.
+    # @param buf Buffer (str, buffer, memoryview, mmap and so on), containing the header.
+    # @param offset Position of the header in the buffer.
+    # @return (message object, created from the buffer), (length of the unpacked header structure)
+    def unpack_from(self, buf, offset):
+        return self.create_message(self.layout.unpack_from(buf, offset)), self.size
+
+
+## Unicast header.
+class UnicastHeader(FixedHeader):
+    ## Unicast data header structure.
+    # This layout describes a header structure for unicast data packet.
+    # Fields structure:
+    # TYPE: 4 bits, ID: 20 bits, HOP_COUNT: 8 bits. Total length: 32 bits.
+    layout = struct.Struct("<I")
+
+    ## Get the tuple of the header fields from the message object.
+    # @param self The object pointer.
+    # @param unicast_message The Messages.UnicastPacket object.
+    # @return tuple() of the header fields.
+    def get_fields(self, unicast_message):
+        return pack_common_field(unicast_message.type, unicast_message.id, unicast_message.hop_count),
+
+    ## Create the message object from the tuple of the header fields.
+    # @param self The object pointer.
+    # @param fields tuple() of the header fields.
+    # @return Messages.UnicastPacket object.
+    def create_message(self, fields):
         message = UnicastPacket()
-        message.id = header_unpacked.ID
-        message.hop_count = header_unpacked.HOP_COUNT
-        # Return the message
-        return message, len(bytearray(header_unpacked))
+        message.id = (fields[0] >> 4) & MAX_ID
+        message.hop_count = fields[0] >> 24
+        return message
 
 
 ## Broadcast header.
-class BroadcastHeader:
+class BroadcastHeader(FixedHeader):
     ## Broadcast data header structure.
-    # This sub-class describes a header structure for broadcast data packet.
+    # This layout describes a header structure for broadcast data packet.
     # Fields structure:
     # TYPE: 4 bits, ID: 20 bits, BROADCAST_TTL: 8 bits. Total length: 32 bits.
-    class Header(ctypes.LittleEndianStructure):
-        _fields_ = [
-            ("TYPE", ctypes.c_uint32, 4),
-            ("ID", ctypes.c_uint32, 20),
-            ("BROADCAST_TTL", ctypes.c_uint32, 8)
-        ]
-
-    ## Constructor.
-    # @param self The object pointer.
-    # @return None
-    def __init__(self):
-        pass
+    layout = struct.Struct("<I")
 
-    ## Pack the message object into the given structure.
+    ## Get the tuple of the header fields from the message object.
     # @param self The object pointer.
     # @param broadcast_message The Messages.BroadcastPacket object.
-    # @return A header binary string in hex representation.
-    def pack(self, broadcast_message):
-        header = self.Header(broadcast_message.type, broadcast_message.id, broadcast_message.broadcast_ttl)
-        # Return the array in byte representation
-        return bytearray(header)
+    # @return tuple() of the header fields.
+    def get_fields(self, broadcast_message):
+        return pack_common_field(broadcast_message.type, broadcast_message.id, broadcast_message.broadcast_ttl),
 
-    ## Unpack the message object from the binary string.
+    ## Create the message object from the tuple of the header fields.
     # @param self The object pointer.
-    # @param binary_header Binary string with the Header structure.
-    # @return (message object, created from the binary string), (length of the unpacked header structure)
-    def unpack(self, binary_header):
-        # Cast the byte_array into the structure
-        header_unpacked = self.Header.from_buffer_copy(binary_header)
-        # Get values and create message object and fill up the fields
+    # @param fields tuple() of the header fields.
+    # @return Messages.BroadcastPacket object.
+    def create_message(self, fields):
         message = BroadcastPacket()
-        message.id = header_unpacked.ID
-        message.broadcast_ttl = header_unpacked.BROADCAST_TTL
-        # Return the message
-        return message, len(bytearray(header_unpacked))
+        message.id = (fields[0] >> 4) & MAX_ID
+        message.broadcast_ttl = fields[0] >> 24
+        return message
 
 
 ## RREQ4 header.
-class Rreq4Header:
+class Rreq4Header(FixedHeader):
     ## RREQ4 header structure.
-    # This sub-class describes a header structure for RREQ4 service message.
+    # This layout describes a header structure for RREQ4 service message.
     # Fields structure:
     # TYPE: 4 bits, ID: 20 bits, HOP_COUNT: 8 bits, SRC_IP: 32 bits, DST_IP: 32 bits. Total length: 96 bits.
-    class Header(ctypes.LittleEndianStructure):
-        _fields_ = [
-            ("TYPE", ctypes.c_uint32, 4),
-            ("ID", ctypes.c_uint32, 20),
-            ("HOP_COUNT", ctypes.c_uint32, 8),
-            ("SRC_IP", ctypes.c_uint32, 32),
-            ("DST_IP", ctypes.c_uint32, 32)
-        ]
-
-    ## Constructor.
-    # @param self The object pointer.
-    # @return None
-    def __init__(self):
-        pass
+    # The IPv4 addresses are stored as little-endian 32-bit words, i.e. in the reversed network byte order.
+    layout = struct.Struct("<I4s4s")
 
-    ## Pack the message object into the given structure.
+    ## Get the tuple of the header fields from the message object.
     # @param self The object pointer.
     # @param rreq4_message The Messages.RreqMessage object.
-    # @return A header binary string in hex representation.
-    def pack(self, rreq4_message):
-        # Turn string representations of IP addresses into an integer form
-        src_ip = struct.unpack("!I", inet_aton(rreq4_message.src_ip))[0]
-        dst_ip = struct.unpack("!I", inet_aton(rreq4_message.dst_ip))[0]
-        header = self.Header(rreq4_message.type, rreq4_message.id, rreq4_message.hop_count, src_ip, dst_ip)
-        # Return the array in byte representation
-        return bytearray(header)
+    # @return tuple() of the header fields.
+    def get_fields(self, rreq4_message):
+        return (pack_common_field(rreq4_message.type, rreq4_message.id, rreq4_message.hop_count),
+                inet_aton(rreq4_message.src_ip)[::-1], inet_aton(rreq4_message.dst_ip)[::-1])
 
-    ## Unpack the message object from the binary string.
+    ## Create the message object from the tuple of the header fields.
     # @param self The object pointer.
-    # @param binary_header Binary string with the Header structure.
-    # @return (message object, created from the binary string), (length of the unpacked header structure)
-    def unpack(self, binary_header):
-        # Cast the byte_array into the structure
-        header_unpacked = self.Header.from_buffer_copy(binary_header)
-        # Get values and create message object and fill up the fields
+    # @param fields tuple() of the header fields.
+    # @return Messages.RreqMessage object.
+    def create_message(self, fields):
         message = RreqMessage()
-        message.type = header_unpacked.TYPE
-        message.id = header_unpacked.ID
-        message.hop_count = header_unpacked.HOP_COUNT
-        message.src_ip = inet_ntoa(struct.pack("!I", header_unpacked.SRC_IP))
-        message.dst_ip = inet_ntoa(struct.pack("!I", header_unpacked.DST_IP))
-        # Return the message
-        return message, len(bytearray(header_unpacked))
+        message.type = fields[0] & 0xF
+        message.id = (fields[0] >> 4) & MAX_ID
+        message.hop_count = fields[0] >> 24
+        message.src_ip = inet_ntoa(fields[1][::-1])
+        message.dst_ip = inet_ntoa(fields[2][::-1])
+        return message
 
 
 ## RREQ6 header.
-class Rreq6Header:
+class Rreq6Header(FixedHeader):
     ## RREQ6 header structure.
-    # This sub-class describes a header structure for RREQ6 service message.
+    # This layout describes a header structure for RREQ6 service message.
     # Fields structure:
     # TYPE: 4 bits, ID: 20 bits, HOP_COUNT: 8 bits, SRC_IP1: 32 bits, SRC_IP2: 32 bits, SRC_IP3: 32 bits,
     # SRC_IP4: 32 bits, DST_IP1: 32 bits, DST_IP2: 32 bits, DST_IP3: 32 bits, DST_IP4: 32 bits. Total length: 288 bits.
-    class Header(ctypes.LittleEndianStructure):
-        _fields_ = [
-            ("TYPE", ctypes.c_uint32, 4),
-            ("ID", ctypes.c_uint32, 20),
-            ("HOP_COUNT", ctypes.c_uint32, 8),
-            ("SRC_IP1", ctypes.c_uint32, 32),
-            ("SRC_IP2", ctypes.c_uint32, 32),
-            ("SRC_IP3", ctypes.c_uint32, 32),
-            ("SRC_IP4", ctypes.c_uint32, 32),
-            ("DST_IP1", ctypes.c_uint32, 32),
-            ("DST_IP2", ctypes.c_uint32, 32),
-            ("DST_IP3", ctypes.c_uint32, 32),
-            ("DST_IP4", ctypes.c_uint32, 32)
-        ]
-
-    ## 64-bit mask constant.
-    max_int64 = 0xFFFFFFFFFFFFFFFF
-    ## 32-bit mask constant.
-    max_int32 = 0xFFFFFFFF
+    # Each 32-bit part of the IPv6 addresses is stored as a little-endian word.
+    layout = struct.Struct("<9I")
 
-    ## Constructor.
-    # @param self The object pointer.
-    # @return None
-    def __init__(self):
-        pass
-
-    ## Pack the message object into the given structure.
+    ## Get the tuple of the header fields from the message object.
     # @param self The object pointer.
     # @param rreq6_message The Messages.RreqMessage object.
-    # @return A header binary string in hex representation.
-    def pack(self, rreq6_message):
-        # Turn string representations of IP addresses into an integer form
-        src_ip = int(binascii.hexlify(inet_pton(AF_INET6, rreq6_message.src_ip)), 16)
+    # @return tuple() of the header fields.
+    def get_fields(self, rreq6_message):
         # Check the destination IP if it is default address or not.
         # If yes, then change it to the corresponding IPv6 value.
         if rreq6_message.dst_ip == DEFAULT_ROUTE:
             rreq6_message.dst_ip = DEFAULT_IPV6
 
-        dst_ip = int(binascii.hexlify(inet_pton(AF_INET6, rreq6_message.dst_ip)), 16)
         # Split each IPv6 128-bit value into four 32-bit parts
-        src_ip_left_64 = (src_ip >> 64) & self.max_int64
-        src_ip_right_64 = src_ip & self.max_int64
-        dst_ip_left_64 = (dst_ip >> 64) & self.max_int64
-        dst_ip_right_64 = dst_ip & self.max_int64
-
-        # Pack the values
-        header = self.Header(rreq6_message.type, rreq6_message.id, rreq6_message.hop_count,
-                             (src_ip_left_64 >> 32) & self.max_int32, src_ip_left_64 & self.max_int32,
-                             (src_ip_right_64 >> 32) & self.max_int32, src_ip_right_64 & self.max_int32,
-                             (dst_ip_left_64 >> 32) & self.max_int32, dst_ip_left_64 & self.max_int32,
-                             (dst_ip_right_64 >> 32) & self.max_int32, dst_ip_right_64 & self.max_int32)
+        return ((pack_common_field(rreq6_message.type, rreq6_message.id, rreq6_message.hop_count),) +
+                IPV6_WORDS.unpack(inet_pton(AF_INET6, rreq6_message.src_ip)) +
+                IPV6_WORDS.unpack(inet_pton(AF_INET6, rreq6_message.dst_ip)))
 
-        # Return the array in byte representation
-        return bytearray(header)
-
-    ## Unpack the message object from the binary string.
+    ## Create the message object from the tuple of the header fields.
     # @param self The object pointer.
-    # @param binary_header Binary string with the Header structure.
-    # @return (message object, created from the binary string), (length of the unpacked header structure)
-    def unpack(self, binary_header):
-        # Cast the byte_array into the structure
-        header_unpacked = self.Header.from_buffer_copy(binary_header)
-        # Get values and create message object and fill up the fields
+    # @param fields tuple() of the header fields.
+    # @return Messages.RreqMessage object.
+    def create_message(self, fields):
         message = RreqMessage()
-        message.type = header_unpacked.TYPE
-        message.id = header_unpacked.ID
-        message.hop_count = header_unpacked.HOP_COUNT
+        message.type = fields[0] & 0xF
+        message.id = (fields[0] >> 4) & MAX_ID
+        message.hop_count = fields[0] >> 24
         # Merge the parts of 128-bit IPv6 address together
-        src_ip_left_64 = (header_unpacked.SRC_IP1 << 32 | header_unpacked.SRC_IP2)
-        src_ip_right_64 = (header_unpacked.SRC_IP3 << 32 | header_unpacked.SRC_IP4)
-        dst_ip_left_64 = (header_unpacked.DST_IP1 << 32 | header_unpacked.DST_IP2)
-        dst_ip_right_64 = (header_unpacked.DST_IP3 << 32 | header_unpacked.DST_IP4)
-
-        src_ip_packed_value = struct.pack(b"!QQ", src_ip_left_64, src_ip_right_64)
-        dst_ip_packed_value = struct.pack(b"!QQ", dst_ip_left_64, dst_ip_right_64)
-
-        message.src_ip = inet_ntop(AF_INET6, src_ip_packed_value)
-        message.dst_ip = inet_ntop(AF_INET6, dst_ip_packed_value)
+        message.src_ip = inet_ntop(AF_INET6, IPV6_WORDS.pack(*fields[1:5]))
+        message.dst_ip = inet_ntop(AF_INET6, IPV6_WORDS.pack(*fields[5:9]))
         # Check the destination IP if it is the default IPv6 value.
         # If yes, then change it back to the value of the DEFAULT_ROUTE
         if message.dst_ip == DEFAULT_IPV6:
             message.dst_ip = DEFAULT_ROUTE
 
-        # Return the message
-        return message, len(bytearray(header_unpacked))
+        return message
 
 
 ## RREP4 header.
-class Rrep4Header:
+class Rrep4Header(FixedHeader):
     ## RREP4 header structure.
-    # This sub-class describes a header structure for RREP4 service message.
+    # This layout describes a header structure for RREP4 service message.
     # Fields structure:
     # TYPE: 4 bits, ID: 20 bits, HOP_COUNT: 8 bits, SRC_IP: 32 bits, DST_IP: 32 bits. Total length: 96 bits.
-    class Header(ctypes.LittleEndianStructure):
-        _fields_ = [
-            ("TYPE", ctypes.c_uint32, 4),
-            ("ID", ctypes.c_uint32, 20),
-            ("HOP_COUNT", ctypes.c_uint32, 8),
-            ("SRC_IP", ctypes.c_uint32, 32),
-            ("DST_IP", ctypes.c_uint32, 32)
-        ]
+    # The IPv4 addresses are stored as little-endian 32-bit words, i.e. in the reversed network byte order.
+    layout = struct.Struct("<I4s4s")
 
-    ## Constructor.
-    # @param self The object pointer.
-    # @return None
-    def __init__(self):
-        pass
-
-    ## Pack the message object into the given structure.
+    ## Get the tuple of the header fields from the message object.
     # @param self The object pointer.
     # @param rrep4_message The Messages.RrepMessage object.
-    # @return A header binary string in hex representation.
-    def pack(self, rrep4_message):
-        # Turn string representations of IP addresses into an integer form
-        src_ip = struct.unpack("!I", inet_aton(rrep4_message.src_ip))[0]
-        dst_ip = struct.unpack("!I", inet_aton(rrep4_message.dst_ip))[0]
-        header = self.Header(rrep4_message.type, rrep4_message.id, rrep4_message.hop_count, src_ip, dst_ip)
-        # Return the array in byte representation
-        return bytearray(header)
+    # @return tuple() of the header fields.
+    def get_fields(self, rrep4_message):
+        return (pack_common_field(rrep4_message.type, rrep4_message.id, rrep4_message.hop_count),
+                inet_aton(rrep4_message.src_ip)[::-1], inet_aton(rrep4_message.dst_ip)[::-1])
 
-    ## Unpack the message object from the binary string.
+    ## Create the message object from the tuple of the header fields.
     # @param self The object pointer.
-    # @param binary_header Binary string with the Header structure.
-    # @return (message object, created from the binary string), (length of the unpacked header structure)
-    def unpack(self, binary_header):
-        # Cast the byte_array into the structure
-        header_unpacked = self.Header.from_buffer_copy(binary_header)
-        # Get values and create message object and fill up the fields
+    # @param fields tuple() of the header fields.
+    # @return Messages.RrepMessage object.
+    def create_message(self, fields):
         message = RrepMessage()
-        message.type = header_unpacked.TYPE
-        message.id = header_unpacked.ID
-        message.hop_count = header_unpacked.HOP_COUNT
-        message.src_ip = inet_ntoa(struct.pack("!I", header_unpacked.SRC_IP))
-        message.dst_ip = inet_ntoa(struct.pack("!I", header_unpacked.DST_IP))
-        # Return the message
-        return message, len(bytearray(header_unpacked))
+        message.type = fields[0] & 0xF
+        message.id = (fields[0] >> 4) & MAX_ID
+        message.hop_count = fields[0] >> 24
+        message.src_ip = inet_ntoa(fields[1][::-1])
+        message.dst_ip = inet_ntoa(fields[2][::-1])
+        return message
 
 
 ## RREP6 header.
-class Rrep6Header:
+class Rrep6Header(FixedHeader):
     ## RREP6 header structure.
-    # This sub-class describes a header structure for RREP6 service message.
+    # This layout describes a header structure for RREP6 service message.
     # Fields structure:
     # TYPE: 4 bits, ID: 20 bits, HOP_COUNT: 8 bits, SRC_IP1: 32 bits, SRC_IP2: 32 bits, SRC_IP3: 32 bits,
     # SRC_IP4: 32 bits, DST_IP1: 32 bits, DST_IP2: 32 bits, DST_IP3: 32 bits, DST_IP4: 32 bits. Total length: 288 bits.
-    class Header(ctypes.LittleEndianStructure):
-        _fields_ = [
-            ("TYPE", ctypes.c_uint32, 4),
-            ("ID", ctypes.c_uint32, 20),
-            ("HOP_COUNT", ctypes.c_uint32, 8),
-            ("SRC_IP1", ctypes.c_uint32, 32),
-            ("SRC_IP2", ctypes.c_uint32, 32),
-            ("SRC_IP3", ctypes.c_uint32, 32),
-            ("SRC_IP4", ctypes.c_uint32, 32),
-            ("DST_IP1", ctypes.c_uint32, 32),
-            ("DST_IP2", ctypes.c_uint32, 32),
-            ("DST_IP3", ctypes.c_uint32, 32),
-            ("DST_IP4", ctypes.c_uint32, 32)
-        ]
-
-    ## 64-bit mask constant.
-    max_int64 = 0xFFFFFFFFFFFFFFFF
-    ## 32-bit mask constant.
-    max_int32 = 0xFFFFFFFF
-
-    ## Constructor.
-    # @param self The object pointer.
-    # @return None
-    def __init__(self):
-        pass
+    # Each 32-bit part of the IPv6 addresses is stored as a little-endian word.
+    layout = struct.Struct("<9I")
 
-    ## Pack the message object into the given structure.
+    ## Get the tuple of the header fields from the message object.
     # @param self The object pointer.
     # @param rrep6_message The Messages.RrepMessage object.
-    # @return A header binary string in hex representation.
-    def pack(self, rrep6_message):
-        # Turn string representations of IP addresses into an integer form
+    # @return tuple() of the header fields.
+    def get_fields(self, rrep6_message):
         # Check the source IP if it is default address or not.
         # If yes, then change it to the corresponding IPv6 value.
         if rrep6_message.src_ip == DEFAULT_ROUTE:
             rrep6_message.src_ip = DEFAULT_IPV6
 
-        src_ip = int(binascii.hexlify(inet_pton(AF_INET6, rrep6_message.src_ip)), 16)
-        dst_ip = int(binascii.hexlify(inet_pton(AF_INET6, rrep6_message.dst_ip)), 16)
         # Split each IPv6 128-bit value into four 32-bit parts
-        src_ip_left_64 = (src_ip >> 64) & self.max_int64
-        src_ip_right_64 = src_ip & self.max_int64
-        dst_ip_left_64 = (dst_ip >> 64) & self.max_int64
-        dst_ip_right_64 = dst_ip & self.max_int64
-
-        # Pack the values
-        header = self.Header(rrep6_message.type, rrep6_message.id, rrep6_message.hop_count,
-                             (src_ip_left_64 >> 32) & self.max_int32, src_ip_left_64 & self.max_int32,
-                             (src_ip_right_64 >> 32) & self.max_int32, src_ip_right_64 & self.max_int32,
-                             (dst_ip_left_64 >> 32) & self.max_int32, dst_ip_left_64 & self.max_int32,
-                             (dst_ip_right_64 >> 32) & self.max_int32, dst_ip_right_64 & self.max_int32)
-
-        # Return the array in byte representation
-        return bytearray(header)
+        return ((pack_common_field(rrep6_message.type, rrep6_message.id, rrep6_message.hop_count),) +
+                IPV6_WORDS.unpack(inet_pton(AF_INET6, rrep6_message.src_ip)) +
+                IPV6_WORDS.unpack(inet_pton(AF_INET6, rrep6_message.dst_ip)))
 
-    ## Unpack the message object from the binary string.
+    ## Create the message object from the tuple of the header fields.
     # @param self The object pointer.
-    # @param binary_header Binary string with the Header structure.
-    # @return (message object, created from the binary string), (length of the unpacked header structure)
-    def unpack(self, binary_header):
-        # Cast the byte_array into the structure
-        header_unpacked = self.Header.from_buffer_copy(binary_header)
-        # Get values and create message object and fill up the fields
+    # @param fields tuple() of the header fields.
+    # @return Messages.RrepMessage object.
+    def create_message(self, fields):
         message = RrepMessage()
-        message.type = header_unpacked.TYPE
-        message.id = header_unpacked.ID
-        message.hop_count = header_unpacked.HOP_COUNT
+        message.type = fields[0] & 0xF
+        message.id = (fields[0] >> 4) & MAX_ID
+        message.hop_count = fields[0] >> 24
         # Merge the parts of 128-bit IPv6 address together
-        src_ip_left_64 = (header_unpacked.SRC_IP1 << 32 | header_unpacked.SRC_IP2)
-        src_ip_right_64 = (header_unpacked.SRC_IP3 << 32 | header_unpacked.SRC_IP4)
-        dst_ip_left_64 = (header_unpacked.DST_IP1 << 32 | header_unpacked.DST_IP2)
-        dst_ip_right_64 = (header_unpacked.DST_IP3 << 32 | header_unpacked.DST_IP4)
-
-        src_ip_packed_value = struct.pack(b"!QQ", src_ip_left_64, src_ip_right_64)
-        dst_ip_packed_value = struct.pack(b"!QQ", dst_ip_left_64, dst_ip_right_64)
-
-        message.src_ip = inet_ntop(AF_INET6, src_ip_packed_value)
-        message.dst_ip = inet_ntop(AF_INET6, dst_ip_packed_value)
+        message.src_ip = inet_ntop(AF_INET6, IPV6_WORDS.pack(*fields[1:5]))
+        message.dst_ip = inet_ntop(AF_INET6, IPV6_WORDS.pack(*fields[5:9]))
         # Check the source IP if it is the default IPv6 value.
         # If yes, then change it back to the value of the DEFAULT_ROUTE
         if message.src_ip == DEFAULT_IPV6:
             message.src_ip = DEFAULT_ROUTE
 
-        # Return the message
-        return message, len(bytearray(header_unpacked))
+        return message
 
 
 ## Hello message header.
 class HelloHeader:
-    ## Hello message fixed fields structure.
-    # This structure defines fixed (constant) fields of the Hello header.
+    ## Hello message fixed field structure.
+    # This layout defines fixed (constant) fields of the Hello header.
     # Fields structure:
-    # TYPE: 4 bits, IPV4_COUNT: 1 bit, IPV6_COUNT: 2 bits, TX_COUNT: 25 bits. Total length: 32 bits.
-    class FixedHeader(ctypes.LittleEndianStructure):
-        _fields_ = [("TYPE", ctypes.c_uint32, 4),
-                    ("IPV4_COUNT", ctypes.c_uint32, 1),
-                    ("IPV6_COUNT", ctypes.c_uint32, 2),
-                    ("TX_COUNT", ctypes.c_uint32, 24),
-                    ("GW_MODE", ctypes.c_uint32, 1)
-                    ]
-
-    ## Hello message header structure if only IPv4 address is present.
-    # Fields structure:
-    # TYPE: 4 bits, IPV4_COUNT: 1 bit, IPV6_COUNT: 2 bits, TX_COUNT: 25 bits, IPV4_ADDRESS: 32 bits.
-    # Total length: 64 bits.
-    class OnlyIpv4Header(ctypes.LittleEndianStructure):
-        _fields_ = [("TYPE", ctypes.c_uint32, 4),
-                    ("IPV4_COUNT", ctypes.c_uint32, 1),
-                    ("IPV6_COUNT", ctypes.c_uint32, 2),
-                    ("TX_COUNT", ctypes.c_uint32, 24),
-                    ("GW_MODE", ctypes.c_uint32, 1),
-                    ("IPV4_ADDRESS", ctypes.c_uint32, 32)
-                    ]
-
-    ## 64-bit mask constant.
-    max_int64 = 0xFFFFFFFFFFFFFFFF
-    ## 32-bit mask constant.
-    max_int32 = 0xFFFFFFFF
+    # TYPE: 4 bits, IPV4_COUNT: 1 bit, IPV6_COUNT: 2 bits, TX_COUNT: 24 bits, GW_MODE: 1 bit. Total length: 32 bits.
+    fixed_layout = struct.Struct("<I")
+
+    ## Maximum number of IPv6 addresses, which can be transmitted inside the Hello message (size of IPV6_COUNT field).
+    max_ipv6_count = 3
+
+    ## Precompiled Hello header layouts for every possible combination of IPV4_COUNT and IPV6_COUNT values.
+    # Format: {(ipv4_count, ipv6_count): struct.Struct}.
+    # The fixed field is followed by the IPv4 address (if present), stored as a little-endian 32-bit word, and then by
+    # the IPv6 addresses, each of them stored as four little-endian 32-bit words.
+    layouts = dict([((ipv4_count, ipv6_count), struct.Struct("<I" + "4s" * ipv4_count + "4I" * ipv6_count))
+                    for ipv4_count in xrange(2) for ipv6_count in xrange(max_ipv6_count + 1)])
 
     ## Constructor.
     # @param self The object pointer.
@@ -843,255 +917,386 @@ class HelloHeader:
     def __init__(self):
         pass
 
+    ## Get the value of the fixed field from the message object.
+    # @param self The object pointer.
+    # @param hello_message The Messages.HelloMessage object.
+    # @return 32-bit integer value of the fixed field.
+    def get_fixed_field(self, hello_message):
+        return (hello_message.type & 0xF | (hello_message.ipv4_count & 1) << 4 |
+                min(hello_message.ipv6_count, self.max_ipv6_count) << 5 |
+                (hello_message.tx_count & 0xFFFFFF) << 7 | (hello_message.gw_mode & 1) << 31)
+
+    ## Get the tuple of the address fields from the message object.
+    # @param self The object pointer.
+    # @param hello_message The Messages.HelloMessage object.
+    # @return tuple() of the address fields.
+    def get_address_fields(self, hello_message):
+        fields = ()
+        if hello_message.ipv4_count:
+            fields += (inet_aton(hello_message.ipv4_address)[::-1],)
+
+        for ipv6_address in hello_message.ipv6_addresses[:min(hello_message.ipv6_count, self.max_ipv6_count)]:
+            # Split each IPv6 128-bit value into four 32-bit parts
+            fields += IPV6_WORDS.unpack(inet_pton(AF_INET6, ipv6_address))
+
+        return fields
+
+    ## Get the precompiled layout for the given message object.
+    # @param self The object pointer.
+    # @param hello_message The Messages.HelloMessage object.
+    # @return struct.Struct object.
+    def get_layout(self, hello_message):
+        return self.layouts[(hello_message.ipv4_count & 1, min(hello_message.ipv6_count, self.max_ipv6_count))]
+
     ## Pack the message object into the given structure.
     # @param self The object pointer.
     # @param hello_message The Messages.HelloMessage object.
-    # @return A header binary string in hex representation.
+    # @return A header binary string.
     def pack(self, hello_message):
-        args = [hello_message.type, hello_message.ipv4_count, hello_message.ipv6_count,
-                hello_message.tx_count, hello_message.gw_mode]
-        # Add fields in the structure, depending on the given hello_message
-        if hello_message.ipv4_count and hello_message.ipv6_count == 0:
-            ipv4_address = struct.unpack("!I", inet_aton(hello_message.ipv4_address))[0]
-            args.append(ipv4_address)
-            header = self.OnlyIpv4Header(*args)
-
-        elif hello_message.ipv6_count:
-            fields = list(self.FixedHeader._fields_)
-            if hello_message.ipv4_count:
-                fields.append(("IPV4_ADDRESS", ctypes.c_uint32, 32))
-                ipv4_address = struct.unpack("!I", inet_aton(hello_message.ipv4_address))[0]
-                args.append(ipv4_address)
-
-            for i in xrange(hello_message.ipv6_count):
-                fields.append(("IPV6_ADDRESS_%s_1" % i, ctypes.c_uint32, 32))
-                fields.append(("IPV6_ADDRESS_%s_2" % i, ctypes.c_uint32, 32))
-                fields.append(("IPV6_ADDRESS_%s_3" % i, ctypes.c_uint32, 32))
-                fields.append(("IPV6_ADDRESS_%s_4" % i, ctypes.c_uint32, 32))
-
-                # Pack ipv6 addresses
-                ipv6_address = int(binascii.hexlify(inet_pton(AF_INET6, hello_message.ipv6_addresses[i])), 16)
-                ipv6_address_left = (ipv6_address >> 64) & self.max_int64
-                ipv6_address_right = ipv6_address & self.max_int64
-
-                args.extend([(ipv6_address_left >> 32) & self.max_int32, ipv6_address_left & self.max_int32,
-                             (ipv6_address_right >> 32) & self.max_int32, ipv6_address_right & self.max_int32])
-
-            # Define header structure
-            class Header(ctypes.Structure):
-                _fields_ = fields
-
-            header = Header(*args)
-
-        # Else, construct an empty header without IP addresses
-        else:
-            header = self.FixedHeader(*args)
+        return self.get_layout(hello_message).pack(self.get_fixed_field(hello_message),
+                                                   *self.get_address_fields(hello_message))
 
-        # Return the array in byte representation
-        return bytearray(header)
+    ## Pack the message object into the given buffer.
+    # @param self The object pointer.
+    # @param buf Writable buffer (bytearray, mmap and so on) to pack the header into.
+    # @param offset Position of the header in the buffer.
+    # @param hello_message The Messages.HelloMessage object.
+    # @return Length of the packed header.
+    def pack_into(self, buf, offset, hello_message):
+        layout = self.get_layout(hello_message)
+        layout.pack_into(buf, offset, self.get_fixed_field(hello_message), *self.get_address_fields(hello_message))
+        return layout.size
+
+    ## Re-pack only the fixed field of the already packed header in the given buffer.
+    # It is used for updating the TX_COUNT value, while the packed addresses stay the same.
+    # @param self The object pointer.
+    # @param buf Writable buffer (bytearray, mmap and so on) with the packed header.
+    # @param offset Position of the header in the buffer.
+    # @param hello_message The Messages.HelloMessage object.
+    # @return None
+    def pack_fixed_field_into(self, buf, offset, hello_message):
+        self.fixed_layout.pack_into(buf, offset, self.get_fixed_field(hello_message))
 
     ## Unpack the message object from the binary string.
     # @param self The object pointer.
     # @param binary_header Binary string with the Hello Header structure.
     # @return (message object, created from the binary string), (length of the unpacked header structure)
     def unpack(self, binary_header):
-        # Get the first fixed part of the header
-        fixed_header_unpacked = self.FixedHeader.from_buffer_copy(binary_header)
+        return self.unpack_from(binary_header, 0)
+
+    ## Unpack the message object from the given buffer, without copying the header out of it.
+    # @param self The object pointer.
+    # @param buf Buffer (str, buffer, memoryview, mmap and so on), containing the header.
+    # @param offset Position of the header in the buffer.
+    # @return (message object, created from the buffer), (length of the unpacked header structure)
+    def unpack_from(self, buf, offset):
+        # Get the first fixed part of the header, and choose the layout of the rest of the header
+        fixed_field = self.fixed_layout.unpack_from(buf, offset)[0]
         # Create and write to a message object
         message = HelloMessage()
+        message.ipv4_count = (fixed_field >> 4) & 1
+        message.ipv6_count = (fixed_field >> 5) & 3
+        message.tx_count = (fixed_field >> 7) & 0xFFFFFF
+        message.gw_mode = fixed_field >> 31
 
-        # Generate the rest of the part
-        if fixed_header_unpacked.IPV4_COUNT and fixed_header_unpacked.IPV6_COUNT == 0:
-            header_unpacked = self.OnlyIpv4Header.from_buffer_copy(binary_header)
-            message.ipv4_address = inet_ntoa(struct.pack("!I", header_unpacked.IPV4_ADDRESS))
-
-        elif fixed_header_unpacked.IPV6_COUNT:
+        layout = self.layouts[(message.ipv4_count, message.ipv6_count)]
+        fields = layout.unpack_from(buf, offset)
 
-            fields = list(self.FixedHeader._fields_)
-            if fixed_header_unpacked.IPV4_COUNT:
-                fields.append(("IPV4_ADDRESS", ctypes.c_uint32, 32))
+        if message.ipv4_count:
+            message.ipv4_address = inet_ntoa(fields[1][::-1])
 
-            for i in xrange(fixed_header_unpacked.IPV6_COUNT):
-                fields.append(("IPV6_ADDRESS_%s_1" % i, ctypes.c_uint32, 32))
-                fields.append(("IPV6_ADDRESS_%s_2" % i, ctypes.c_uint32, 32))
-                fields.append(("IPV6_ADDRESS_%s_3" % i, ctypes.c_uint32, 32))
-                fields.append(("IPV6_ADDRESS_%s_4" % i, ctypes.c_uint32, 32))
-
-            # Define header structure
-            class Header(ctypes.Structure):
-                _fields_ = fields
-
-            header_unpacked = Header.from_buffer_copy(binary_header)
-
-            if header_unpacked.IPV4_COUNT:
-                message.ipv4_address = inet_ntoa(struct.pack("!I", header_unpacked.IPV4_ADDRESS))
-
-            for i in xrange(header_unpacked.IPV6_COUNT):
-                # Merge the parts of 128-bit IPv6 address together
-                ipv6_left = (getattr(header_unpacked, "IPV6_ADDRESS_%s_1" % i) << 32 |
-                             getattr(header_unpacked, "IPV6_ADDRESS_%s_2" % i))
-                ipv6_right = (getattr(header_unpacked, "IPV6_ADDRESS_%s_3" % i) << 32 |
-                              getattr(header_unpacked, "IPV6_ADDRESS_%s_4" % i))
-
-                ipv6_packed_value = struct.pack(b"!QQ", ipv6_left, ipv6_right)
-
-                message.ipv6_addresses.append(inet_ntop(AF_INET6, ipv6_packed_value))
-
-        # Else, create a message without ip addresses
-        else:
-            message.tx_count = fixed_header_unpacked.TX_COUNT
-            message.gw_mode = fixed_header_unpacked.GW_MODE
-            message.ipv4_count = fixed_header_unpacked.IPV4_COUNT
-            message.ipv6_count = fixed_header_unpacked.IPV6_COUNT
-            # Return the message
-            return message, len(bytearray(fixed_header_unpacked))
-
-        message.ipv4_count = header_unpacked.IPV4_COUNT
-        message.ipv6_count = header_unpacked.IPV6_COUNT
-        message.tx_count = header_unpacked.TX_COUNT
-        message.gw_mode = header_unpacked.GW_MODE
+        for i in xrange(1 + message.ipv4_count, len(fields), 4):
+            # Merge the parts of 128-bit IPv6 address together
+            message.ipv6_addresses.append(inet_ntop(AF_INET6, IPV6_WORDS.pack(*fields[i:i + 4])))
 
         # Return the message
-        return message, len(bytearray(header_unpacked))
+        return message, layout.size
 
 
 ## ACK header.
-class AckHeader:
+class AckHeader(FixedHeader):
     ## ACK header structure.
-    # This sub-class describes a header structure for ACK message.
+    # This layout describes a header structure for ACK message.
     # Fields structure:
     # TYPE: 4 bits, ID: 20 bits, TX_COUNT: 8 bits, MSG_HASH: 32 bits. Total length: 64 bits.
-    class Header(ctypes.LittleEndianStructure):
-        _fields_ = [
-            ("TYPE", ctypes.c_uint32, 4),
-            ("ID", ctypes.c_uint32, 20),
-            ("TX_COUNT", ctypes.c_uint32, 8),
-            ("MSG_HASH", ctypes.c_uint32, 32)
-        ]
+    layout = struct.Struct("<II")
 
-    ## Constructor.
-    # @param self The object pointer.
-    # @return None
-    def __init__(self):
-        pass
-
-    ## Pack the message object into the given structure.
+    ## Get the tuple of the header fields from the message object.
     # @param self The object pointer.
     # @param ack_message The Messages.AckMessage object.
-    # @return A header binary string in hex representation.
-    def pack(self, ack_message):
-        header = self.Header(ack_message.type, ack_message.id, ack_message.tx_count, ack_message.msg_hash)
-        # Return the array in byte representation
-        return bytearray(header)
+    # @return tuple() of the header fields.
+    def get_fields(self, ack_message):
+        return (pack_common_field(ack_message.type, ack_message.id, ack_message.tx_count),
+                ack_message.msg_hash & MAX_INT32)
 
-    ## Unpack the message object from the binary string.
+    ## Create the message object from the tuple of the header fields.
     # @param self The object pointer.
-    # @param binary_header Binary string with the Header structure.
-    # @return (message object, created from the binary string), (length of the unpacked header structure)
-    def unpack(self, binary_header):
-        # Cast the byte_array into the structure
-        header_unpacked = self.Header.from_buffer_copy(binary_header)
-        # Get values and create message object and fill up the fields
+    # @param fields tuple() of the header fields.
+    # @return Messages.AckMessage object.
+    def create_message(self, fields):
         message = AckMessage()
-        message.id = header_unpacked.ID
-        message.tx_count = header_unpacked.TX_COUNT
-        message.msg_hash = header_unpacked.MSG_HASH
-        # Return the message
-        return message, len(bytearray(header_unpacked))
+        message.id = (fields[0] >> 4) & MAX_ID
+        message.tx_count = fields[0] >> 24
+        message.msg_hash = fields[1]
+        return message
 
 
 ## Reward header.
-class RewardHeader:
+class RewardHeader(FixedHeader):
     ## Reward header structure.
-    # This sub-class describes a header structure for Reward message.
+    # This layout describes a header structure for Reward message.
     # Fields structure:
     # TYPE: 4 bits, ID: 20 bits, NEG_REWARD_FLAG: 1 bit, REWARD_VALUE: 7 bits, MSG_HASH: 32 bits.
     # Total length: 64 bits.
-    class Header(ctypes.LittleEndianStructure):
-        _fields_ = [
-            ("TYPE", ctypes.c_uint32, 4),
-            ("ID", ctypes.c_uint32, 20),
-            ("NEG_REWARD_FLAG", ctypes.c_uint32, 1),
-            ("REWARD_VALUE", ctypes.c_uint32, 7),
-            ("MSG_HASH", ctypes.c_uint32, 32)
-        ]
-
-    ## Constructor.
-    # @param self The object pointer.
-    # @return None
-    def __init__(self):
-        pass
+    layout = struct.Struct("<II")
 
-    ## Pack the message object into the given structure.
+    ## Get the tuple of the header fields from the message object.
     # @param self The object pointer.
     # @param reward_message The Messages.RewardMessage object.
-    # @return A header binary string in hex representation.
-    def pack(self, reward_message):
-        if reward_message.reward_value < 0:
-            header = self.Header(reward_message.type, reward_message.id, 1,
-                                 abs(reward_message.reward_value), reward_message.msg_hash)
-        else:
-            header = self.Header(reward_message.type, reward_message.id, 0,
-                                 reward_message.reward_value, reward_message.msg_hash)
-        # Return the byte array
-        return bytearray(header)
-
-    ## Unpack the message object from the binary string.
+    # @return tuple() of the header fields.
+    def get_fields(self, reward_message):
+        # The NEG_REWARD_FLAG bit is followed by the 7-bit absolute reward value
+        last_field = pack_reward_field(reward_message.reward_value)
+        return (pack_common_field(reward_message.type, reward_message.id, last_field),
+                reward_message.msg_hash & MAX_INT32)
+
+    ## Create the message object from the tuple of the header fields.
     # @param self The object pointer.
-    # @param binary_header Binary string with the Header structure.
-    # @return (message object, created from the binary string), (length of the unpacked header structure)
-    def unpack(self, binary_header):
-        # Cast the byte_array into the structure
-        header_unpacked = self.Header.from_buffer_copy(binary_header)
-        if header_unpacked.NEG_REWARD_FLAG:
-            message = RewardMessage(-1 * header_unpacked.REWARD_VALUE, header_unpacked.MSG_HASH)
-            message.id = header_unpacked.ID
-        else:
-            message = RewardMessage(header_unpacked.REWARD_VALUE, header_unpacked.MSG_HASH)
-            message.id = header_unpacked.ID
-
-        # Return the message and initial header byte length
-        return message, len(bytearray(header_unpacked))
+    # @param fields tuple() of the header fields.
+    # @return Messages.RewardMessage object.
+    def create_message(self, fields):
+        message = RewardMessage(unpack_reward_field(fields[0] >> 24), fields[1])
+        message.id = (fields[0] >> 4) & MAX_ID
+        return message
 
 
 ## Reliable Unicast Data Header.
-class ReliableDataHeader:
+class ReliableDataHeader(FixedHeader):
     ## Reward header structure.
-    # This sub-class describes a header structure for reliable data message.
+    # This layout describes a header structure for reliable data message.
     # Fields structure:
     # TYPE: 4 bits, ID: 20 bits, HOP_COUNT: 8 bits. Total length: 32 bits.
-    class Header(ctypes.LittleEndianStructure):
-        _fields_ = [
-            ("TYPE", ctypes.c_uint32, 4),
-            ("ID", ctypes.c_uint32, 20),
-            ("HOP_COUNT", ctypes.c_uint32, 8)
-        ]
+    layout = struct.Struct("<I")
+
+    ## Get the tuple of the header fields from the message object.
+    # @param self The object pointer.
+    # @param reliable_data_packet The Messages.ReliableDataPacket object.
+    # @return tuple() of the header fields.
+    def get_fields(self, reliable_data_packet):
+        return pack_common_field(reliable_data_packet.type, reliable_data_packet.id, reliable_data_packet.hop_count),
+
+    ## Create the message object from the tuple of the header fields.
+    # @param self The object pointer.
+    # @param fields tuple() of the header fields.
+    # @return Messages.ReliableDataPacket object.
+    def create_message(self, fields):
+        message = ReliableDataPacket()
+        message.id = (fields[0] >> 4) & MAX_ID
+        message.hop_count = fields[0] >> 24
+        return message
+
+
+## Windowed Unicast Data Header.
+class WindowedDataHeader(FixedHeader):
+    ## Windowed data header structure.
+    # This layout describes a header structure for windowed reliable data message.
+    # Fields structure:
+    # TYPE: 4 bits, ID: 20 bits, HOP_COUNT: 8 bits, SEQ: 16 bits, BASE: 16 bits. Total length: 64 bits.
+    layout = struct.Struct("<IHH")
+
+    ## Get the tuple of the header fields from the message object.
+    # @param self The object pointer.
+    # @param windowed_data_packet The Messages.WindowedDataPacket object.
+    # @return tuple() of the header fields.
+    def get_fields(self, windowed_data_packet):
+        return (pack_common_field(windowed_data_packet.type, windowed_data_packet.id, windowed_data_packet.hop_count),
+                windowed_data_packet.seq & 0xFFFF, windowed_data_packet.base & 0xFFFF)
+
+    ## Create the message object from the tuple of the header fields.
+    # @param self The object pointer.
+    # @param fields tuple() of the header fields.
+    # @return Messages.WindowedDataPacket object.
+    def create_message(self, fields):
+        message = WindowedDataPacket()
+        message.id = (fields[0] >> 4) & MAX_ID
+        message.hop_count = fields[0] >> 24
+        message.seq = fields[1]
+        message.base = fields[2]
+        return message
+
+
+## SACK header.
+class SackHeader(FixedHeader):
+    ## SACK header structure.
+    # This layout describes a header structure for SACK message.
+    # Fields structure:
+    # TYPE: 4 bits, ID: 20 bits, TX_COUNT: 8 bits, CUM_SEQ: 16 bits, SACK_BITMAP: 32 bits. Total length: 80 bits.
+    layout = struct.Struct("<IHI")
+
+    ## Get the tuple of the header fields from the message object.
+    # @param self The object pointer.
+    # @param sack_message The Messages.SackMessage object.
+    # @return tuple() of the header fields.
+    def get_fields(self, sack_message):
+        return (pack_common_field(sack_message.type, sack_message.id, sack_message.tx_count),
+                sack_message.cum_seq & 0xFFFF, sack_message.sack_bitmap & MAX_INT32)
+
+    ## Create the message object from the tuple of the header fields.
+    # @param self The object pointer.
+    # @param fields tuple() of the header fields.
+    # @return Messages.SackMessage object.
+    def create_message(self, fields):
+        message = SackMessage()
+        message.id = (fields[0] >> 4) & MAX_ID
+        message.tx_count = fields[0] >> 24
+        message.cum_seq = fields[1]
+        message.sack_bitmap = fields[2]
+        return message
+
+
+## Control message header.
+class ControlHeader:
+    ## Control message fixed field structure.
+    # Fields structure:
+    # TYPE: 4 bits, ID: 20 bits, ACK_COUNT: 4 bits, REWARD_COUNT: 3 bits, CHAINED: 1 bit. Total length: 32 bits.
+    fixed_layout = struct.Struct("<I")
 
     ## Constructor.
     # @param self The object pointer.
     # @return None
     def __init__(self):
-        pass
+        ## @var layouts
+        # Precompiled header layouts for the used combinations of ACK_COUNT and REWARD_COUNT values.
+        # Format: {(ack_count, reward_count): struct.Struct}.
+        # The fixed field is followed by ACK_COUNT of MSG_HASH: 32 bits fields, and then by REWARD_COUNT of
+        # (NEG_REWARD_FLAG: 1 bit, REWARD_VALUE: 7 bits, MSG_HASH: 32 bits) fields.
+        self.layouts = dict()
+
+    ## Get the header layout for the given number of ACK hashes and rewards.
+    # @param self The object pointer.
+    # @param ack_count Number of ACK hashes.
+    # @param reward_count Number of rewards.
+    # @return struct.Struct object.
+    def get_layout(self, ack_count, reward_count):
+        try:
+            return self.layouts[(ack_count, reward_count)]
+        except KeyError:
+            layout = struct.Struct("<I" + "I" * ack_count + "BI" * reward_count)
+            self.layouts[(ack_count, reward_count)] = layout
+            return layout
 
-    ## Pack the message object into the given structure.
+    ## Get the tuple of the header fields from the message object.
     # @param self The object pointer.
-    # @param reliable_data_packet The Messages.ReliableDataPacket object.
-    # @return A header binary string in hex representation.
-    def pack(self, reliable_data_packet):
-        header = self.Header(reliable_data_packet.type, reliable_data_packet.id, reliable_data_packet.hop_count)
-        # Return the array in byte representation
-        return bytearray(header)
+    # @param control_message The Messages.ControlMessage object.
+    # @return (struct.Struct layout of the header, tuple() of the header fields).
+    def get_fields(self, control_message):
+        ack_hashes = control_message.ack_hashes[:ControlMessage.max_ack_count]
+        rewards = control_message.rewards[:ControlMessage.max_reward_count]
+        last_field = len(ack_hashes) | len(rewards) << 4 | (control_message.chained & 1) << 7
+        fields = (pack_common_field(control_message.type, control_message.id, last_field),)
+        fields += tuple([msg_hash & MAX_INT32 for msg_hash in ack_hashes])
+        for reward_value, msg_hash in rewards:
+            fields += (pack_reward_field(reward_value), msg_hash & MAX_INT32)
+        return self.get_layout(len(ack_hashes), len(rewards)), fields
+
+    ## Pack the message object to the binary string.
+    # @param self The object pointer.
+    # @param control_message The Messages.ControlMessage object.
+    # @return A header binary string.
+    def pack(self, control_message):
+        layout, fields = self.get_fields(control_message)
+        return layout.pack(*fields)
+
+    ## Pack the message object into the given buffer.
+    # @param self The object pointer.
+    # @param buf Writable buffer (bytearray, mmap and so on) to pack the header into.
+    # @param offset Position of the header in the buffer.
+    # @param control_message The Messages.ControlMessage object.
+    # @return Length of the packed header.
+    def pack_into(self, buf, offset, control_message):
+        layout, fields = self.get_fields(control_message)
+        layout.pack_into(buf, offset, *fields)
+        return layout.size
 
     ## Unpack the message object from the binary string.
     # @param self The object pointer.
-    # @param binary_header Binary string with the Header structure.
-    # @return (message object, created from the binary string), (length of the unpacked header structure)
+    # @param binary_header Binary string with the header structure.
+    # @return (Messages.ControlMessage object), (length of the unpacked header structure)
     def unpack(self, binary_header):
-        # Cast the byte_array into the structure
-        header_unpacked = self.Header.from_buffer_copy(binary_header)
-        # Get values and create message object and fill up the fields
-        message = ReliableDataPacket()
-        message.id = header_unpacked.ID
-        message.hop_count = header_unpacked.HOP_COUNT
-        # Return the message
-        return message, len(bytearray(header_unpacked))
+        return self.unpack_from(binary_header, 0)
+
+    ## Unpack the message object from the given buffer, without copying the header out of it.
+    # @param self The object pointer.
+    # @param buf Buffer (str, buffer, memoryview, mmap and so on), containing the header.
+    # @param offset Position of the header in the buffer.
+    # @return (Messages.ControlMessage object), (length of the unpacked header structure)
+    def unpack_from(self, buf, offset):
+        fixed_field = self.fixed_layout.unpack_from(buf, offset)[0]
+        ack_count = (fixed_field >> 24) & 0xF
+        reward_count = (fixed_field >> 28) & 0x7
+        layout = self.get_layout(ack_count, reward_count)
+        fields = layout.unpack_from(buf, offset)
+
+        message = ControlMessage()
+        message.id = (fixed_field >> 4) & MAX_ID
+        message.chained = fixed_field >> 31
+        message.ack_hashes = list(fields[1:1 + ack_count])
+        message.rewards = [(unpack_reward_field(fields[i]), fields[i + 1])
+                           for i in xrange(1 + ack_count, len(fields), 2)]
+        return message, layout.size
+
+
+## @var UNICAST_HEADER
+# Messages.UnicastHeader codec instance.
+UNICAST_HEADER = UnicastHeader()
+## @var BROADCAST_HEADER
+# Messages.BroadcastHeader codec instance.
+BROADCAST_HEADER = BroadcastHeader()
+## @var RREQ4_HEADER
+# Messages.Rreq4Header codec instance.
+RREQ4_HEADER = Rreq4Header()
+## @var RREQ6_HEADER
+# Messages.Rreq6Header codec instance.
+RREQ6_HEADER = Rreq6Header()
+## @var RREP4_HEADER
+# Messages.Rrep4Header codec instance.
+RREP4_HEADER = Rrep4Header()
+## @var RREP6_HEADER
+# Messages.Rrep6Header codec instance.
+RREP6_HEADER = Rrep6Header()
+## @var HELLO_HEADER
+# Messages.HelloHeader codec instance.
+HELLO_HEADER = HelloHeader()
+## @var ACK_HEADER
+# Messages.AckHeader codec instance.
+ACK_HEADER = AckHeader()
+## @var REWARD_HEADER
+# Messages.RewardHeader codec instance.
+REWARD_HEADER = RewardHeader()
+## @var RELIABLE_DATA_HEADER
+# Messages.ReliableDataHeader codec instance.
+RELIABLE_DATA_HEADER = ReliableDataHeader()
+## @var WINDOWED_DATA_HEADER
+# Messages.WindowedDataHeader codec instance.
+WINDOWED_DATA_HEADER = WindowedDataHeader()
+## @var SACK_HEADER
+# Messages.SackHeader codec instance.
+SACK_HEADER = SackHeader()
+## @var CONTROL_HEADER
+# Messages.ControlHeader codec instance.
+CONTROL_HEADER = ControlHeader()
+
+# Register the codecs of all the message types
+register_codec(UnicastPacket.type, UNICAST_HEADER)
+register_codec(BroadcastPacket.type, BROADCAST_HEADER)
+register_codec(RreqMessage.ipv4_type, RREQ4_HEADER)
+register_codec(RreqMessage.ipv6_type, RREQ6_HEADER)
+register_codec(RrepMessage.ipv4_type, RREP4_HEADER)
+register_codec(RrepMessage.ipv6_type, RREP6_HEADER)
+register_codec(HelloMessage.type, HELLO_HEADER)
+register_codec(AckMessage.type, ACK_HEADER)
+register_codec(RewardMessage.type, REWARD_HEADER)
+register_codec(ReliableDataPacket.type, RELIABLE_DATA_HEADER)
+register_codec(WindowedDataPacket.type, WINDOWED_DATA_HEADER)
+register_codec(SackMessage.type, SACK_HEADER)
+register_codec(ControlMessage.type, CONTROL_HEADER)
@@ -42,12 +42,15 @@ class Neighbor:
         # List of a neighbor's L3 (both IPv4 and IPv6) addresses in a string representation.
         self.l3_addresses = list()
         ## @var mac
-        # MAC address of a neighbor, in a string "xx:xx:xx:xx:xx:xx" format.
+        # MAC address of a neighbor, as a 6-byte binary string.
         self.mac = str()
         ## @var last_activity
         # Timestamp of the last registered activity of a neighbor, i.e. the last time the node has received the HELLO
         # message from this neighbor. float().
         self.last_activity = time.time()
+        ## @var protocol_version
+        # Protocol version of a neighbor, advertised in its HELLO messages.
+        self.protocol_version = Messages.BASE_PROTOCOL_VERSION
 
 
 ## Main wrapper class, which starts the classes for advertising and listening of Hello messages.
@@ -104,6 +107,10 @@ class AdvertiseNeighbor(threading.Thread):
         ## @var message
         # Create and store the default Messages.HelloMessage object used for broadcasting.
         self.message = Messages.HelloMessage()
+        ## @var packed_message
+        # Packed HELLO message header, bytearray(). It is re-packed only when the node's addresses change, otherwise
+        # only its fixed field (with the TX_COUNT value) is updated before each broadcast.
+        self.packed_message = bytearray()
         ## @var broadcast_mac
         # Reference to Transport.RawTransport.broadcast_mac default value.
         self.broadcast_mac = raw_transport_obj.broadcast_mac
@@ -119,6 +126,13 @@ class AdvertiseNeighbor(threading.Thread):
         ## @var node_mac
         # Reference to the node's own MAC address, stored in Transport.RawTransport.node_mac.
         self.node_mac = raw_transport_obj.node_mac
+        ## @var get_node_ips
+        # Reference to the function, which returns the list of the node's current L3 addresses. By default, the
+        # addresses are taken from the virtual interface.
+        self.get_node_ips = Transport.get_l3_addresses_from_interface
+        ## @var version_extension
+        # Packed HELLO extension with the node's protocol version, which is sent as the payload of the HELLO frames.
+        self.version_extension = Messages.pack_version_extension(Messages.PROTOCOL_VERSION)
 
     ## Main thread routine.
     # @param self The object pointer.
@@ -147,7 +161,7 @@ class AdvertiseNeighbor(threading.Thread):
     # @return None
     def send_raw_hello(self):
         # Try to get L3 ip address (ipv4 or ipv6) assigned to the node, if there are such ones
-        node_ips = Transport.get_l3_addresses_from_interface()
+        node_ips = self.get_node_ips()
 
         if self.current_node_ips != node_ips:
             # Update entries in RouteTable
@@ -184,9 +198,14 @@ class AdvertiseNeighbor(threading.Thread):
                 self.message.ipv4_count = 0
                 self.message.ipv6_count = 0
 
+            self.packed_message = bytearray(Messages.HELLO_HEADER.pack(self.message))
+
+        else:
+            Messages.HELLO_HEADER.pack_fixed_field_into(self.packed_message, 0, self.message)
+
         NEIGHBOR_LOG.debug("Sending HELLO message:\n %s", self.message)
 
-        self.raw_transport.send_raw_frame(self.broadcast_mac, self.message, "")
+        self.raw_transport.send_packed_frame(self.broadcast_mac, self.packed_message, self.version_extension)
         self.message.tx_count += 1
         # Update the current list of ips
         self.current_node_ips = node_ips
@@ -229,8 +248,9 @@ class ListenNeighbors:
     # @param self The object pointer.
     # @param src_mac MAC address of the neighbor that has sent this HELLO message.
     # @param dsr_hello_message Messages.HelloMessage object.
+    # @param payload Payload of the HELLO frame, which may contain the HELLO extensions. Default is "".
     # @return None
-    def process_neighbor(self, src_mac, dsr_hello_message):
+    def process_neighbor(self, src_mac, dsr_hello_message, payload=""):
         l3_addresses_from_message = []
         if dsr_hello_message.ipv4_count:
             l3_addresses_from_message.append(dsr_hello_message.ipv4_address)
@@ -249,7 +269,8 @@ class ListenNeighbors:
             self.last_expiry_check = time.time()
 
         if src_mac == self.node_mac:
-            NEIGHBOR_LOG.warning("Neighbor has the same mac address as mine! %s", self.node_mac)
+            NEIGHBOR_LOG.warning("Neighbor has the same mac address as mine! %s",
+                                 Transport.mac_to_str(self.node_mac))
             return False
 
         if src_mac not in self.neighbors_list:
@@ -257,8 +278,8 @@ class ListenNeighbors:
 
             neighbor.l3_addresses = l3_addresses_from_message
             neighbor.mac = src_mac
+            neighbor.protocol_version = Messages.unpack_version_extension(payload)
 
-            self.neighbors_list[src_mac] = neighbor
             # Adding an entry to the neighbors list
             self.add_neighbor_entry(neighbor)
             # Add the entries for the received L3 ip addresses to the RouteTable
@@ -268,10 +289,12 @@ class ListenNeighbors:
         else:
             if self.neighbors_list[src_mac].l3_addresses != l3_addresses_from_message:
                 self.neighbors_list[src_mac].l3_addresses = l3_addresses_from_message
+                self.table.publish_neighbors()
                 # Add the entries for the received L3 ip addresses to the RouteTable
                 for ip in l3_addresses_from_message:
                     self.table.update_entry(ip, src_mac, 50)
 
+            self.neighbors_list[src_mac].protocol_version = Messages.unpack_version_extension(payload)
             self.neighbors_list[src_mac].last_activity = time.time()
 
         # Update the file with current list of neighbors' ip addresses
@@ -304,21 +327,21 @@ class ListenNeighbors:
         # Deleting from the neighbors' list
         for mac in macs_to_delete:
 
-            NEIGHBOR_LOG.info("Neighbor has gone offline. Removing: %s", str(mac))
+            NEIGHBOR_LOG.info("Neighbor has gone offline. Removing: %s", Transport.mac_to_str(mac))
 
             # Deleting this key from the dictionary
             self.del_neighbor_entry(mac)
 
-    ## Add the neighbor entry to the shared ListenNeighbors.neighbors_list dictionary.
+    ## Add the neighbor entry to the shared ListenNeighbors.neighbors_list dictionary, and to the route table entries.
     # @param self The object pointer.
     # @param neighbor A Neighbor object.
     # @return None
     def add_neighbor_entry(self, neighbor):
-        NEIGHBOR_LOG.info("Adding a new neighbor: %s", str(neighbor.mac))
-        self.neighbors_list.update({neighbor.mac: neighbor})
+        NEIGHBOR_LOG.info("Adding a new neighbor: %s", Transport.mac_to_str(neighbor.mac))
+        self.table.add_neighbor(neighbor)
 
-    # Delete the neighbor entry from the shared dictionary
+    # Delete the neighbor entry from the shared dictionary, and from the route table entries
     def del_neighbor_entry(self, mac):
-        NEIGHBOR_LOG.debug("Deleting the neighbor: %s", str(mac))
+        NEIGHBOR_LOG.debug("Deleting the neighbor: %s", Transport.mac_to_str(mac))
         if mac in self.neighbors_list:
-            del self.neighbors_list[mac]
+            self.table.remove_neighbor(mac)
@@ -16,6 +16,7 @@ import sys
 import os
 import time
 import atexit
+import threading
 from signal import SIGINT, SIGTERM
 
 # Import the necessary modules of the program
@@ -23,8 +24,9 @@ import RoutingManager
 import DataHandler
 import RouteTable
 import Transport
+import PacketTrace
 # Get DEV name from the default configuration file
-from conf import DEV, SET_TOPOLOGY_FLAG
+from conf import DEV, SET_TOPOLOGY_FLAG, PACKET_TRACE_FLAG, PACKET_TRACE_SIZE
 # Import module for handling the logging
 import routing_logging
 
@@ -207,15 +209,21 @@ class RoutingDaemon(Daemon):
         # Creating a transport for communication with a virtual interface
         app_transport = Transport.VirtualTransport()
         # Creating a transport for communication with network physical interface
-        raw_transport = Transport.RawTransport(DEV, node_mac, topology_neighbors)
+        raw_transport = Transport.RawTransport(DEV, Transport.mac_to_bin(node_mac), topology_neighbors)
         # Create a RouteTable object
-        table = RouteTable.Table(node_mac)
+        table = RouteTable.Table(raw_transport.node_mac)
+
+        # Create a binary trace of the handled packets, if enabled
+        packet_trace = PacketTrace.TraceRing(PACKET_TRACE_SIZE) if PACKET_TRACE_FLAG else None
 
         # Create data handler thread to process all incoming and outgoing messages
-        data_handler = DataHandler.DataHandler(app_transport, raw_transport, table)
+        data_handler = DataHandler.DataHandler(app_transport, raw_transport, table, packet_trace)
 
         # Creating thread for live configuration / interaction with the running program
-        uds_server = RoutingManager.Manager(table)
+        uds_server = RoutingManager.Manager(table, packet_trace, data_handler.app_handler.arq_handler)
+
+        # Creating thread for re-applying the topology filter upon the changes in the topology file
+        topology_monitor = TopologyMonitor(self.get_topology_neighbors, node_mac, raw_transport)
 
         try:
             # Start data handler thread
@@ -224,6 +232,10 @@ class RoutingDaemon(Daemon):
             # Start uds_server thread
             uds_server.start()
 
+            if SET_TOPOLOGY_FLAG:
+                # Start topology monitor thread
+                topology_monitor.start()
+
             while True:
                 packet = app_transport.recv_from_app()
                 data_handler.app_handler.process_packet(packet)
@@ -236,6 +248,9 @@ class RoutingDaemon(Daemon):
             # Stop UDS server
             uds_server.quit()
 
+            # Stop topology monitor
+            topology_monitor.quit()
+
             # Stop the log thread
             routing_logging.stop_log_thread()
 
@@ -269,6 +284,64 @@ class RoutingDaemon(Daemon):
         return list()
 
 
+## A thread class which watches the topology file, and updates the topology filter of the raw transport upon its change.
+class TopologyMonitor(threading.Thread):
+    ## Constructor.
+    # @param self The object pointer.
+    # @param get_topology_neighbors Reference to RoutingDaemon.get_topology_neighbors method.
+    # @param node_mac The MAC address in a form "xx:xx:xx:xx:xx:xx" of the node's physical network interface.
+    # @param raw_transport Reference to Transport.RawTransport object.
+    # @return None
+    def __init__(self, get_topology_neighbors, node_mac, raw_transport):
+        super(TopologyMonitor, self).__init__()
+        ## @var running
+        # Thread running state bool() flag.
+        self.running = False
+        ## @var get_topology_neighbors
+        # Reference to RoutingDaemon.get_topology_neighbors method.
+        self.get_topology_neighbors = get_topology_neighbors
+        ## @var node_mac
+        # The MAC address of the node's physical network interface.
+        self.node_mac = node_mac
+        ## @var raw_transport
+        # Reference to Transport.RawTransport object.
+        self.raw_transport = raw_transport
+        ## @var check_interval
+        # Time interval (in seconds) between the checks of the topology file modification time.
+        self.check_interval = 5
+        ## @var last_modified
+        # Last known modification time of the topology file, or None if the file doesn't exist.
+        self.last_modified = self.get_modification_time()
+
+    ## Main thread routine.
+    # @param self The object pointer.
+    # @return None
+    def run(self):
+        self.running = True
+        while self.running:
+            time.sleep(self.check_interval)
+            modified = self.get_modification_time()
+            if modified != self.last_modified:
+                self.last_modified = modified
+                ROUTING_LOG.info("The topology file has been changed. Updating the topology filter...")
+                self.raw_transport.update_topology_neighbors(self.get_topology_neighbors(self.node_mac))
+
+    ## Get the modification time of the topology file.
+    # @param self The object pointer.
+    # @return Modification time of the file, or None if the file doesn't exist.
+    def get_modification_time(self):
+        try:
+            return os.stat(TOPOLOGY_PATH).st_mtime
+        except OSError:
+            return None
+
+    ## Stop and quit the thread operation.
+    # @param self The object pointer.
+    # @return None
+    def quit(self):
+        self.running = False
+
+
 if __name__ == "__main__":
     ## @var routing
     # Main routing daemon object.
@@ -0,0 +1,94 @@
+#!/usr/bin/python
+"""
+@package PacketTrace
+Created on Oct 16, 2026
+
+@author: Dmitrii Dugaev
+
+
+This module implements a binary in-memory trace of the handled packets, which is used for the performance debugging
+without enabling the DEBUG text logs.
+The trace is a fixed-size ring of compact binary records, preallocated at the start. Each record describes a single
+handled frame: timestamp, DSR type, ID, hop count, source MAC address, chosen next hop MAC address and the handler
+latency. When the ring is full, the oldest records are overwritten.
+The records are read by RoutingManager on demand, and are converted to python objects only at that moment.
+"""
+
+# Import necessary python modules from the standard library
+import struct
+
+# Import the necessary modules of the program
+from Transport import mac_to_str
+
+## @var TRACE_RECORD
+# Struct object of a single trace record.
+# Fields structure:
+# TIMESTAMP: double, ID: 32 bits, LATENCY (in microseconds): 32 bits, TYPE: 8 bits, HOP_COUNT: 8 bits,
+# SRC_MAC: 6 bytes, NEXT_HOP_MAC: 6 bytes. Total length: 30 bytes.
+TRACE_RECORD = struct.Struct("<dIIBB6s6s")
+## @var NO_MAC
+# MAC address value, which is recorded if no next hop has been chosen for the frame.
+NO_MAC = b"\x00" * 6
+## @var MAX_LATENCY
+# Maximum latency value (in microseconds), which fits into the record.
+MAX_LATENCY = 0xFFFFFFFF
+
+
+## Fixed-size ring of the binary trace records.
+# The records are written by a single thread (DataHandler.IncomingTrafficHandler), and can be read by other threads.
+class TraceRing:
+    ## Constructor.
+    # @param self The object pointer.
+    # @param size Maximum number of the records in the ring.
+    # @return None
+    def __init__(self, size):
+        ## @var size
+        # Maximum number of the records in the ring.
+        self.size = max(1, size)
+        ## @var ring
+        # Preallocated buffer of the records.
+        self.ring = bytearray(self.size * TRACE_RECORD.size)
+        ## @var written
+        # Total number of the records written so far. It is also the sequence number of the next record.
+        self.written = 0
+
+    ## Write a new record to the ring.
+    # @param self The object pointer.
+    # @param timestamp Timestamp of the frame handling start, in seconds.
+    # @param latency Handler latency, in seconds.
+    # @param dsr_type Type ID of the message.
+    # @param msg_id ID of the message.
+    # @param hop_count Hop count value of the message.
+    # @param src_mac Source MAC address as a 6-byte binary string.
+    # @param next_hop_mac Next hop MAC address as a 6-byte binary string, or None.
+    # @return None
+    def record(self, timestamp, latency, dsr_type, msg_id, hop_count, src_mac, next_hop_mac):
+        TRACE_RECORD.pack_into(self.ring, (self.written % self.size) * TRACE_RECORD.size, timestamp, msg_id,
+                               min(int(latency * 1000000), MAX_LATENCY), dsr_type, hop_count & 0xFF, src_mac,
+                               next_hop_mac or NO_MAC)
+        self.written += 1
+
+    ## Get the records from the ring, starting from the given sequence number.
+    # If the requested records have already been overwritten, the oldest available records are returned.
+    # @param self The object pointer.
+    # @param since Sequence number of the first requested record. Default is 0.
+    # @return (sequence number of the next record), list() of (seq, timestamp, dsr_type, id, hop_count, src_mac,
+    # next_hop_mac, latency_us) tuples, with the MAC addresses in "xx:xx:xx:xx:xx:xx" format.
+    def get_records(self, since=0):
+        written = self.written
+        ring = bytes(self.ring)
+        # The records, which could have been overwritten while copying the ring, are skipped
+        start = max(since, self.written - self.size + 1, 0)
+
+        records = []
+        for seq in xrange(start, written):
+            timestamp, msg_id, latency, dsr_type, hop_count, src_mac, next_hop_mac = \
+                TRACE_RECORD.unpack_from(ring, (seq % self.size) * TRACE_RECORD.size)
+            if next_hop_mac == NO_MAC:
+                next_hop_mac = None
+            else:
+                next_hop_mac = mac_to_str(next_hop_mac)
+
+            records.append((seq, timestamp, dsr_type, msg_id, hop_count, mac_to_str(src_mac), next_hop_mac, latency))
+
+        return written, records
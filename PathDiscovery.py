@@ -95,8 +95,7 @@ class PathDiscoveryHandler:
     # @return None
     def send_rreq(self, src_ip, dst_ip):
         rreq = Messages.RreqMessage()
-        rreq.src_ip = src_ip
-        rreq.dst_ip = dst_ip
+        rreq.set_addresses(src_ip, dst_ip)
         rreq.hop_count = 1
 
         self.arq_handler.arq_broadcast_send(rreq)
@@ -13,6 +13,8 @@ There are two main behaviors here.
 The first is RewardWaitHandler - which is waiting for the reward from the neighbor where the packet had been
 sent to earlier. If the reward wasn't received within a defined timeout interval - the handler assumes that
 the packet has been lost, therefore, it triggers a negative reward value for the corresponding RouteTable entry.
+The timeouts are scheduled on the shared TimerWheel.TimerWheel object, and the negative rewards of the timeouts,
+which have expired together, are applied to the RouteTable in a single batch.
 
 The second is RewardSendHandler - it generates and sends back the reward to a source node after waiting for some
 "hold on" time interval, which is needed to control a number of generated reward messages for some number of
@@ -21,138 +23,158 @@ the received packets with the same dst_ip address.
 
 # Import necessary python modules from the standard library
 import threading
-import hashlib
 import time
 
 # Import the necessary modules of the program
 import Messages
+import MessageHash
 
 ## @var lock
 # Store the global threading.Lock object.
 lock = threading.Lock()
 
-## @var max_int32
-# 32-bit mask constant.
-max_int32 = 0xFFFFFFFF
-
 
 ## A class which handles a reward reception for each sent packet.
 class RewardWaitHandler:
     ## Constructor.
     # @param self The object pointer.
     # @param table Reference to RouteTable.Table object.
+    # @param timer_wheel Reference to TimerWheel.TimerWheel object, which schedules the reward wait timeouts.
     # @return None
-    def __init__(self, table):
+    def __init__(self, table, timer_wheel):
         ## @var table
         # Reference to RouteTable.Table object.
         self.table = table
+        ## @var timer_wheel
+        # Reference to TimerWheel.TimerWheel object, which schedules the reward wait timeouts.
+        self.timer_wheel = timer_wheel
         ## @var reward_wait_list
-        # Define a structure for handling reward wait threads for given dst_ips.
-        # Format: {hash(dst_ip + next_hop_mac): thread_object}. Hash is 32-bit integer, generated from md5 hash.
-        # A reward value is being forwarded to the thread via a queue_object.
+        # Define a structure for handling reward waits for given dst_ips.
+        # Format: {hash(dst_ip + next_hop_mac): RewardWait object}. Hash is 32-bit integer, generated by MessageHash.
+        # A reward wait is stored under each of the hashes, which the next hop may reply with.
         self.reward_wait_list = dict()
+        ## @var hash_modes
+        # MessageHash.HashModes object, which provides the hashing mode of the rewards of each next hop.
+        self.hash_modes = MessageHash.HashModes(table)
+        ## @var expired_list
+        # List of (dst_ip, mac, reward) updates of the expired reward waits, which haven't been applied to the
+        # RouteTable yet.
+        self.expired_list = list()
+        ## @var wait_timeout
+        # Wait timeout value after which a negative reward is initiated towards the dst_ip.
+        self.wait_timeout = 3
 
-    ## Start a waiting thread until the Reward message is received.
+    ## Start waiting until the Reward message is received.
     # Check if the waiting process for such dst_ip and next_hop_mac has already been initiated or not.
-    # If yes - do nothing. Else - start the reward waiting thread.
+    # If yes - do nothing. Else - schedule the reward wait timeout.
     # @param self The object pointer.
     # @param dst_ip Destination IP of the route for this packet.
     # @param mac MAC address of the node where the packet had been sent for getting the reward.
     # @return None
     def wait_for_reward(self, dst_ip, mac):
-        hash_str = hashlib.md5(dst_ip + mac).hexdigest()
-        # Convert hash_str from hex to 32-bit integer
-        hash_value = int(hash_str, 16) & max_int32
+        # The hashes are generated from the next hop's MAC address, as it is done on the receiving side
+        hash_mode = self.hash_modes.get_mode(mac)
+        hash_values = MessageHash.get_reward_hashes(dst_ip, mac, hash_mode)
 
-        if hash_value not in self.reward_wait_list:
-            reward_wait_thread = RewardWaitThread(dst_ip, mac, self.table, self.reward_wait_list)
-            self.reward_wait_list.update({hash_value: reward_wait_thread})
-            # Start the thread
-            reward_wait_thread.start()
+        if hash_values[0] not in self.reward_wait_list:
+            reward_wait = RewardWait(dst_ip, mac, hash_values, hash_mode)
+            lock.acquire()
+            for hash_value in hash_values:
+                self.reward_wait_list[hash_value] = reward_wait
+            lock.release()
+            self.timer_wheel.schedule(self.wait_timeout, self.expire, reward_wait)
 
     ## Set a reward value to a specified entry, based on the received object of Messages.RewardMessage.msg_hash.
+    # The reward wait is kept until its timeout, so the further rewards within the timeout update the value as well,
+    # and the next packets to the same dst_ip and next hop don't start a new wait.
     # @param self The object pointer.
     # @param reward_message Messages.RewardMessage object.
     # @return None
     def set_reward(self, reward_message):
         lock.acquire()
-        try:
-            self.reward_wait_list[reward_message.msg_hash].process_reward(reward_message.reward_value)
-
+        reward_wait = self.reward_wait_list.get(reward_message.msg_hash)
         # If the key is not present, then pass
-        except KeyError:
-            pass
+        if reward_wait is None:
+            lock.release()
+            return
+        reward_wait.rewarded = True
+        lock.release()
+
+        # Keep the mode of the reward, if it could come in either of the modes
+        if reward_wait.hash_mode == MessageHash.ANY_MODE:
+            hash_mode = MessageHash.MODE_ORDERS[reward_wait.hash_mode][reward_wait.hash_values.index(
+                reward_message.msg_hash)]
+            self.hash_modes.on_reply(reward_wait.mac, hash_mode)
+        self.table.update_reward(reward_wait.dst_ip, reward_wait.mac, reward_message.reward_value)
 
-        finally:
+    ## Process the expiration of the reward wait timeout. If no reward has been received within the timeout, the "bad"
+    # reward is queued for the next batch update of the RouteTable, which is performed on the next tick of the timer
+    # wheel.
+    # @param self The object pointer.
+    # @param reward_wait RewardHandler.RewardWait object, which has expired.
+    # @return None
+    def expire(self, reward_wait):
+        lock.acquire()
+        self.remove(reward_wait)
+        # The reward has been received while waiting, so do nothing
+        if reward_wait.rewarded:
             lock.release()
+            return
+        # The next hop may reply in the other mode, so the hashes of both modes are registered until its next reward
+        if reward_wait.hash_mode != MessageHash.ANY_MODE:
+            self.hash_modes.on_timeout(reward_wait.mac)
+        # Schedule the batch update, if it is the first expired wait in the batch
+        if not self.expired_list:
+            self.timer_wheel.schedule(0, self.apply_expired)
+        self.expired_list.append((reward_wait.dst_ip, reward_wait.mac, 0))
+        lock.release()
 
+    ## Delete all the hashes of the reward wait from the reward_wait_list. Must be called under the lock.
+    # @param self The object pointer.
+    # @param reward_wait RewardHandler.RewardWait object.
+    # @return None
+    def remove(self, reward_wait):
+        for hash_value in reward_wait.hash_values:
+            if self.reward_wait_list.get(hash_value) is reward_wait:
+                del self.reward_wait_list[hash_value]
+
+    ## Apply the "bad" rewards of all the expired reward waits to the RouteTable in a single batch.
+    # @param self The object pointer.
+    # @return None
+    def apply_expired(self):
+        lock.acquire()
+        expired_list = self.expired_list
+        self.expired_list = list()
+        lock.release()
+        self.table.update_entries(expired_list)
 
-## Thread for waiting for an incoming reward messages on the given dst_ip.
-class RewardWaitThread(threading.Thread):
+
+## A class which represents the reward wait for a given dst_ip and a next hop mac.
+class RewardWait:
     ## Constructor.
     # @param self The object pointer.
     # @param dst_ip Destination IP of the route for this packet.
     # @param mac MAC address of the node where the packet had been sent for getting the reward.
-    # @param table Reference to RouteTable.Table object.
-    # @param reward_wait_list Reference to the shared RewardWaitHandler.reward_wait_list dictionary.
+    # @param hash_values Tuple of 32-bit hashes of the dst_ip and mac, which the reward may carry.
+    # @param hash_mode Mode mask of the hash_values, see MessageHash.HashModes.
     # @return None
-    def __init__(self, dst_ip, mac, table, reward_wait_list):
-        super(RewardWaitThread, self).__init__()
+    def __init__(self, dst_ip, mac, hash_values, hash_mode):
         ## @var dst_ip
         # Destination IP of the route for this packet. Represented in a string format.
         self.dst_ip = dst_ip
         ## @var mac
         # MAC address of the node where the packet had been sent for getting the reward.
-        # Represented in "xx:xx:xx:xx:xx:xx" string format.
+        # Represented as a 6-byte binary string.
         self.mac = mac
-        ## @var table
-        # Reference to RouteTable.Table object.
-        self.table = table
-        ## @var reward_wait_list
-        # Reference to the shared RewardWaitHandler.reward_wait_list dictionary.
-        self.reward_wait_list = reward_wait_list
-        ## @var reward_is_received
+        ## @var hash_values
+        # Tuple of 32-bit hashes of the dst_ip and mac, which the reward may carry.
+        self.hash_values = hash_values
+        ## @var hash_mode
+        # Mode mask of the hash_values, see MessageHash.HashModes.
+        self.hash_mode = hash_mode
+        ## @var rewarded
         # Define flag whether the reward has been received or not. bool().
-        self.reward_is_received = False
-        ## @var wait_timeout
-        # Wait timeout value after which a negative reward is initiated towards the dst_ip.
-        self.wait_timeout = 3
-
-    ## Main thread routine.
-    # @param self The object pointer.
-    # @return None
-    def run(self):
-        time.sleep(self.wait_timeout)
-        # If the reward has been received while sleeping, just do nothing
-        if self.reward_is_received:
-            pass
-        # Else, if the reward hasn't been received, update the table with "bad" reward
-        else:
-            self.table.update_entry(self.dst_ip, self.mac, 0)
-
-        # Finally, finish and delete the thread
-        hash_str = hashlib.md5(self.dst_ip + self.mac).hexdigest()
-        # Convert hash_str from hex to 32-bit integer
-        hash_value = int(hash_str, 16) & max_int32
-
-        lock.acquire()
-        try:
-            del self.reward_wait_list[hash_value]
-
-        # If key is not present, then pass
-        except KeyError:
-            pass
-
-        finally:
-            lock.release()
-
-    ## Process an incoming reward value.
-    # @param self The object pointer.
-    # @param reward_value Reward value.
-    # @return None
-    def process_reward(self, reward_value):
-        self.reward_is_received = True
-        self.table.update_entry(self.dst_ip, self.mac, reward_value)
+        self.rewarded = False
 
 
 ## A class which handles a reward generation and sending back to the sender node.
@@ -161,20 +183,27 @@ class RewardSendHandler:
     # @param self The object pointer.
     # @param table Reference to RouteTable.Table object.
     # @param raw_transport Reference to Transport.RawTransport object.
+    # @param control_handler Reference to ControlHandler.ControlHandler object, or None if the aggregation of the
+    # control messages is disabled.
     # @return None
-    def __init__(self, table, raw_transport):
+    def __init__(self, table, raw_transport, control_handler=None):
         ## @var table
         # Reference to RouteTable.Table object.
         self.table = table
         ## @var raw_transport
         # Reference to Transport.RawTransport object.
         self.raw_transport = raw_transport
+        ## @var send_reward_message
+        # Create a reference to the default self.send_reward_message method, depending on whether the aggregation of
+        # the control messages is enabled or not.
+        if control_handler is not None:
+            self.send_reward_message = control_handler.add_reward
         ## @var node_mac
-        # Reference to the node's own MAC address, stored in Transport.RawTransport.node_mac.
+        # The node's own MAC address, as a 6-byte binary string, which is used for generating the reward hashes.
         self.node_mac = raw_transport.node_mac
         ## @var reward_send_list
         # Define a structure for handling reward sends for given dst_ips.
-        # Format: {hash(dst_ip + mac): last_sent_ts}. Hash is 32-bit integer, generated from md5 hash.
+        # Format: {(dst_ip, mac): last_sent_ts}.
         self.reward_send_list = dict()
         ## @var hold_on_timeout
         # A timeout after which the reward value is sent back to the sender. This is done in order to decrease a number
@@ -189,22 +218,20 @@ class RewardSendHandler:
     # @param mac MAC address of the node where the packet had been sent for getting the reward.
     # @return None
     def send_reward(self, dst_ip, mac):
-        hash_str = hashlib.md5(dst_ip + mac).hexdigest()
-        # Convert hash_str from hex to 32-bit integer
-        hash_value = int(hash_str, 16) & max_int32
+        key = (dst_ip, mac)
 
-        if hash_value not in self.reward_send_list:
+        if key not in self.reward_send_list:
             # Create a new entry with current timestamp
-            self.reward_send_list.update({hash_value: time.time()})
+            self.reward_send_list.update({key: time.time()})
             self.send_back(dst_ip, mac)
 
-        # If a timestamp of the given hash_value already exists, check if the timestamp is too old, according to the
+        # If a timestamp of the given key already exists, check if the timestamp is too old, according to the
         # hold on timeout. If too old - refresh the timestamp and send the reward again.
         # If no, just do nothing.
         else:
-            if (time.time() - self.reward_send_list[hash_value]) > self.hold_on_timeout:
+            if (time.time() - self.reward_send_list[key]) > self.hold_on_timeout:
                 # Create a new entry with current timestamp
-                self.reward_send_list.update({hash_value: time.time()})
+                self.reward_send_list.update({key: time.time()})
                 self.send_back(dst_ip, mac)
 
     ## Generate and send the reward message back to the originating node.
@@ -215,9 +242,18 @@ class RewardSendHandler:
     def send_back(self, dst_ip, mac):
         # Calculate its own average value of the estimated reward towards the given dst_ip
         avg_value = self.table.get_avg_value(dst_ip)
-        hash_str = hashlib.md5(dst_ip + self.node_mac).hexdigest()
-        hash_value = int(hash_str, 16) & max_int32
+        # Generate the hash in the hashing mode supported by the sender of the packet
+        hash_value = MessageHash.get_reward_hash(dst_ip, self.node_mac, self.table.get_neighbor_version(mac))
         # Generate and send the reward back
         dsr_reward_message = Messages.RewardMessage(avg_value, hash_value)
         # Send it back to the node which has sent the packet
-        self.raw_transport.send_raw_frame(mac, dsr_reward_message, "")
+        self.send_reward_message(mac, dsr_reward_message)
+
+    ## Default method for sending the reward message to the given mac in a separate frame.
+    # It is being overridden in the constructor, if the aggregation of the control messages is enabled.
+    # @param self The object pointer.
+    # @param mac MAC address of the node to send the reward message to.
+    # @param reward_message Messages.RewardMessage object.
+    # @return None
+    def send_reward_message(self, mac, reward_message):
+        self.raw_transport.send_raw_frame(mac, reward_message, "")
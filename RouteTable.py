@@ -8,14 +8,23 @@ Created on Aug 1, 2016
 
 This module presents a routing table implementation of the protocol, with formats for routing entries, and with the
 corresponding processing methods.
+The readers of the whole table (the RoutingManager, the table printer and so on) are served from the published
+read-only snapshot of the table. The writers build a new version of the snapshot and publish it by a single reference
+assignment, so the readers get a consistent view of the table at once, without locking or retrying.
 """
 
 # Import necessary python modules from the standard library
-import copy
+import threading
+from array import array
+from itertools import count
 
 # Import the necessary modules of the program
+import Messages
 import rl_logic
 import routing_logging
+from Transport import mac_to_str
+from conf import VALUE_BACKEND, VALUE_ESTIMATION_METHOD, VALUE_STEP_SIZE, VALUE_WINDOW_SIZE
+from conf import SELECTION_METHOD, SOFTMAX_TAU, SOFTMAX_START_TAU, SOFTMAX_MIN_TAU, SOFTMAX_TAU_DECAY, UCB_FACTOR
 
 ## @var PATH_TO_LOGS
 # This constant stores a string with an absolute path to log files directory.
@@ -26,56 +35,148 @@ PATH_TO_LOGS = routing_logging.PATH_TO_LOGS
 TABLE_LOG = routing_logging.create_routing_log("routing.route_table.log", "route_table")
 
 
-## Class Entry represents a dictionary containing current estimated values for forwarding a packet to the given mac.
-class Entry(dict):
+## @var NO_VALUE
+# Value of the slot, which the entry doesn't have an estimated value for (not a number). Since it is not equal to
+# itself, the empty slots are detected by the "value != value" check.
+NO_VALUE = float("nan")
+
+## @var VERSION_COUNTER
+# Global counter of the versions of the entries' values. Each change of the values gets a new unique version, which
+# invalidates the selection data, cached by the action selector.
+VERSION_COUNTER = count(1)
+
+
+## Class NeighborIndex maps the MAC addresses of the neighbors to the slot numbers in the value arrays of the entries.
+# A single index is shared by all the entries of the table, so the neighbors are stored only once, regardless of the
+# number of the entries.
+class NeighborIndex:
+    ## Constructor.
+    # @param self The object pointer.
+    # @return None
+    def __init__(self):
+        ## @var slots
+        # Dictionary with the slot numbers of the MAC addresses. Format: {mac: slot}.
+        self.slots = dict()
+        ## @var macs
+        # List of the MAC addresses, indexed by their slot numbers. The released slots contain None.
+        self.macs = list()
+        ## @var free_slots
+        # List of the released slot numbers, which are reused by the new MAC addresses.
+        self.free_slots = list()
+        ## @var lock
+        # threading.Lock object, which protects the allocation of the slots.
+        self.lock = threading.Lock()
+
+    ## Get the slot number of the given MAC address. A new slot is allocated, if the address has no slot yet.
+    # @param self The object pointer.
+    # @param mac MAC address, as a 6-byte binary string.
+    # @return Slot number.
+    def get_slot(self, mac):
+        slot = self.slots.get(mac)
+        if slot is not None:
+            return slot
+        self.lock.acquire()
+        slot = self.slots.get(mac)
+        if slot is None:
+            if self.free_slots:
+                slot = self.free_slots.pop()
+                self.macs[slot] = mac
+            else:
+                slot = len(self.macs)
+                self.macs.append(mac)
+            self.slots[mac] = slot
+        self.lock.release()
+        return slot
+
+    ## Find the slot number of the given MAC address, without allocating a new one.
+    # @param self The object pointer.
+    # @param mac MAC address, as a 6-byte binary string.
+    # @return Slot number, or None if the address has no slot.
+    def find_slot(self, mac):
+        return self.slots.get(mac)
+
+    ## Release the slot of the given MAC address. The values of the slot must be cleared in all the entries before.
+    # @param self The object pointer.
+    # @param mac MAC address, as a 6-byte binary string.
+    # @return None
+    def release(self, mac):
+        self.lock.acquire()
+        slot = self.slots.pop(mac, None)
+        if slot is not None:
+            self.macs[slot] = None
+            self.free_slots.append(slot)
+        self.lock.release()
+
+
+## Class Entry represents current estimated values for forwarding a packet to the given mac.
+# The values are stored in a compact array, indexed by the slot numbers of the shared RouteTable.NeighborIndex, and the
+# entry provides the read-only dictionary interface {mac: value} on top of it, which is used by the action selectors.
+class Entry:
     ## Constructor.
     # @param self The object pointer.
     # @param dst_ip Destination IP address of the route.
+    # @param neighbor_index Reference to the shared RouteTable.NeighborIndex object.
     # @param neighbors_list List of MAC addresses of currently accessible direct neighbors.
+    # @param value_estimator rl_logic.ValueEstimator object for keeping the updates for incoming rewards.
     # @return None
-    def __init__(self, dst_ip, neighbors_list):
-        super(Entry, self).__init__()
+    def __init__(self, dst_ip, neighbor_index, neighbors_list, value_estimator):
         ## @var dst_ip
         # Destination IP address of the route.
         self.dst_ip = dst_ip
-        ## @var local_neighbor_list
-        # Store a copy of the initial list of direct neighbors.
-        self.local_neighbor_list = copy.deepcopy(neighbors_list)
-        # Initialize the first estimation values for the freshly added actions/neighbors.
-        self.init_values()
+        ## @var neighbor_index
+        # Reference to the shared RouteTable.NeighborIndex object.
+        self.neighbor_index = neighbor_index
+        ## @var value_slots
+        # Array of the estimated values, indexed by the slot numbers of the neighbor_index. The slots without a value
+        # contain NO_VALUE.
+        self.value_slots = array("d")
+        ## @var version
+        # Version of the values, which is updated on each change of them.
+        self.version = next(VERSION_COUNTER)
+        ## @var selection_cache
+        # Selection data, calculated from the values by the action selector (e.g., rl_logic.SoftmaxDistribution), or
+        # None. It is valid only while its version matches the version of the entry.
+        self.selection_cache = None
+        ## @var step_total
+        # Total number of the rewards the entry has received, including the ones of the removed neighbors.
+        self.step_total = 0
+        # Initialize the first estimation values for the current neighbors
+        for mac in neighbors_list.keys():
+            self.set_value(neighbor_index.get_slot(mac), 0.0)
         ## @var value_estimator
-        # Create rl_logic.ValueEstimator object for keeping the updates for incoming rewards.
-        self.value_estimator = rl_logic.ValueEstimator()
+        # rl_logic.ValueEstimator object for keeping the updates for incoming rewards.
+        self.value_estimator = value_estimator
 
-    ## Initialize the first estimation values for the freshly added actions/neighbors.
+    ## Set the estimated value of the given slot. The array is extended, if needed.
     # @param self The object pointer.
+    # @param slot Slot number of the neighbor.
+    # @param value Estimated value.
     # @return None
-    def init_values(self):
-        for mac in self.local_neighbor_list:
-            if mac not in self:
-                # Assign initial estimated values
-                self.update({mac: 0.0})
+    def set_value(self, slot, value):
+        if slot >= len(self.value_slots):
+            self.value_slots.extend([NO_VALUE] * (slot + 1 - len(self.value_slots)))
+        self.value_slots[slot] = value
+        self.version = next(VERSION_COUNTER)
 
-    ## Update the list of neighbors, according to a given neighbors list.
+    ## Add the new neighbor to the entry, and initialize its estimation value.
     # @param self The object pointer.
-    # @param neighbors_list List of MAC addresses of currently accessible direct neighbors.
+    # @param slot Slot number of the neighbor.
     # @return None
-    def update_neighbors(self, neighbors_list):
-        if self.local_neighbor_list == neighbors_list:
-            pass
-        else:
-            # Merge the old list with the given one
-            self.local_neighbor_list.update(neighbors_list)
-            # Delete the old keys
-            keys_to_delete = set(self.local_neighbor_list) - set(neighbors_list)
-            for key in keys_to_delete:
-                # Delete a key
-                del self.local_neighbor_list[key]
-                # Delete a corresponding estimated value from the ValueEstimator object
-                self.value_estimator.delete_action_id(key)
-
-            # Initialize the est_values for new macs
-            self.init_values()
+    def add_neighbor(self, slot):
+        if slot >= len(self.value_slots) or self.value_slots[slot] != self.value_slots[slot]:
+            self.set_value(slot, 0.0)
+
+    ## Remove the neighbor from the entry, together with its estimation value.
+    # @param self The object pointer.
+    # @param slot Slot number of the neighbor.
+    # @param mac MAC address of the neighbor.
+    # @return None
+    def remove_neighbor(self, slot, mac):
+        if slot < len(self.value_slots):
+            self.value_slots[slot] = NO_VALUE
+            self.version = next(VERSION_COUNTER)
+        # Delete a corresponding estimated value from the ValueEstimator object
+        self.value_estimator.delete_action_id(mac)
 
     ## Update estimation value on the action (mac) by the given reward.
     # @param self The object pointer.
@@ -84,14 +185,220 @@ class Entry(dict):
     # @return None
     def update_value(self, mac, reward):
         # Estimate the value and update the entry itself
-        self[mac] = self.value_estimator.estimate_value(mac, reward)
+        self.set_value(self.neighbor_index.get_slot(mac), self.value_estimator.estimate_value(mac, reward))
+        self.step_total += 1
+
+    ## Get the estimated values of the entry, indexed by the slot numbers.
+    # @param self The object pointer.
+    # @return Sequence of the values. The slots without a value contain NO_VALUE.
+    def get_value_slots(self):
+        return self.value_slots
+
+    ## Get the soft-max distribution of the entry's values, which is used by rl_logic.ActionSelector.
+    # The distribution is cached until the values of the entry change.
+    # @param self The object pointer.
+    # @param tau Temperature factor of the distribution.
+    # @return rl_logic.SoftmaxDistribution object, or None if the entry is empty.
+    def get_softmax_distribution(self, tau):
+        # The version is read before the values, so that a concurrent change of the values invalidates the cache
+        version = self.version
+        distribution = self.selection_cache
+        if distribution is None or distribution.version != version or distribution.tau != tau:
+            action_items = self.items()
+            if not action_items:
+                return None
+            distribution = self.selection_cache = rl_logic.SoftmaxDistribution(action_items, tau, version)
+        return distribution
+
+    ## Get the numbers of the rewards, which the estimation values of the entry have been calculated from.
+    # It is used by the action selectors, which depend on the number of the rewards (e.g., "ucb1").
+    # @param self The object pointer.
+    # @return dict() with {mac: step_count}.
+    def get_step_counts(self):
+        actions = self.value_estimator.actions
+        return dict([(mac, actions.get(mac, (0.0, 0))[1]) for mac in self.keys()])
+
+    ## Get the total number of the rewards the entry has received, including the ones of the removed neighbors.
+    # It is used by the "annealed-soft-max" action selector, which is called on each packet, so it is kept as a counter
+    # instead of summing up the get_step_counts().
+    # @param self The object pointer.
+    # @return Number of the rewards.
+    def get_step_total(self):
+        return self.step_total
+
+    ## Return the list of (mac, value) pairs of the entry.
+    # @param self The object pointer.
+    # @return list() of (mac, value) tuples.
+    def items(self):
+        macs = self.neighbor_index.macs
+        return [(macs[slot], value) for slot, value in enumerate(self.get_value_slots()) if value == value]
+
+    ## Return the list of MAC addresses of the entry.
+    # @param self The object pointer.
+    # @return list() of MAC addresses.
+    def keys(self):
+        macs = self.neighbor_index.macs
+        return [macs[slot] for slot, value in enumerate(self.get_value_slots()) if value == value]
+
+    ## Return the list of estimated values of the entry, in the same order as keys().
+    # @param self The object pointer.
+    # @return list() of values.
+    def values(self):
+        return [value for value in self.get_value_slots() if value == value]
+
+    ## Get the estimated value of the given mac.
+    # @param self The object pointer.
+    # @param mac MAC address of the neighbor (action ID).
+    # @param default Value to be returned, if the entry has no value of the given mac.
+    # @return Estimated value, or default.
+    def get(self, mac, default=None):
+        slot = self.neighbor_index.slots.get(mac)
+        value_slots = self.get_value_slots()
+        if slot is None or slot >= len(value_slots) or value_slots[slot] != value_slots[slot]:
+            return default
+        return value_slots[slot]
+
+    ## Get the estimated value of the given mac.
+    # @param self The object pointer.
+    # @param mac MAC address of the neighbor (action ID).
+    # @return Estimated value.
+    def __getitem__(self, mac):
+        value = self.get(mac)
+        if value is None:
+            raise KeyError(mac)
+        return value
+
+    ## Check whether the entry has the estimated value of the given mac.
+    # @param self The object pointer.
+    # @param mac MAC address of the neighbor (action ID).
+    # @return True or False.
+    def __contains__(self, mac):
+        return self.get(mac) is not None
+
+    ## Iterate over the MAC addresses of the entry.
+    # @param self The object pointer.
+    # @return Iterator over the MAC addresses.
+    def __iter__(self):
+        return iter(self.keys())
+
+    ## Get the number of the estimated values of the entry.
+    # @param self The object pointer.
+    # @return Number of the values.
+    def __len__(self):
+        return len(self.values())
 
     ## Calculate and output the average of estimation values of this entry itself.
-    ## Initialize the first estimation values for the freshly added actions/neighbors.
     # @param self The object pointer.
-    # @return Average estimation value: sum(self.values()) / len(self).
+    # @return Average estimation value: sum(self.values()) / len(self), or 0.0 if the entry has no neighbors.
     def calc_avg_value(self):
-        return sum(self.values()) / len(self)
+        values = self.values()
+        if not values:
+            return 0.0
+        return sum(values) / len(values)
+
+    ## Make a read-only copy of the entry's values for the table snapshot.
+    # @param self The object pointer.
+    # @return dict() with {mac: value}, where mac is in "xx:xx:xx:xx:xx:xx" format.
+    def get_view(self):
+        return dict([(mac_to_str(mac), value) for mac, value in self.items()])
+
+    ## Return the string representation of the entry, with the MAC addresses in "xx:xx:xx:xx:xx:xx" format.
+    # @param self The object pointer.
+    # @return String representation of the entry.
+    def __str__(self):
+        return str(self.get_view())
+
+
+## Class MatrixEntry represents the route entry, which values are stored in a row of the shared
+# rl_logic.value_matrix.ValueMatrix object, with the columns indexed by the slot numbers of the
+# RouteTable.NeighborIndex. It is used in place of RouteTable.Entry, if the "numpy" value backend is chosen.
+class MatrixEntry(Entry):
+    ## Constructor.
+    # @param self The object pointer.
+    # @param dst_ip Destination IP address of the route.
+    # @param neighbor_index Reference to the shared RouteTable.NeighborIndex object.
+    # @param value_matrix Reference to the shared rl_logic.value_matrix.ValueMatrix object.
+    # @param neighbors_list List of MAC addresses of currently accessible direct neighbors.
+    # @return None
+    def __init__(self, dst_ip, neighbor_index, value_matrix, neighbors_list):
+        ## @var dst_ip
+        # Destination IP address of the route.
+        self.dst_ip = dst_ip
+        ## @var neighbor_index
+        # Reference to the shared RouteTable.NeighborIndex object.
+        self.neighbor_index = neighbor_index
+        ## @var value_matrix
+        # Reference to the shared rl_logic.value_matrix.ValueMatrix object.
+        self.value_matrix = value_matrix
+        ## @var row
+        # Number of the entry's row in the value_matrix.
+        self.row = value_matrix.add_row()
+        # Initialize the first estimation values for the current neighbors
+        for mac in neighbors_list.keys():
+            self.add_neighbor(neighbor_index.get_slot(mac))
+
+    ## Add the new neighbor to the entry, and initialize its estimation value.
+    # @param self The object pointer.
+    # @param slot Slot number of the neighbor.
+    # @return None
+    def add_neighbor(self, slot):
+        self.value_matrix.init_value(self.row, slot)
+
+    ## Update estimation value on the action (mac) by the given reward.
+    # @param self The object pointer.
+    # @param mac MAC address of the neighbor (action ID).
+    # @param reward Reward value to be assigned.
+    # @return None
+    def update_value(self, mac, reward):
+        self.value_matrix.apply_rewards([self.row], [self.neighbor_index.get_slot(mac)], [reward])
+
+    ## Get the estimated values of the entry, indexed by the slot numbers.
+    # @param self The object pointer.
+    # @return list() of the values. The slots without a value contain NaN.
+    def get_value_slots(self):
+        return self.value_matrix.get_row(self.row)
+
+    ## Get the soft-max distribution of the entry's values, which is used by rl_logic.ActionSelector.
+    # The distributions of all the changed entries are re-calculated by the value_matrix at once.
+    # @param self The object pointer.
+    # @param tau Temperature factor of the distribution.
+    # @return rl_logic.value_matrix.RowDistribution object.
+    def get_softmax_distribution(self, tau):
+        return self.value_matrix.get_softmax_distribution(self.row, tau, self.neighbor_index.macs)
+
+    ## Get the numbers of the rewards, which the estimation values of the entry have been calculated from.
+    # @param self The object pointer.
+    # @return dict() with {mac: step_count}.
+    def get_step_counts(self):
+        macs = self.neighbor_index.macs
+        counts = self.value_matrix.get_row_counts(self.row)
+        return dict([(macs[slot], counts[slot] if slot < len(counts) else 0)
+                     for slot, value in enumerate(self.get_value_slots()) if value == value])
+
+    ## Get the total number of the rewards the entry has received, including the ones of the removed neighbors.
+    # @param self The object pointer.
+    # @return Number of the rewards.
+    def get_step_total(self):
+        return self.value_matrix.get_row_total(self.row)
+
+
+## Class TableSnapshot represents a published read-only version of the route table.
+# Once published, the snapshot is never modified, the writers replace it with a new one instead.
+class TableSnapshot:
+    ## Constructor.
+    # @param self The object pointer.
+    # @param entries dict() with the views of the entries: {dst_ip: {mac: value}}, where mac is in "xx:xx:xx:xx:xx:xx"
+    # format.
+    # @param neighbors_l3_addresses List with L3 addresses of each neighbor:
+    # [[addr1, ... addrN], ... [addr1, ... addrN]].
+    # @return None
+    def __init__(self, entries, neighbors_l3_addresses):
+        ## @var entries
+        # dict() with the views of the entries: {dst_ip: {mac: value}}.
+        self.entries = entries
+        ## @var neighbors_l3_addresses
+        # List with L3 addresses of each neighbor.
+        self.neighbors_l3_addresses = neighbors_l3_addresses
 
 
 ## Route table class.
@@ -100,9 +407,10 @@ class Entry(dict):
 class Table:
     ## Constructor.
     # @param self The object pointer.
-    # @param node_mac MAC address of the node's network interface.
+    # @param node_mac MAC address of the node's network interface, as a 6-byte binary string.
+    # @param est_method_id Calculation method of the estimation values: "sample_average", "ewma" or "window".
     # @return None
-    def __init__(self, node_mac):
+    def __init__(self, node_mac, est_method_id=VALUE_ESTIMATION_METHOD):
         ## @var table_filename
         # Define a filename to write the table entries to. Default filename is "table.txt".
         self.table_filename = "table.txt"
@@ -111,8 +419,15 @@ class Table:
         self.node_mac = node_mac
         ## @var neighbors_list
         # Define a shared dictionary of current active neighbors. This dictionary is also used by the
-        # ListenNeighbors class from the NeighborDiscovery module. Format: {mac: NeighborDiscovery.Neighbor object}.
+        # ListenNeighbors class from the NeighborDiscovery module. Format: {mac: NeighborDiscovery.Neighbor object},
+        # where mac is a 6-byte binary string.
         self.neighbors_list = dict()
+        ## @var neighbor_index
+        # RouteTable.NeighborIndex object, which maps the MAC addresses to the value slots of all the entries.
+        self.neighbor_index = NeighborIndex()
+        # The node's own MAC address is the action of the entries of the node's own IP addresses, so it has a slot
+        # for the whole lifetime of the table
+        self.neighbor_index.get_slot(node_mac)
         ## @var entries_list
         # Define list of current route entries. Format: {dst_ip: Entry}.
         self.entries_list = dict()
@@ -121,8 +436,51 @@ class Table:
         self.current_node_ips = list()
         ## @var action_selector
         # Create RL-helper rl_logic.ActionSelector object, to handle the process of action selection.
-        self.action_selector = rl_logic.ActionSelector("soft-max")
+        self.action_selector = rl_logic.ActionSelector(SELECTION_METHOD, SOFTMAX_TAU, SOFTMAX_MIN_TAU,
+                                                       SOFTMAX_TAU_DECAY, UCB_FACTOR, SOFTMAX_START_TAU)
         TABLE_LOG.info("Chosen selection method: %s", self.action_selector.selection_method_id)
+        ## @var est_method_id
+        # Calculation method of the estimation values of the entries.
+        self.est_method_id = est_method_id
+        ## @var step_size
+        # Constant step size of the "ewma" estimation method.
+        self.step_size = VALUE_STEP_SIZE
+        ## @var window_size
+        # Number of the last rewards, which are averaged by the "window" estimation method.
+        self.window_size = VALUE_WINDOW_SIZE
+        TABLE_LOG.info("Chosen estimation method: %s", est_method_id)
+        ## @var snapshot
+        # Currently published RouteTable.TableSnapshot object. It is replaced as a whole on each change of the table.
+        self.snapshot = TableSnapshot(dict(), list())
+        ## @var publish_lock
+        # threading.Lock object, which serializes the writers of the snapshot, so that their changes are not lost.
+        # The readers never take it.
+        self.publish_lock = threading.Lock()
+        ## @var neighbors_lock
+        # threading.Lock object, which serializes the neighbor changes with the creation of the new entries, so that
+        # a new entry never misses a neighbor change.
+        self.neighbors_lock = threading.Lock()
+        ## @var value_matrix
+        # Shared rl_logic.value_matrix.ValueMatrix object with the values of all the entries, if the "numpy" value
+        # backend is chosen, or None. In this case, the default methods of the entries creation and the values update
+        # are overridden.
+        self.value_matrix = None
+        # The "window" estimation method is supported by the default value backend only
+        if VALUE_BACKEND == "numpy" and est_method_id == "window":
+            TABLE_LOG.error("The window estimation method is not supported by the numpy value backend! "
+                            "Falling back to the default value backend")
+        elif VALUE_BACKEND == "numpy":
+            try:
+                # NumPy is an optional dependency, so the module is imported only here
+                from rl_logic.value_matrix import ValueMatrix
+                self.value_matrix = ValueMatrix(est_method_id, self.step_size)
+                self.create_entry = self.create_matrix_entry
+                self.apply_rewards = self.apply_rewards_to_matrix
+                self.add_neighbor_values = self.value_matrix.insert_column
+                self.remove_neighbor_values = lambda slot, mac: self.value_matrix.remove_column(slot)
+            except ImportError:
+                TABLE_LOG.error("NumPy is not available! Falling back to the default value backend")
+        TABLE_LOG.info("Chosen value backend: %s", "numpy" if self.value_matrix is not None else "python")
 
     ## This method selects a next hop for the packet with the given dst_ip.
     # The selection is being made from the current estimated values of the neighbors mac addresses,
@@ -131,33 +489,206 @@ class Table:
     # @param dst_ip Destination IP address of the route.
     # @return (MAC address of the next hop) or None.
     def get_next_hop_mac(self, dst_ip):
-        if dst_ip in self.entries_list:
-            # Update the neighbors and corresponding action values
-            self.entries_list[dst_ip].update_neighbors(self.neighbors_list)
-            # Select a next hop mac
-            next_hop_mac = self.action_selector.select_action(self.entries_list[dst_ip])
-            TABLE_LOG.debug("Selected next_hop: %s, from available entries: %s",
-                            next_hop_mac, self.entries_list[dst_ip])
-            return next_hop_mac
+        entry = self.entries_list.get(dst_ip)
         # If no such entry, return None
-        else:
+        if entry is None:
             return None
+        # Select a next hop mac. The neighbors of the entry are kept up to date by add_neighbor and remove_neighbor.
+        next_hop_mac = self.action_selector.select_action(entry)
+        if next_hop_mac is not None and TABLE_LOG.debug_enabled:
+            TABLE_LOG.debug("Selected next_hop: %s, from available entries: %s", mac_to_str(next_hop_mac), entry)
+        return next_hop_mac
+
+    ## Add the new neighbor to the neighbors_list, and to all the current entries.
+    # It is called by NeighborDiscovery.ListenNeighbors, when the new neighbor appears.
+    # @param self The object pointer.
+    # @param neighbor NeighborDiscovery.Neighbor object.
+    # @return None
+    def add_neighbor(self, neighbor):
+        self.neighbors_lock.acquire()
+        self.neighbors_list[neighbor.mac] = neighbor
+        self.add_neighbor_values(self.neighbor_index.get_slot(neighbor.mac))
+        self.neighbors_lock.release()
+        self.publish_neighbors()
+        self.publish_entries(self.entries_list.keys())
+
+    ## Remove the neighbor from the neighbors_list, and from all the current entries.
+    # It is called by NeighborDiscovery.ListenNeighbors, when the neighbor expires.
+    # @param self The object pointer.
+    # @param mac MAC address of the neighbor.
+    # @return None
+    def remove_neighbor(self, mac):
+        self.neighbors_lock.acquire()
+        self.neighbors_list.pop(mac, None)
+        slot = self.neighbor_index.find_slot(mac)
+        if slot is not None:
+            self.remove_neighbor_values(slot, mac)
+            self.neighbor_index.release(mac)
+        self.neighbors_lock.release()
+        self.publish_neighbors()
+        self.publish_entries(self.entries_list.keys())
+
+    ## Default method for adding the new neighbor to all the current entries. Must be called under the neighbors_lock.
+    # It is being overridden in the constructor, depending on the chosen value backend.
+    # @param self The object pointer.
+    # @param slot Slot number of the neighbor.
+    # @return None
+    def add_neighbor_values(self, slot):
+        for entry in self.entries_list.values():
+            entry.add_neighbor(slot)
+
+    ## Default method for removing the neighbor from all the current entries. Must be called under the neighbors_lock.
+    # It is being overridden in the constructor, depending on the chosen value backend.
+    # @param self The object pointer.
+    # @param slot Slot number of the neighbor.
+    # @param mac MAC address of the neighbor.
+    # @return None
+    def remove_neighbor_values(self, slot, mac):
+        for entry in self.entries_list.values():
+            entry.remove_neighbor(slot, mac)
+
+    ## Default method for creating a new entry.
+    # It is being overridden in the constructor, depending on the chosen value backend.
+    # @param self The object pointer.
+    # @param dst_ip Destination IP address of the route.
+    # @return RouteTable.Entry object.
+    def create_entry(self, dst_ip):
+        value_estimator = rl_logic.ValueEstimator(self.est_method_id, self.step_size, self.window_size)
+        return Entry(dst_ip, self.neighbor_index, self.neighbors_list, value_estimator)
+
+    ## Create a new entry, which values are stored in the value_matrix.
+    # @param self The object pointer.
+    # @param dst_ip Destination IP address of the route.
+    # @return RouteTable.MatrixEntry object.
+    def create_matrix_entry(self, dst_ip):
+        return MatrixEntry(dst_ip, self.neighbor_index, self.value_matrix, self.neighbors_list)
 
     ## Update the estimation value of the given action_id (mac) by the given reward.
+    # The action may be a node, which hasn't been added to the neighbors yet (e.g., the sender of a RREQ or RREP,
+    # whose HELLO hasn't arrived yet), so the value is assigned to it anyway.
     # @param self The object pointer.
     # @param dst_ip Destination IP address of the route.
     # @param mac MAC address of the neighbor (action ID).
     # @param reward Reward value to be assigned.
     # @return None
     def update_entry(self, dst_ip, mac, reward):
-        if dst_ip in self.entries_list:
-            self.entries_list[dst_ip].update_value(mac, reward)
-        else:
+        self.neighbors_lock.acquire()
+        self.update_entry_value(dst_ip, mac, reward)
+        self.neighbors_lock.release()
+        self.publish_entries([dst_ip])
+
+    ## Update the estimation value of the given action_id (mac) by the reward, which has been received from it.
+    # The late rewards of the expired neighbors are dropped, see is_valid_action.
+    # @param self The object pointer.
+    # @param dst_ip Destination IP address of the route.
+    # @param mac MAC address of the neighbor (action ID).
+    # @param reward Reward value to be assigned.
+    # @return None
+    def update_reward(self, dst_ip, mac, reward):
+        self.neighbors_lock.acquire()
+        is_valid = self.is_valid_action(mac)
+        if is_valid:
+            self.update_entry_value(dst_ip, mac, reward)
+        self.neighbors_lock.release()
+        if is_valid:
+            self.publish_entries([dst_ip])
+
+    ## Update the estimation values of the entries by the given batch of rewards. The snapshot is published once for
+    # the whole batch. The rewards of the expired neighbors are dropped, see is_valid_action.
+    # @param self The object pointer.
+    # @param updates List of (dst_ip, mac, reward) tuples.
+    # @return None
+    def update_entries(self, updates):
+        self.neighbors_lock.acquire()
+        updates = [update for update in updates if self.is_valid_action(update[1])]
+        self.apply_rewards(updates)
+        self.neighbors_lock.release()
+        self.publish_entries(set([update[0] for update in updates]))
+
+    ## Check if the rewards of the given action_id (mac) can be applied to the entries. The action must be either
+    # a current neighbor, or the node's own MAC address. The late rewards of the expired neighbors (e.g., the ones of
+    # the reward wait timeouts) are dropped, so that they don't put the neighbors back into the entries. The check is
+    # applied only to the rewards, which are handled by RewardHandler.RewardWaitHandler.
+    # Must be called under the neighbors_lock.
+    # @param self The object pointer.
+    # @param mac MAC address of the neighbor (action ID).
+    # @return True if the rewards can be applied, False otherwise.
+    def is_valid_action(self, mac):
+        if mac in self.neighbors_list or mac == self.node_mac:
+            return True
+        TABLE_LOG.debug("Dropping the reward of the unknown neighbor: %s", routing_logging.LazyFormat(mac_to_str, mac))
+        return False
+
+    ## Default method for applying the batch of rewards to the entries, one by one. Must be called under the
+    # neighbors_lock.
+    # It is being overridden in the constructor, depending on the chosen value backend.
+    # @param self The object pointer.
+    # @param updates List of (dst_ip, mac, reward) tuples.
+    # @return None
+    def apply_rewards(self, updates):
+        for dst_ip, mac, reward in updates:
+            self.update_entry_value(dst_ip, mac, reward)
+
+    ## Apply the batch of rewards to the value_matrix at once. Must be called under the neighbors_lock.
+    # @param self The object pointer.
+    # @param updates List of (dst_ip, mac, reward) tuples.
+    # @return None
+    def apply_rewards_to_matrix(self, updates):
+        rows = [self.get_entry_for_update(dst_ip, mac).row for dst_ip, mac, _ in updates]
+        columns = [self.neighbor_index.get_slot(mac) for _, mac, _ in updates]
+        self.value_matrix.apply_rewards(rows, columns, [reward for _, _, reward in updates])
+
+    ## Update the estimation value of the given action_id (mac) by the given reward, without publishing the snapshot.
+    # Must be called under the neighbors_lock.
+    # @param self The object pointer.
+    # @param dst_ip Destination IP address of the route.
+    # @param mac MAC address of the neighbor (action ID).
+    # @param reward Reward value to be assigned.
+    # @return None
+    def update_entry_value(self, dst_ip, mac, reward):
+        self.get_entry_for_update(dst_ip, mac).update_value(mac, reward)
+
+    ## Get the entry of the given dst_ip for updating its value. The entry is created, if it doesn't exist yet.
+    # Must be called under the neighbors_lock, so that the new entry never misses a neighbor change.
+    # @param self The object pointer.
+    # @param dst_ip Destination IP address of the route.
+    # @param mac MAC address of the neighbor (action ID), which value is going to be updated.
+    # @return Entry object.
+    def get_entry_for_update(self, dst_ip, mac):
+        entry = self.entries_list.get(dst_ip)
+        if entry is None:
             TABLE_LOG.info("No such Entry to update. Creating and updating a new entry for dst_ip and mac: %s - %s",
-                           dst_ip, mac)
+                           dst_ip, mac_to_str(mac))
+            entry = self.create_entry(dst_ip)
+            self.entries_list.update({dst_ip: entry})
+        return entry
 
-            self.entries_list.update({dst_ip: Entry(dst_ip, self.neighbors_list)})
-            self.entries_list[dst_ip].update_value(mac, reward)
+    ## Publish a new version of the snapshot with the changed entries. The views of the other entries are shared with
+    # the previous version.
+    # @param self The object pointer.
+    # @param dst_ips Destination IP addresses of the changed entries.
+    # @return None
+    def publish_entries(self, dst_ips):
+        self.publish_lock.acquire()
+        entries = dict(self.snapshot.entries)
+        for dst_ip in dst_ips:
+            entry = self.entries_list.get(dst_ip)
+            if entry is not None:
+                entries[dst_ip] = entry.get_view()
+        self.snapshot = TableSnapshot(entries, self.snapshot.neighbors_l3_addresses)
+        self.publish_lock.release()
+
+    ## Publish a new version of the snapshot with the current neighbors' L3 addresses.
+    # It should be called on each change of the neighbors_list.
+    # @param self The object pointer.
+    # @return None
+    def publish_neighbors(self):
+        self.publish_lock.acquire()
+        # Create a list with L3 addresses of each neighbor in a format: [[addr1, ... addrN], ... [addr1, ... addrN]]
+        addresses_list = [[addr for addr in neighbor.l3_addresses if addr]
+                          for neighbor in self.neighbors_list.values()]
+        self.snapshot = TableSnapshot(self.snapshot.entries, addresses_list)
+        self.publish_lock.release()
 
     ## Calculate and return the average estimation value of the given entry.
     # @param self The object pointer.
@@ -173,12 +704,24 @@ class Table:
             TABLE_LOG.warning("CANNOT GET AVERAGE VALUE! NO SUCH ENTRY!!! Returning 0")
             return 0.0
 
+    ## Get the protocol version of the given neighbor, advertised in its HELLO messages.
+    # @param self The object pointer.
+    # @param mac MAC address of the neighbor, as a 6-byte binary string.
+    # @param default Value to return, if there is no such neighbor.
+    # @return Protocol version of the neighbor, or the default value if there is no such neighbor.
+    def get_neighbor_version(self, mac, default=Messages.BASE_PROTOCOL_VERSION):
+        neighbor = self.neighbors_list.get(mac)
+        if neighbor is None:
+            return default
+        return neighbor.protocol_version
+
     ## Return the current list of neighbors.
     # @param self The object pointer.
     # @return List of current neighbors. list().
     def get_neighbors(self):
         neighbors_list = list(set(self.neighbors_list))
-        TABLE_LOG.debug("Current list of neighbors: %s", neighbors_list)
+        TABLE_LOG.debug("Current list of neighbors: %s",
+                        routing_logging.LazyFormat(map, mac_to_str, neighbors_list))
         return neighbors_list
 
     ## Return current entry assigned for given destination IP.
@@ -191,47 +734,21 @@ class Table:
         else:
             return None
 
-    ## Safe-copy and return a current list of entries.
+    ## Return a current list of entries from the published snapshot. The returned data must not be modified.
+    # The MAC addresses are in "xx:xx:xx:xx:xx:xx" format. This is needed to simply a further (de-)serialization of
+    # this data structure. Otherwise, it would contain the custom Entry() objects, which are difficult to de-serialize
+    # on the other side, without knowing their structure.
     # @param self The object pointer.
-    # @param return list() of entries.
+    # @param return dict() of entries: {dst_ip: {mac: value}}.
     def get_list_of_entries(self):
-        current_keys = self.entries_list.keys()
-        current_values = self.entries_list.values()
-
-        while len(current_keys) != len(current_values):
-            current_keys = self.entries_list.keys()
-            current_values = self.entries_list.values()
-
-        # This is needed to simply a further (de-)serialization of this data structure. Otherwise, the list of
-        # current_values would contain the custom Entry() objects, which are difficult to de-serialize on the other
-        # side, without knowing their structure.
-        current_values = map(dict, current_values)
-
-        return dict(zip(current_keys, current_values))
+        return self.snapshot.entries
 
-    ## Safe-copy and return a list with L3 addresses of current neighbors.
+    ## Return a list with L3 addresses of current neighbors from the published snapshot. The returned data must not be
+    # modified.
     # @param self The object pointer.
     # @param return list() of L3 addresses.
     def get_neighbors_l3_addresses(self):
-        # Make a safe-copy of the current list of neighbors
-        keys = self.neighbors_list.keys()
-        values = self.neighbors_list.values()
-
-        while len(keys) != len(values):
-            keys = self.neighbors_list.keys()
-            values = self.neighbors_list.values()
-
-        neighbors_list = dict(zip(keys, values))
-
-        # Create a list with L3 addresses of each neighbor in a format: [[addr1, ... addrN], ... [addr1, ... addrN]]
-        addresses_list = []
-        for mac in neighbors_list:
-            addresses_list.append([])
-            for addr in neighbors_list[mac].l3_addresses:
-                if addr:
-                    addresses_list[-1].append(addr)
-
-        return addresses_list
+        return self.snapshot.neighbors_l3_addresses
 
     ## Print out the contents of the route table to a specified file.
     # @param self The object pointer.
@@ -12,7 +12,13 @@ In the future, it can be also implemented via file I/O access, and so on.
 
 Currently, the following command IDs are supported:
 2 - get_table - returns a dictionary with current routing table;
-3 - get_neighbors - returns a list L3 addresses of current neighbors of the node.
+3 - get_neighbors - returns a list L3 addresses of current neighbors of the node;
+4 - dump_packet_trace - returns all the records of the packet trace ring;
+5:<seq> - stream_packet_trace - returns the records of the packet trace ring, starting from the given sequence number.
+The packet trace is returned as a tuple: (sequence number of the next record, list of the records). A client can stream
+the trace by requesting it periodically with the returned sequence number.
+6 - get_rtt_stats - returns a dictionary with the current RTT statistics (SRTT, RTTVAR, RTO and so on) of the ARQ
+towards each neighbor.
 """
 
 
@@ -29,7 +35,13 @@ MANAGER_LOG = routing_logging.create_routing_log("routing.manager.log", "manager
 
 ## A manager thread which listens for the incoming requests from the established UDS socket.
 class Manager(threading.Thread):
-    def __init__(self, table):
+    ## Constructor.
+    # @param self The object pointer.
+    # @param table Reference to RouteTable.Table object.
+    # @param packet_trace Reference to PacketTrace.TraceRing object, or None if the packet trace is disabled.
+    # @param arq_handler Reference to ArqHandler.ArqHandler object, or None.
+    # @return None
+    def __init__(self, table, packet_trace=None, arq_handler=None):
         super(Manager, self).__init__()
         ## @var running
         # Thread running state bool() flag.
@@ -37,6 +49,12 @@ class Manager(threading.Thread):
         ## @var table
         # Reference to RouteTable.Table object.
         self.table = table
+        ## @var packet_trace
+        # Reference to PacketTrace.TraceRing object, or None if the packet trace is disabled.
+        self.packet_trace = packet_trace
+        ## @var arq_handler
+        # Reference to ArqHandler.ArqHandler object, or None.
+        self.arq_handler = arq_handler
         ## @var server_address
         # UDS file location.
         self.server_address = "/tmp/uds_socket"
@@ -81,6 +99,15 @@ class Manager(threading.Thread):
             elif request[0] == "3":
                 self.get_neighbors()
 
+            elif request[0] == "4":
+                self.dump_packet_trace()
+
+            elif request[0] == "5":
+                self.stream_packet_trace(request[1:])
+
+            elif request[0] == "6":
+                self.get_rtt_stats()
+
             elif request[0] == "":
                 MANAGER_LOG.info("Got empty string from socket. Client has been disconnected.")
                 # Wait until new client connects
@@ -119,6 +146,49 @@ class Manager(threading.Thread):
         # Send the pickled data back to the client
         self.connection.sendall(pickle.dumps(neighbors))
 
+    ## Get and return all the records of the packet trace.
+    # @param self The object pointer.
+    # @return Pickled tuple (sequence number of the next record, list() of the records)
+    def dump_packet_trace(self):
+        self.send_packet_trace(0)
+
+    ## Get and return the records of the packet trace, starting from the given sequence number.
+    # @param self The object pointer.
+    # @param args list() of the command arguments: [sequence number].
+    # @return Pickled tuple (sequence number of the next record, list() of the records)
+    def stream_packet_trace(self, args):
+        try:
+            since = int(args[0])
+        except (IndexError, ValueError):
+            MANAGER_LOG.info("Invalid sequence number of the packet trace: %s", args)
+            since = 0
+
+        self.send_packet_trace(since)
+
+    ## Send the records of the packet trace, starting from the given sequence number, back to the client.
+    # If the packet trace is disabled, an empty list of the records is sent.
+    # @param self The object pointer.
+    # @param since Sequence number of the first requested record.
+    # @return None
+    def send_packet_trace(self, since):
+        if self.packet_trace is None:
+            trace_data = (0, [])
+        else:
+            trace_data = self.packet_trace.get_records(since)
+        # Send the pickled data back to the client
+        self.connection.sendall(pickle.dumps(trace_data))
+
+    ## Get and return the current RTT statistics of the ARQ towards each neighbor.
+    # @param self The object pointer.
+    # @return Pickled dict() with {mac: dict() of the statistics}
+    def get_rtt_stats(self):
+        if self.arq_handler is None:
+            rtt_stats = dict()
+        else:
+            rtt_stats = self.arq_handler.get_rtt_stats()
+        # Send the pickled data back to the client
+        self.connection.sendall(pickle.dumps(rtt_stats))
+
     ## Stop and quit the thread operation.
     # @param self The object pointer.
     # @return None
@@ -0,0 +1,145 @@
+#!/usr/bin/python
+"""
+@package TimerWheel
+Created on Oct 16, 2026
+
+@author: Dmitrii Dugaev
+
+
+This module provides a single scheduler thread, which runs a hashed timer wheel of the pending timers. It is used in
+place of spawning a separate sleeping thread for each delayed action, e.g., an ARQ retransmission of a message.
+The wheel consists of a number of slots, each of which corresponds to a single tick of the scheduler. A timer is placed
+into the slot of its expiration tick, and is fired by the scheduler thread, once this tick is reached. The timers,
+which expire beyond a single rotation of the wheel, stay in their slot until the corresponding rotation is reached.
+"""
+
+# Import necessary python modules from the standard library
+import threading
+import time
+
+# Import the necessary modules of the program
+import routing_logging
+from conf import TIMER_TICK_INTERVAL, TIMER_WHEEL_SIZE
+
+## @var TIMER_WHEEL_LOG
+# Global routing_logging.LogWrapper object for logging TimerWheel activity.
+TIMER_WHEEL_LOG = routing_logging.create_routing_log("routing.timer_wheel.log", "timer_wheel")
+
+
+## A class which represents a single timer, scheduled on the TimerWheel.
+class Timer:
+    ## Constructor.
+    # @param self The object pointer.
+    # @param expiration_tick Number of the wheel tick, on which the timer expires.
+    # @param callback A function to be called upon the timer expiration.
+    # @param args Arguments of the callback function.
+    # @return None
+    def __init__(self, expiration_tick, callback, args):
+        ## @var expiration_tick
+        # Number of the wheel tick, on which the timer expires.
+        self.expiration_tick = expiration_tick
+        ## @var callback
+        # A function to be called upon the timer expiration.
+        self.callback = callback
+        ## @var args
+        # Arguments of the callback function. tuple().
+        self.args = args
+        ## @var cancelled
+        # Timer cancellation bool() flag.
+        self.cancelled = False
+
+    ## Cancel the timer. The callback of a cancelled timer won't be called, and the timer is dropped from the wheel
+    # once its slot is reached.
+    # @param self The object pointer.
+    # @return None
+    def cancel(self):
+        self.cancelled = True
+
+
+## Scheduler thread, which runs the hashed timer wheel.
+class TimerWheel(threading.Thread):
+    ## Constructor.
+    # @param self The object pointer.
+    # @param tick_interval Time interval (in seconds) of a single tick of the wheel.
+    # @param wheel_size Number of slots in the wheel.
+    # @return None
+    def __init__(self, tick_interval=TIMER_TICK_INTERVAL, wheel_size=TIMER_WHEEL_SIZE):
+        super(TimerWheel, self).__init__()
+        ## @var running
+        # Thread running state bool() flag.
+        self.running = False
+        ## @var tick_interval
+        # Time interval (in seconds) of a single tick of the wheel.
+        self.tick_interval = tick_interval
+        ## @var wheel_size
+        # Number of slots in the wheel.
+        self.wheel_size = wheel_size
+        ## @var slots
+        # List of the wheel slots, each slot is a list of TimerWheel.Timer objects.
+        self.slots = [list() for _ in xrange(wheel_size)]
+        ## @var current_tick
+        # Number of the last processed tick of the wheel.
+        self.current_tick = 0
+        ## @var lock
+        # threading.Lock object, which protects the slots of the wheel.
+        self.lock = threading.Lock()
+
+    ## Schedule the callback to be called after the given delay.
+    # @param self The object pointer.
+    # @param delay Time interval (in seconds) after which the callback is called.
+    # @param callback A function to be called upon the timer expiration.
+    # @param args Arguments of the callback function.
+    # @return TimerWheel.Timer object, which can be used for cancelling the timer.
+    def schedule(self, delay, callback, *args):
+        # Round the delay up to the whole number of ticks. The current tick has already partly elapsed, so one more tick
+        # is added, and the timer never fires earlier than requested. The zero delay timer fires on the next tick.
+        ticks = max(0, int(-(-delay // self.tick_interval)))
+        self.lock.acquire()
+        timer = Timer(self.current_tick + ticks + 1, callback, args)
+        self.slots[timer.expiration_tick % self.wheel_size].append(timer)
+        self.lock.release()
+        return timer
+
+    ## Main thread routine.
+    # @param self The object pointer.
+    # @return None
+    def run(self):
+        self.running = True
+        next_tick_time = time.time() + self.tick_interval
+        while self.running:
+            delay = next_tick_time - time.time()
+            if delay > 0:
+                time.sleep(delay)
+            next_tick_time += self.tick_interval
+            # Fire all expired timers of the next slot
+            for timer in self.advance():
+                if not timer.cancelled:
+                    try:
+                        timer.callback(*timer.args)
+                    except Exception, e:
+                        TIMER_WHEEL_LOG.error("Timer callback %s has failed: %s", timer.callback, e)
+
+    ## Move the wheel to the next tick, and take all the timers which expire on this tick out of the wheel.
+    # @param self The object pointer.
+    # @return List of expired TimerWheel.Timer objects.
+    def advance(self):
+        self.lock.acquire()
+        self.current_tick += 1
+        slot = self.slots[self.current_tick % self.wheel_size]
+        if not slot:
+            self.lock.release()
+            return []
+        expired = [timer for timer in slot if timer.expiration_tick <= self.current_tick or timer.cancelled]
+        # Keep the timers which expire on the later rotations of the wheel
+        if len(expired) != len(slot):
+            slot[:] = [timer for timer in slot if timer.expiration_tick > self.current_tick and not timer.cancelled]
+        else:
+            del slot[:]
+        self.lock.release()
+        return expired
+
+    ## Stop and quit the thread operation.
+    # @param self The object pointer.
+    # @return None
+    def quit(self):
+        self.running = False
@@ -16,13 +16,20 @@ import socket
 import threading
 import subprocess
 import os
+import time
+import mmap
+import select
+import ctypes
+import binascii
 from fcntl import ioctl
 import struct
+from collections import deque
 
 # Import the necessary modules of the program
 import routing_logging
 import Messages
-from conf import VIRT_IFACE_NAME, SET_TOPOLOGY_FLAG, GW_MODE
+from conf import VIRT_IFACE_NAME, SET_TOPOLOGY_FLAG, GW_MODE, RECV_BATCH_SIZE, RECV_BATCH_TIMEOUT
+from conf import RECV_ENGINE, RING_BLOCK_SIZE, RING_BLOCK_COUNT
 
 ## @var TRANSPORT_LOG
 # Global routing_logging.LogWrapper object for logging Transport activity.
@@ -58,6 +65,72 @@ SIOCGIFINDEX = 0x8933
 # Get the address of the device.
 SIOCGIFADDR = 0x8915
 
+# Socket options and constants for setting up the PACKET_MMAP ring buffer. See the documentation:
+# https://www.kernel.org/doc/Documentation/networking/packet_mmap.txt
+## @var SOL_PACKET
+# Socket level of the AF_PACKET socket options.
+SOL_PACKET = 263
+## @var PACKET_RX_RING
+# Socket option for setting up the receive ring buffer.
+PACKET_RX_RING = 5
+## @var PACKET_VERSION
+# Socket option for choosing the version of the ring buffer frame headers.
+PACKET_VERSION = 10
+## @var TPACKET_V3
+# Version of the ring buffer, which operates with variable-length frames, packed into blocks.
+TPACKET_V3 = 2
+## @var TP_STATUS_KERNEL
+# Block status value, which says that the block belongs to the kernel.
+TP_STATUS_KERNEL = 0
+## @var TP_STATUS_USER
+# Block status flag, which says that the block has been filled up by the kernel and can be read by the user space.
+TP_STATUS_USER = 1
+## @var RING_FRAME_SIZE
+# Nominal frame size of the ring buffer. In TPACKET_V3 it only defines the maximum frame length, since the frames are
+# packed into the blocks one after another.
+RING_FRAME_SIZE = 2048
+## @var RING_POLL_TIMEOUT
+# Timeout (in milliseconds) of waiting for a new block, after which the running state of the receiver is checked.
+RING_POLL_TIMEOUT = 100
+## @var BLOCK_HEADER
+# Precompiled layout of (block_status, num_pkts, offset_to_first_pkt) fields of the tpacket_hdr_v1 block header,
+# located at offset 8 of the block descriptor.
+BLOCK_HEADER = struct.Struct("III")
+## @var FRAME_HEADER
+# Precompiled layout of (tp_next_offset, tp_sec, tp_nsec, tp_snaplen, tp_len, tp_status, tp_mac, tp_net) fields of
+# the tpacket3_hdr frame header.
+FRAME_HEADER = struct.Struct("IIIIIIHH")
+
+# Socket option and instruction codes for attaching a classic BPF filter to the raw socket. See the documentation:
+# https://www.kernel.org/doc/Documentation/networking/filter.txt
+## @var SO_ATTACH_FILTER
+# Socket option for attaching a socket filter program.
+SO_ATTACH_FILTER = 26
+## @var SO_DETACH_FILTER
+# Socket option for detaching the socket filter program.
+SO_DETACH_FILTER = 27
+## @var BPF_LDH_ABS
+# Load a 16-bit half-word from the absolute offset of the frame into the accumulator.
+BPF_LDH_ABS = 0x28
+## @var BPF_LD_ABS
+# Load a 32-bit word from the absolute offset of the frame into the accumulator.
+BPF_LD_ABS = 0x20
+## @var BPF_JEQ_K
+# Jump by jt instructions if the accumulator is equal to the constant, otherwise jump by jf instructions.
+BPF_JEQ_K = 0x15
+## @var BPF_RET_K
+# Return the constant: the number of bytes of the frame to be accepted, 0 - drop the frame.
+BPF_RET_K = 0x06
+## @var BPF_ACCEPT_LENGTH
+# Number of bytes of an accepted frame, passed to the socket.
+BPF_ACCEPT_LENGTH = 0x40000
+## @var BPF_MAX_INSTRUCTIONS
+# Maximum number of instructions in a socket filter program, allowed by the kernel.
+BPF_MAX_INSTRUCTIONS = 4096
+## @var BPF_INSTRUCTION
+# Precompiled layout of a sock_filter instruction: (code, jt, jf, k).
+BPF_INSTRUCTION = struct.Struct("HBBI")
+
 # IDs of supported L3 protocols, going through virtual interface.
 ## @var IP4_ID
 # IPv4 protocol ID on the L2 layer.
@@ -85,6 +158,66 @@ def get_mac(interface_name):
     return string[:17]
 
 
+## @var MAC_STRINGS
+# Cache of the text representations of the binary MAC addresses, filled up by the mac_to_str function.
+MAC_STRINGS = dict()
+## @var MAX_MAC_STRINGS
+# Maximum number of the cached MAC addresses. The addresses of the frames from the foreign or spoofed sources could
+# otherwise grow the cache without limit, so the addresses beyond it are converted without caching.
+MAX_MAC_STRINGS = 1024
+
+## @var MAC_WORDS
+# Struct object for splitting the binary MAC address into the first 2 and the last 4 bytes.
+MAC_WORDS = struct.Struct("!HI")
+
+
+## Convert the MAC address from the text into the binary form.
+# @param mac MAC address in "xx:xx:xx:xx:xx:xx" format.
+# @return MAC address as a 6-byte binary string.
+def mac_to_bin(mac):
+    return binascii.unhexlify(mac.replace(":", ""))
+
+
+## Convert the MAC address from the binary into the text form.
+# The result is cached, so that the conversion (used for the logging, the hashes and the external interfaces) does not
+# allocate new strings for the known addresses.
+# @param mac MAC address as a 6-byte binary string.
+# @return MAC address in "xx:xx:xx:xx:xx:xx" format.
+def mac_to_str(mac):
+    try:
+        return MAC_STRINGS[mac]
+    except KeyError:
+        string = ":".join(["%02x" % ord(byte) for byte in mac])
+        if len(MAC_STRINGS) < MAX_MAC_STRINGS:
+            MAC_STRINGS[mac] = string
+        return string
+
+
+## Compile a classic BPF program, which accepts only the frames sent from the given list of MAC addresses.
+# For each MAC address, the program compares the source address field of the Ethernet header (bytes 6-11) in two steps:
+# the first 2 bytes and the last 4 bytes. The frames with no match are dropped by the kernel.
+# @param mac_list List of MAC addresses as 6-byte binary strings.
+# @return Binary string with the array of sock_filter instructions, number of instructions.
+def compile_mac_filter(mac_list):
+    instructions = []
+    for mac in mac_list:
+        mac_high, mac_low = MAC_WORDS.unpack(mac)
+        instructions.extend([
+            (BPF_LDH_ABS, 0, 0, 6),
+            # If not equal, skip the rest of this block and go to the next MAC address
+            (BPF_JEQ_K, 0, 3, mac_high),
+            (BPF_LD_ABS, 0, 0, 8),
+            # If not equal, skip the accept instruction
+            (BPF_JEQ_K, 0, 1, mac_low),
+            (BPF_RET_K, 0, 0, BPF_ACCEPT_LENGTH)
+        ])
+
+    # Drop all other frames
+    instructions.append((BPF_RET_K, 0, 0, 0))
+
+    return b"".join([BPF_INSTRUCTION.pack(*ins) for ins in instructions]), len(instructions)
+
+
 ## Get L3 addresses from the network interface.
 # Define a static function which will return a list of ip addresses assigned to the virtual interface (in a form of:
 # [<ipv4 address>, <ipv6 address1>,  <ipv6 address2>,  <ipv6 addressN>]).
@@ -466,7 +599,8 @@ class RawTransport:
     # @param self The object pointer.
     # @param dev Name of physical network interface.
     # @param node_mac The node's own MAC address.
-    # @param topology_neighbors List of neighbors MAC addresses to be accepted if the filtering is On.
+    # @param topology_neighbors List of neighbors MAC addresses in "xx:xx:xx:xx:xx:xx" format to be accepted if the
+    # filtering is On.
     # @return None
     def __init__(self, dev, node_mac, topology_neighbors):
         ## @var send_socket
@@ -477,28 +611,66 @@ class RawTransport:
         self.send_socket.bind((dev, 0x7777))
         ## @var proto
         # Custom protocol ID on L2 layer.
-        self.proto = [0x77, 0x77]
+        self.proto = b"\x77\x77"
         ## @var node_mac
-        # The node's own MAC address.
+        # The node's own MAC address as a 6-byte binary string.
         self.node_mac = node_mac
         ## @var broadcast_mac
         # Default value of the broadcast MAC address.
-        self.broadcast_mac = "ff:ff:ff:ff:ff:ff"
+        self.broadcast_mac = b"\xff" * 6
+        ## @var eth_headers
+        # Cache of the generated ethernet headers. Format: {dst_mac: eth_header}.
+        self.eth_headers = dict()
         ## @var topology_neighbors
-        # List of neighbors MAC addresses to be accepted if the filtering is On.
-        self.topology_neighbors = topology_neighbors
+        # Set of neighbors MAC addresses (as 6-byte binary strings) to be accepted if the filtering is On.
+        self.topology_neighbors = frozenset(map(mac_to_bin, topology_neighbors))
         ## @var running
         # Thread running state bool() flag.
         self.running = True
         ## @var recv_socket
         # For receiving incoming raw frames.
         self.recv_socket = self.send_socket
+        ## @var packet_ring
+        # Transport.PacketRing object, if the frames are received via the PACKET_MMAP ring buffer. Otherwise, None.
+        self.packet_ring = None
+        ## @var pending_frames
+        # Frames of the last received batch, which haven't been returned by the RawTransport.recv_data method yet.
+        # Used only with the "mmap" receive engine.
+        self.pending_frames = deque()
+        ## @var batch_size
+        # Maximum number of frames, which are drained from the socket per single call of RawTransport.recv_data_batch.
+        self.batch_size = max(1, RECV_BATCH_SIZE)
+        ## @var batch_timeout
+        # Maximum time interval (in seconds) the first frame of a batch can be held back while the batch is collected.
+        self.batch_timeout = RECV_BATCH_TIMEOUT
         ## @var recv_data
         # Define which RawTransport.recv_data method will be used, depending on the SET_TOPOLOGY_FLAG flag value.
+        ## @var process_frame
+        # Define which RawTransport.process_frame method will be used, depending on the SET_TOPOLOGY_FLAG flag value.
         if SET_TOPOLOGY_FLAG:
             self.recv_data = self.recv_data_with_filter
+            self.process_frame = self.process_frame_with_filter
         else:
             self.recv_data = self.recv_data_no_filter
+            self.process_frame = self.process_frame_no_filter
+
+        # Drop the frames from the non-topology neighbors in the kernel, before they reach the user space.
+        # The check in RawTransport.process_frame_with_filter is still kept for the frames, which have been queued
+        # before the filter got attached.
+        if SET_TOPOLOGY_FLAG:
+            self.update_topology_neighbors(topology_neighbors)
+
+        ## @var recv_data_batch
+        # Define which RawTransport.recv_data_batch method will be used, depending on the RECV_ENGINE value.
+        if RECV_ENGINE == "mmap":
+            # The kernel retires a partially filled block after the batch timeout, which bounds the latency of the
+            # frames received at a low rate
+            self.packet_ring = PacketRing(self.recv_socket, RING_BLOCK_SIZE, RING_BLOCK_COUNT,
+                                          max(1, int(self.batch_timeout * 1000)))
+            self.recv_data_batch = self.recv_data_batch_from_ring
+            self.recv_data = self.recv_data_from_ring
+            TRANSPORT_LOG.info("Receiving the frames via PACKET_MMAP ring: %s blocks of %s bytes",
+                               RING_BLOCK_COUNT, RING_BLOCK_SIZE)
 
     ## Receive and return source mac, dsr_header and upper layer data from the interface.
     # This method listens for any incoming raw frames from the interface, and outputs the list containing a source mac,
@@ -508,27 +680,135 @@ class RawTransport:
     def recv_data(self):
         pass
 
+    ## Parse the received raw frame and return source mac, dsr_header and upper layer data from it.
+    # It is overridden in the constructor, depending on the SET_TOPOLOGY_FLAG flag value.
+    # Input: data - raw frame received from the interface, or the buffer containing the frame; offset - position of
+    # the frame in the data buffer; end - position of the frame end in the data buffer (default is the end of data).
+    # Output: [src_mac, dsr_header_obj, upper_raw_data], or None if the frame has been filtered out.
+    # @param self The object pointer.
+    def process_frame(self, data, offset=0, end=None):
+        pass
+
+    ## Receive a batch of frames from the interface.
+    # Block until the first frame arrives, then drain the frames, which are already queued in the socket, without
+    # blocking, until either RawTransport.batch_size frames have been collected, or the RawTransport.batch_timeout
+    # interval since the first frame has expired.
+    # @param self The object pointer.
+    # @return list() of [src_mac, dsr_header_obj, upper_raw_data].
+    def recv_data_batch(self):
+        frames = []
+        while self.running and not frames:
+            # Wait for the first frame of the batch
+            data = self.recv_socket.recv(65535)
+            deadline = time.time() + self.batch_timeout
+
+            while True:
+                frame = self.process_frame(data)
+                if frame is not None:
+                    frames.append(frame)
+
+                if len(frames) >= self.batch_size or time.time() > deadline:
+                    break
+
+                try:
+                    data = self.recv_socket.recv(65535, socket.MSG_DONTWAIT)
+                # No more frames are queued in the socket at the moment
+                except socket.error:
+                    break
+
+        return frames
+
+    ## Receive a batch of frames from the PACKET_MMAP ring buffer.
+    # Wait until the kernel releases the next block of the ring, and parse all the frames of the block directly from
+    # the mapped memory. Only the upper layer data of each frame is copied out of the ring.
+    # @param self The object pointer.
+    # @return list() of [src_mac, dsr_header_obj, upper_raw_data].
+    def recv_data_batch_from_ring(self):
+        frames = []
+        while self.running and not frames:
+            frame_positions = self.packet_ring.read_block(RING_POLL_TIMEOUT)
+            if frame_positions is None:
+                continue
+
+            try:
+                for offset, end in frame_positions:
+                    frame = self.process_frame(self.packet_ring.ring, offset, end)
+                    if frame is not None:
+                        frames.append(frame)
+            finally:
+                # Hand the block back to the kernel
+                self.packet_ring.release_block()
+
+        return frames
+
+    ## Receive and return a single frame, if the frames are received from the PACKET_MMAP ring buffer.
+    # @param self The object pointer.
+    # @return [src_mac, dsr_header_obj, upper_raw_data].
+    def recv_data_from_ring(self):
+        while self.running and not self.pending_frames:
+            self.pending_frames.extend(self.recv_data_batch_from_ring())
+
+        if self.pending_frames:
+            return self.pending_frames.popleft()
+
+    ## Update the list of topology neighbors, and attach the corresponding BPF filter to the raw socket.
+    # Attaching a new filter atomically replaces the previous one. If the filter is too large for the kernel, the
+    # previous one is detached, so that the frames of the new neighbors are not dropped by it.
+    # @param self The object pointer.
+    # @param topology_neighbors List of neighbors MAC addresses in "xx:xx:xx:xx:xx:xx" format to be accepted.
+    # @return None
+    def update_topology_neighbors(self, topology_neighbors):
+        self.topology_neighbors = frozenset(map(mac_to_bin, topology_neighbors))
+
+        program, length = compile_mac_filter(self.topology_neighbors)
+        if length > BPF_MAX_INSTRUCTIONS:
+            TRANSPORT_LOG.warning("Too many topology neighbors for the kernel filter: %s. "
+                                  "Filtering the frames in the user space only.", len(self.topology_neighbors))
+            try:
+                self.recv_socket.setsockopt(socket.SOL_SOCKET, SO_DETACH_FILTER, 0)
+            except socket.error:
+                # No filter has been attached to the socket yet
+                pass
+            return None
+
+        # Fill up the sock_fprog structure: number of instructions and a pointer to the instructions array
+        program_buffer = ctypes.create_string_buffer(program, len(program))
+        sock_fprog = struct.pack("HL", length, ctypes.addressof(program_buffer))
+        self.recv_socket.setsockopt(socket.SOL_SOCKET, SO_ATTACH_FILTER, sock_fprog)
+        TRANSPORT_LOG.info("Attached the kernel filter for the topology neighbors: %s",
+                           map(mac_to_str, self.topology_neighbors))
+
     ## Send raw frame to the network.
     # @param self The object pointer.
-    # @param dst_mac Destination MAC address.
+    # @param dst_mac Destination MAC address as a 6-byte binary string.
     # @param dsr_message Message object from Messages module.
     # @param payload User/Service payload after the protocol's header.
     # @return None
     def send_raw_frame(self, dst_mac, dsr_message, payload):
-        eth_header = self.gen_eth_header(self.node_mac, dst_mac)
         # Pack the initial dsr_message object and get the dsr_binary_header from it
-        dsr_bin_header = Messages.pack_message(dsr_message)
+        self.send_packed_frame(dst_mac, Messages.pack_message(dsr_message), payload)
+
+    ## Send raw frame with the already packed dsr header to the network.
+    # @param self The object pointer.
+    # @param dst_mac Destination MAC address as a 6-byte binary string.
+    # @param dsr_bin_header Packed dsr header in binary string (or bytearray) representation.
+    # @param payload User/Service payload after the protocol's header.
+    # @return None
+    def send_packed_frame(self, dst_mac, dsr_bin_header, payload):
+        try:
+            eth_header = self.eth_headers[dst_mac]
+        except KeyError:
+            eth_header = self.gen_eth_header(self.node_mac, dst_mac)
+            self.eth_headers[dst_mac] = eth_header
         self.send_socket.send(eth_header + dsr_bin_header + payload)
 
     ## Generate ethernet header.
     # @param self The object pointer.
-    # @param src_mac Source MAC address.
-    # @param dst_mac Destination MAC address.
+    # @param src_mac Source MAC address as a 6-byte binary string.
+    # @param dst_mac Destination MAC address as a 6-byte binary string.
     # @return Ethernet header in binary string representation.
     def gen_eth_header(self, src_mac, dst_mac):
-        src = [int(x, 16) for x in src_mac.split(":")]
-        dst = [int(x, 16) for x in dst_mac.split(":")]
-        return b"".join(map(chr, dst + src + self.proto))
+        return dst_mac + src_mac + self.proto
 
     ## Receive frames with filtering.
     # Receive and return source mac, dsr_header and upper layer data from the interface, filter out the mac addresses,
@@ -539,32 +819,10 @@ class RawTransport:
         while self.running:
             # Receive raw frame from the interface
             data = self.recv_socket.recv(65535)
+            frame = self.process_frame_with_filter(data)
 
-            # ## Filtering the mac addresses according to the given topology ## #
-            # Get a src_mac address from the frame
-            src_mac = self.get_src_mac(data[:14])
-
-            # Check if the mac in the list of topology_neighbors. If not - just drop it.
-            if src_mac in self.topology_neighbors:
-                # Get and return dsr_header object and upper layer raw data
-                # Create dsr_header object
-                TRANSPORT_LOG.debug("SRC_MAC from the received frame: %s", src_mac)
-
-                # 56 bytes is the maximum possible length of DSR header.
-                # Skip first 14 bytes since this is Ethernet header fields.
-                dsr_header_obj, dsr_header_length = Messages.unpack_message(data[14: 14 + 56])
-
-                # Get upper raw data
-                upper_raw_data = data[(14 + dsr_header_length):]
-
-                return src_mac, dsr_header_obj, upper_raw_data
-
-            elif src_mac == self.node_mac:
-                TRANSPORT_LOG.debug("!!! THIS IS MY OWN MAC, YOBBA !!! %s", src_mac)
-
-            # Else, do nothing with the received frame
-            else:
-                TRANSPORT_LOG.debug("!!! THIS MAC HAS BEEN FILTERED !!! %s", src_mac)
+            if frame is not None:
+                return frame
 
     ## Receive all frames without filtering.
     # Receive and return source mac, dsr_header and upper layer data from the interface from ANY mac address without
@@ -575,43 +833,96 @@ class RawTransport:
         while self.running:
             # Receive raw frame from the interface
             data = self.recv_socket.recv(65535)
+            frame = self.process_frame_no_filter(data)
+
+            if frame is not None:
+                return frame
 
-            # Get a src_mac address from the frame
-            src_mac = self.get_src_mac(data[:14])
+    ## Parse the received frame with filtering.
+    # Filter out the mac addresses, which are not in the RawTransport.topology_neighbors list.
+    # @param self The object pointer.
+    # @param data Raw frame received from the interface, or the buffer containing the frame.
+    # @param offset Position of the frame in the data buffer. Default is 0.
+    # @param end Position of the frame end in the data buffer. Default is the end of data.
+    # @return [src_mac, dsr_header_obj, upper_raw_data], or None if the frame has been filtered out, or has an unknown
+    # type.
+    def process_frame_with_filter(self, data, offset=0, end=None):
+        # ## Filtering the mac addresses according to the given topology ## #
+        # Get a src_mac address from the frame
+        src_mac = data[offset + 6: offset + 12]
+
+        # Check if the mac in the list of topology_neighbors. If not - just drop it.
+        if src_mac in self.topology_neighbors:
+            # Get and return dsr_header object and upper layer raw data
+            # Create dsr_header object
+            if TRANSPORT_LOG.debug_enabled:
+                TRANSPORT_LOG.debug("SRC_MAC from the received frame: %s", mac_to_str(src_mac))
+
+            # Skip first 14 bytes since this is Ethernet header fields.
+            # The header is parsed directly from the data, without copying it out.
+            unpacked_message = Messages.unpack_message(data, offset + 14)
+            if unpacked_message is None:
+                TRANSPORT_LOG.warning("Unknown DSR type of the frame from %s! Dropping the frame...",
+                                      mac_to_str(src_mac))
+                return None
+            dsr_header_obj, dsr_header_length = unpacked_message
+
+            # Get upper raw data
+            upper_raw_data = data[(offset + 14 + dsr_header_length):end]
+
+            return src_mac, dsr_header_obj, upper_raw_data
+
+        elif src_mac == self.node_mac:
+            if TRANSPORT_LOG.debug_enabled:
+                TRANSPORT_LOG.debug("!!! THIS IS MY OWN MAC, YOBBA !!! %s", mac_to_str(src_mac))
+
+        # Else, do nothing with the received frame
+        elif TRANSPORT_LOG.debug_enabled:
+            TRANSPORT_LOG.debug("!!! THIS MAC HAS BEEN FILTERED !!! %s", mac_to_str(src_mac))
 
-            if src_mac == self.node_mac:
-                # This situation normally is not supposed to happen.
-                # Otherwise, it would mean that there are two or more nodes with the same MAC address, which is bad.
-                TRANSPORT_LOG.error("!!! THIS IS MY OWN MAC, YOBBA !!! %s", src_mac)
+        return None
 
-            # Else, return the data
-            else:
-                # Get and return dsr_header object and upper layer raw data
-                # Create dsr_header object
-                TRANSPORT_LOG.debug("SRC_MAC from the received frame: %s", src_mac)
-                # Skip first 14 bytes since this is Ethernet header fields.
-                dsr_header_obj, dsr_header_length = Messages.unpack_message(data[14: 14 + 56])
+    ## Parse the received frame without filtering.
+    # Accept the frames from ANY mac address, except the node's own one.
+    # @param self The object pointer.
+    # @param data Raw frame received from the interface, or the buffer containing the frame.
+    # @param offset Position of the frame in the data buffer. Default is 0.
+    # @param end Position of the frame end in the data buffer. Default is the end of data.
+    # @return [src_mac, dsr_header_obj, upper_raw_data], or None if the frame has been sent by the node itself, or has
+    # an unknown type.
+    def process_frame_no_filter(self, data, offset=0, end=None):
+        # Get a src_mac address from the frame
+        src_mac = data[offset + 6: offset + 12]
+
+        if src_mac == self.node_mac:
+            # This situation normally is not supposed to happen.
+            # Otherwise, it would mean that there are two or more nodes with the same MAC address, which is bad.
+            TRANSPORT_LOG.error("!!! THIS IS MY OWN MAC, YOBBA !!! %s", mac_to_str(src_mac))
+            return None
+
+        # Get and return dsr_header object and upper layer raw data
+        # Create dsr_header object
+        if TRANSPORT_LOG.debug_enabled:
+            TRANSPORT_LOG.debug("SRC_MAC from the received frame: %s", mac_to_str(src_mac))
+        # Skip first 14 bytes since this is Ethernet header fields.
+        # The header is parsed directly from the data, without copying it out.
+        unpacked_message = Messages.unpack_message(data, offset + 14)
+        if unpacked_message is None:
+            TRANSPORT_LOG.warning("Unknown DSR type of the frame from %s! Dropping the frame...", mac_to_str(src_mac))
+            return None
+        dsr_header_obj, dsr_header_length = unpacked_message
 
-                # Get upper raw data
-                upper_raw_data = data[(14 + dsr_header_length):]
+        # Get upper raw data
+        upper_raw_data = data[(offset + 14 + dsr_header_length):end]
 
-                return src_mac, dsr_header_obj, upper_raw_data
+        return src_mac, dsr_header_obj, upper_raw_data
 
     ## Get source MAC address from the given ethernet header.
     # @param self The object pointer.
     # @param eth_header Ethernet header in binary representation.
-    # @return MAC address in "xx:xx:xx:xx:xx:xx" format.
+    # @return MAC address as a 6-byte binary string.
     def get_src_mac(self, eth_header):
-        src_mac = ""
-        data = struct.unpack("!6B", eth_header[6:12])
-
-        for i in data:
-            byte = str(hex(i))[2:]
-            if len(byte) == 1:
-                byte = "0" + byte
-            src_mac = src_mac + byte + ":"
-        
-        return src_mac[:-1]
+        return eth_header[6:12]
 
     ## Stop reading from the receiving socket and close it.
     # @param self The object pointer.
@@ -620,3 +931,72 @@ class RawTransport:
         self.running = False
         self.recv_socket.close()
         TRANSPORT_LOG.info("Raw socket closed")
+
+
+## Class for receiving the frames through a PACKET_MMAP (TPACKET_V3) ring buffer.
+# The kernel writes the received frames one after another into the blocks of the ring, which is mapped into the process
+# memory. A block is handed over to the user space when it is full, or when its retire timeout has expired, so that all
+# the frames of the block can be read without any syscalls and copies.
+class PacketRing:
+    ## Constructor.
+    # @param self The object pointer.
+    # @param sock AF_PACKET socket the ring should be attached to.
+    # @param block_size Size of a single block in bytes. Must be a multiple of the page size.
+    # @param block_count Number of blocks in the ring.
+    # @param block_timeout Timeout (in milliseconds) after which the kernel retires a partially filled block.
+    # @return None
+    def __init__(self, sock, block_size, block_count, block_timeout):
+        sock.setsockopt(SOL_PACKET, PACKET_VERSION, TPACKET_V3)
+        # Fill up the tpacket_req3 structure: block_size, block_nr, frame_size, frame_nr, retire_blk_tov,
+        # sizeof_priv, feature_req_word
+        frame_count = (block_size / RING_FRAME_SIZE) * block_count
+        tpacket_req3 = struct.pack("IIIIIII", block_size, block_count, RING_FRAME_SIZE, frame_count,
+                                   block_timeout, 0, 0)
+        sock.setsockopt(SOL_PACKET, PACKET_RX_RING, tpacket_req3)
+        ## @var ring
+        # Memory-mapped ring buffer.
+        self.ring = mmap.mmap(sock.fileno(), block_size * block_count, mmap.MAP_SHARED,
+                              mmap.PROT_READ | mmap.PROT_WRITE)
+        ## @var block_size
+        # Size of a single block in bytes.
+        self.block_size = block_size
+        ## @var block_count
+        # Number of blocks in the ring.
+        self.block_count = block_count
+        ## @var current_block
+        # Index of the block, which is expected to be released by the kernel next.
+        self.current_block = 0
+        ## @var poller
+        # Poll object for waiting until a block is released by the kernel.
+        self.poller = select.poll()
+        self.poller.register(sock.fileno(), select.POLLIN | select.POLLERR)
+
+    ## Wait until the current block is released by the kernel, and return the positions of its frames.
+    # @param self The object pointer.
+    # @param timeout Maximum waiting time in milliseconds.
+    # @return list() of (frame_offset, frame_end) positions in PacketRing.ring, or None if no block is ready yet.
+    def read_block(self, timeout):
+        block_offset = self.current_block * self.block_size
+        block_status, num_pkts, offset_to_first_pkt = BLOCK_HEADER.unpack_from(self.ring, block_offset + 8)
+
+        if not block_status & TP_STATUS_USER:
+            self.poller.poll(timeout)
+            return None
+
+        frame_positions = []
+        frame_header_offset = block_offset + offset_to_first_pkt
+        for _ in xrange(num_pkts):
+            next_offset, _sec, _nsec, snaplen, _len, _status, mac_offset, _net_offset = \
+                FRAME_HEADER.unpack_from(self.ring, frame_header_offset)
+            frame_offset = frame_header_offset + mac_offset
+            frame_positions.append((frame_offset, frame_offset + snaplen))
+            frame_header_offset += next_offset
+
+        return frame_positions
+
+    ## Hand the current block back to the kernel, and move to the next block of the ring.
+    # @param self The object pointer.
+    # @return None
+    def release_block(self):
+        struct.pack_into("I", self.ring, self.current_block * self.block_size + 8, TP_STATUS_KERNEL)
+        self.current_block = (self.current_block + 1) % self.block_count
@@ -0,0 +1,132 @@
+#!/usr/bin/python
+"""
+@package bench_convergence
+Created on Oct 16, 2026
+
+@author: Dmitrii Dugaev
+
+
+Convergence benchmark of the protocol on the in-process emulated network (see Emulator module).
+The nodes are connected in a ring, so there are two paths between the source node and the destination node on the
+opposite side of the ring. The benchmark measures:
+    discovery  - the time until all the nodes have discovered their neighbors;
+    first      - the time until the first packet to the destination is delivered, including the path discovery;
+    before     - the delivery ratio of the constant rate traffic over the ring;
+    after      - the delivery ratio after one of the links of the ring has been broken;
+    recovery   - the time after the link break, until the delivery ratio over the last RECOVERY_WINDOW packets is
+                 back to 90% of the ratio before the break.
+
+Usage: python benchmarks/bench_convergence.py [nodes] [loss]
+The log files are written to the directory from the ADHOC_ROUTING_LOG_DIR environment variable, or to a temporary one.
+"""
+
+# Import necessary python modules from the standard library
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("ADHOC_ROUTING_LOG_DIR", tempfile.mkdtemp(prefix="adhoc_routing_"))
+
+# Import the necessary modules of the program
+import Emulator
+
+## @var NODES
+# Default number of nodes in the ring.
+NODES = 6
+## @var LOSS
+# Default loss probability of the links.
+LOSS = 0.05
+## @var DELAY
+# Delay (in seconds) of the links.
+DELAY = 0.002
+## @var HELLO_INTERVAL
+# Time interval (in seconds) between the HELLO messages of the nodes.
+HELLO_INTERVAL = 0.5
+## @var PACKET_INTERVAL
+# Time interval (in seconds) between the packets of the traffic.
+PACKET_INTERVAL = 0.01
+## @var PHASE_PACKETS
+# Number of packets sent before and after the link break.
+PHASE_PACKETS = 500
+## @var RECOVERY_WINDOW
+# Number of the last packets, which the delivery ratio is calculated over, while waiting for the recovery.
+RECOVERY_WINDOW = 50
+
+
+## Send the numbered packets at a constant rate, and wait for the packets in flight.
+# @param src Source Emulator.EmulatedNode object.
+# @param dst Destination Emulator.EmulatedNode object.
+# @param first Number of the first packet.
+# @param count Number of packets.
+# @return list() of the send timestamps of the packets.
+def send_packets(src, dst, first, count):
+    timestamps = list()
+    for number in xrange(first, first + count):
+        timestamps.append(time.time())
+        src.send(dst.ip, str(number))
+        time.sleep(PACKET_INTERVAL)
+    # Wait for the packets in flight
+    time.sleep(10 * DELAY + 0.5)
+    return timestamps
+
+
+## Run the benchmark and print out the results.
+# @param node_count Number of nodes in the ring.
+# @param loss Loss probability of the links.
+# @return None
+def main(node_count, loss):
+    network = Emulator.Network(seed=1)
+    nodes = [network.add_node(HELLO_INTERVAL) for _ in xrange(node_count)]
+    for i in xrange(node_count):
+        network.connect(nodes[i], nodes[(i + 1) % node_count], loss, DELAY)
+    src, dst = nodes[0], nodes[node_count // 2]
+
+    delivered = set()
+    arrivals = dict()
+
+    def receive(packet):
+        number = int(Emulator.get_udp_payload(packet))
+        delivered.add(number)
+        arrivals.setdefault(number, time.time())
+    dst.app_transport.receive_callback = receive
+
+    start = time.time()
+    network.start()
+    try:
+        discovered = network.wait_for_neighbors(30)
+        discovery = time.time() - start
+
+        # The first packet triggers the path discovery
+        timestamps = send_packets(src, dst, 0, PHASE_PACKETS)
+        first = min(arrivals.values()) - timestamps[0] if arrivals else None
+        before = float(len(delivered)) / PHASE_PACKETS
+
+        # Break the first link of the path, which the source uses most of all
+        next_hop = max([nodes[1], nodes[-1]], key=lambda node: src.table.get_entry(dst.ip).get(node.mac, 0.0))
+        network.disconnect(src, next_hop)
+        break_time = time.time()
+        timestamps = send_packets(src, dst, PHASE_PACKETS, PHASE_PACKETS)
+        after = float(len([n for n in delivered if n >= PHASE_PACKETS])) / PHASE_PACKETS
+
+        recovery = None
+        for i in xrange(RECOVERY_WINDOW, PHASE_PACKETS + 1):
+            window = range(PHASE_PACKETS + i - RECOVERY_WINDOW, PHASE_PACKETS + i)
+            if float(len([n for n in window if n in delivered])) / RECOVERY_WINDOW >= 0.9 * before:
+                recovery = timestamps[i - 1] - break_time
+                break
+    finally:
+        network.stop()
+
+    print "Nodes: %d, loss: %.2f, delay: %.3f s, HELLO interval: %.2f s" % (node_count, loss, DELAY, HELLO_INTERVAL)
+    print "discovery: %.2f s%s" % (discovery, "" if discovered else " (not completed)")
+    print "first:     %s" % ("not delivered" if first is None else "%.3f s" % first)
+    print "before:    %.1f %%" % (before * 100)
+    print "after:     %.1f %%" % (after * 100)
+    print "recovery:  %s" % ("not recovered" if recovery is None else "%.2f s" % recovery)
+    print "frames:    %s, lost: %d" % (network.get_frame_counts(), network.lost_frames)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else NODES, float(sys.argv[2]) if len(sys.argv) > 2 else LOSS)
@@ -0,0 +1,282 @@
+#!/usr/bin/python
+"""
+@package bench_end_to_end
+Created on Oct 16, 2026
+
+@author: Dmitrii Dugaev
+
+
+End-to-end benchmark of the forwarding chain of the program on the in-process emulated network (see Emulator module).
+The packets go the whole way of the real traffic: from the virtual interface of the source node into
+DataHandler.AppHandler.process_packet, then as the raw frames over the emulated links into the
+DataHandler.IncomingTrafficHandler of each node of the chain, until they are sent to the virtual interface of the
+destination node. The nodes are connected in a line, and the benchmark is run over the chains of HOP_COUNTS hops, each
+with the unreliable (DEFAULT_PORT) and the reliable (ARQ_PORT, see conf.ARQ_LIST) traffic. The links have no loss and
+no delay, so only the processing time of the program itself is measured. For each run the benchmark reports:
+    pps           - the delivered packets per second of the back-to-back burst of THROUGHPUT_PACKETS packets;
+    hop_pps       - the forwarded packets per second over all the hops of the chain (pps * hops);
+    p50/p99       - the median and the 99th percentile of the per-hop latency (the end-to-end latency / hops) of the
+                    LATENCY_PACKETS packets, sent one by one with LATENCY_INTERVAL between them;
+    control_ratio - the number of the control frames (HELLO, ACK, REWARD, RREQ, RREP, SACK, CONTROL) to the number of
+                    the data frames, sent by all the nodes during the run;
+    peak_threads  - the maximum number of the running threads, sampled every THREAD_SAMPLE_INTERVAL.
+The results, together with the commit ID, the parameters and the relevant settings of conf module, are dumped in JSON,
+so the runs over different commits can be compared. The routes are discovered before the measurements, and the random
+generators are seeded, but the results still depend on the thread scheduling of the machine.
+
+Usage: python benchmarks/bench_end_to_end.py [output_file]
+The JSON results are written to the output file, if given, or to the standard output.
+The log files are written to the directory from the ADHOC_ROUTING_LOG_DIR environment variable, or to a temporary one.
+"""
+
+# Import necessary python modules from the standard library
+import os
+import sys
+import json
+import time
+import random
+import struct
+import platform
+import tempfile
+import threading
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("ADHOC_ROUTING_LOG_DIR", tempfile.mkdtemp(prefix="adhoc_routing_"))
+
+# Import the necessary modules of the program
+import conf
+import Emulator
+
+## @var HOP_COUNTS
+# Numbers of hops of the chains to run the benchmark over.
+HOP_COUNTS = [1, 2, 4]
+## @var ARQ_PORT
+# UDP port of the reliable traffic, which must be in conf.ARQ_LIST.
+ARQ_PORT = 30000
+## @var FLOWS
+# Traffic flows to run the benchmark with. Format: [(name, UDP port)].
+FLOWS = [("unreliable", Emulator.DEFAULT_PORT), ("reliable", ARQ_PORT)]
+## @var HELLO_INTERVAL
+# Time interval (in seconds) between the HELLO messages of the nodes.
+HELLO_INTERVAL = 0.5
+## @var THROUGHPUT_PACKETS
+# Number of packets in the back-to-back burst of the throughput measurement.
+THROUGHPUT_PACKETS = 2000
+## @var LATENCY_PACKETS
+# Number of packets of the latency measurement.
+LATENCY_PACKETS = 500
+## @var LATENCY_INTERVAL
+# Time interval (in seconds) between the packets of the latency measurement.
+LATENCY_INTERVAL = 0.002
+## @var PAYLOAD_SIZE
+# Size of the UDP payload of the packets, in bytes.
+PAYLOAD_SIZE = 512
+## @var DELIVERY_TIMEOUT
+# Maximum waiting time (in seconds) for the packets in flight after each measurement.
+DELIVERY_TIMEOUT = 10
+## @var THREAD_SAMPLE_INTERVAL
+# Time interval (in seconds) between the samples of the number of the running threads.
+THREAD_SAMPLE_INTERVAL = 0.01
+## @var SEED
+# Seed of the random generators.
+SEED = 1
+## @var PAYLOAD_HEADER
+# Header of the UDP payload of the packets: sequence number, send timestamp.
+PAYLOAD_HEADER = struct.Struct("!Id")
+## @var DATA_TYPES
+# DSR types of the data frames: unicast, broadcast, reliable and windowed data packets.
+DATA_TYPES = [0, 1, 9, 10]
+## @var CONTROL_TYPES
+# Names of the DSR types of the control frames. Format: {dsr_type: name}.
+CONTROL_TYPES = {2: "RREQ", 3: "RREQ", 4: "RREP", 5: "RREP", 6: "HELLO", 7: "ACK", 8: "REWARD", 11: "SACK",
+                 12: "CONTROL"}
+## @var CONF_SETTINGS
+# Settings of conf module, which affect the results, and are stored along with them.
+CONF_SETTINGS = ["LOG_LEVEL", "ENABLE_ARQ", "ARQ_MODE", "ARQ_WINDOW_SIZE", "CONTROL_AGGREGATION_FLAG",
+                 "FAST_HASH_FLAG", "VALUE_BACKEND", "VALUE_ESTIMATION_METHOD", "SELECTION_METHOD", "RECV_BATCH_SIZE",
+                 "TIMER_TICK_INTERVAL"]
+
+
+## Class for sampling the number of the running threads in the background.
+class ThreadSampler(threading.Thread):
+    ## Constructor.
+    # @param self The object pointer.
+    # @return None
+    def __init__(self):
+        super(ThreadSampler, self).__init__()
+        self.daemon = True
+        ## @var running
+        # Thread running state bool() flag.
+        self.running = False
+        ## @var peak
+        # Maximum sampled number of the running threads.
+        self.peak = threading.active_count()
+
+    ## Main thread routine.
+    # @param self The object pointer.
+    # @return None
+    def run(self):
+        self.running = True
+        while self.running:
+            self.peak = max(self.peak, threading.active_count())
+            time.sleep(THREAD_SAMPLE_INTERVAL)
+
+    ## Stop and quit the thread operation.
+    # @param self The object pointer.
+    # @return None
+    def quit(self):
+        self.running = False
+        self.join()
+
+
+## Get the value of the given percentile of the samples, by the nearest-rank method.
+# @param samples Sorted list of the samples.
+# @param percentile Percentile, from 0 to 100.
+# @return The value, or None if there are no samples.
+def get_percentile(samples, percentile):
+    if not samples:
+        return None
+    return samples[max(0, min(len(samples) - 1, int(round(percentile / 100.0 * len(samples))) - 1))]
+
+
+## Get the ID of the current commit of the repository.
+# @return Commit ID string, or None if it is unavailable.
+def get_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                       stderr=open(os.devnull, "w")).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+## Send the numbered packets from the source node to the destination node.
+# @param src Source Emulator.EmulatedNode object.
+# @param dst Destination Emulator.EmulatedNode object.
+# @param port UDP port of the packets.
+# @param first Number of the first packet.
+# @param count Number of packets.
+# @param interval Time interval (in seconds) between the packets, or 0 for the back-to-back burst.
+# @return None
+def send_packets(src, dst, port, first, count, interval):
+    padding = "\x00" * (PAYLOAD_SIZE - PAYLOAD_HEADER.size)
+    for number in xrange(first, first + count):
+        src.send(dst.ip, PAYLOAD_HEADER.pack(number, time.time()) + padding, port, port)
+        if interval:
+            time.sleep(interval)
+
+
+## Wait until all the packets in the given range are delivered, or the timeout expires.
+# @param arrivals dict() with the arrival times of the delivered packets: {number: (send time, arrival time)}.
+# @param first Number of the first packet.
+# @param count Number of packets.
+# @return None
+def wait_for_packets(arrivals, first, count):
+    deadline = time.time() + DELIVERY_TIMEOUT
+    while time.time() < deadline and len([n for n in xrange(first, first + count) if n in arrivals]) < count:
+        time.sleep(0.01)
+
+
+## Run the benchmark over a single chain with a single flow.
+# @param hops Number of hops of the chain.
+# @param port UDP port of the flow.
+# @return dict() with the results.
+def run_chain(hops, port):
+    random.seed(SEED)
+    network = Emulator.Network(seed=SEED)
+    nodes = [network.add_node(HELLO_INTERVAL) for _ in xrange(hops + 1)]
+    for i in xrange(hops):
+        network.connect(nodes[i], nodes[i + 1])
+    src, dst = nodes[0], nodes[-1]
+
+    arrivals = dict()
+
+    def receive(packet):
+        number, timestamp = PAYLOAD_HEADER.unpack_from(Emulator.get_udp_payload(packet))
+        arrivals.setdefault(number, (timestamp, time.time()))
+    dst.app_transport.receive_callback = receive
+
+    sampler = ThreadSampler()
+    sampler.start()
+    network.start()
+    try:
+        network.wait_for_neighbors(30)
+        # The first packet triggers the path discovery
+        send_packets(src, dst, port, 0, 1, 0)
+        wait_for_packets(arrivals, 0, 1)
+
+        # The latency is measured first, so the paced packets are not queued behind the burst
+        first = 1
+        send_packets(src, dst, port, first, LATENCY_PACKETS, LATENCY_INTERVAL)
+        wait_for_packets(arrivals, first, LATENCY_PACKETS)
+        latencies = sorted([(arrivals[n][1] - arrivals[n][0]) / hops
+                            for n in xrange(first, first + LATENCY_PACKETS) if n in arrivals])
+
+        first += LATENCY_PACKETS
+        start = time.time()
+        send_packets(src, dst, port, first, THROUGHPUT_PACKETS, 0)
+        wait_for_packets(arrivals, first, THROUGHPUT_PACKETS)
+        burst = [arrivals[n][1] for n in xrange(first, first + THROUGHPUT_PACKETS) if n in arrivals]
+        pps = len(burst) / (max(burst) - start) if burst else 0.0
+    finally:
+        network.stop()
+        sampler.quit()
+
+    frame_counts = network.get_frame_counts()
+    control_frames = dict([(name, 0) for name in set(CONTROL_TYPES.values())])
+    for dsr_type, name in CONTROL_TYPES.items():
+        control_frames[name] += frame_counts.get(dsr_type, 0)
+    data_frames = sum([frame_counts.get(dsr_type, 0) for dsr_type in DATA_TYPES])
+
+    return {"hops": hops,
+            "port": port,
+            "delivered": len(arrivals),
+            "sent": 1 + THROUGHPUT_PACKETS + LATENCY_PACKETS,
+            "pps": round(pps, 1),
+            "hop_pps": round(pps * hops, 1),
+            "p50_hop_latency": get_percentile(latencies, 50),
+            "p99_hop_latency": get_percentile(latencies, 99),
+            "data_frames": data_frames,
+            "control_frames": control_frames,
+            "control_ratio": round(float(sum(control_frames.values())) / data_frames, 4) if data_frames else None,
+            "peak_threads": sampler.peak}
+
+
+## Run the benchmark and dump the results.
+# @param output_file Path to the output JSON file, or None for the standard output.
+# @return None
+def main(output_file):
+    results = {"commit": get_commit(),
+               "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+               "python": platform.python_version(),
+               "parameters": {"hello_interval": HELLO_INTERVAL,
+                              "throughput_packets": THROUGHPUT_PACKETS,
+                              "latency_packets": LATENCY_PACKETS,
+                              "latency_interval": LATENCY_INTERVAL,
+                              "payload_size": PAYLOAD_SIZE,
+                              "seed": SEED},
+               "conf": dict([(name, getattr(conf, name, None)) for name in CONF_SETTINGS]),
+               "runs": dict()}
+    for name, port in FLOWS:
+        results["runs"][name] = [run_chain(hops, port) for hops in HOP_COUNTS]
+
+    if output_file is None:
+        print json.dumps(results, indent=4, sort_keys=True)
+        return
+
+    with open(output_file, "w") as f:
+        json.dump(results, f, indent=4, sort_keys=True)
+
+    print "%12s %6s %10s %10s %10s %14s %14s %14s %8s" % ("flow", "hops", "delivered", "pps", "hop_pps",
+                                                           "p50, ms/hop", "p99, ms/hop", "control/data", "threads")
+    for name, _ in FLOWS:
+        for run in results["runs"][name]:
+            p50, p99 = run["p50_hop_latency"], run["p99_hop_latency"]
+            print "%12s %6d %10s %10.1f %10.1f %14s %14s %14s %8d" % (
+                name, run["hops"], "%d/%d" % (run["delivered"], run["sent"]), run["pps"], run["hop_pps"],
+                "-" if p50 is None else "%.3f" % (p50 * 1000), "-" if p99 is None else "%.3f" % (p99 * 1000),
+                run["control_ratio"], run["peak_threads"])
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -0,0 +1,149 @@
+#!/usr/bin/python
+"""
+@package bench_estimators
+Created on Oct 16, 2026
+
+@author: Dmitrii Dugaev
+
+
+Benchmark of the value estimation methods of the route table on a replayable reward trace.
+A node sends the packets towards a single destination via one of its direct neighbors, selected by the real
+RouteTable.Table. Each neighbor delivers the packet with the probability of its link quality, and the quality of the
+links changes in the middle of the trace: the best link degrades, and one of the worse links becomes the best one.
+A delivered packet gets the reward of DELIVERED_REWARD, a lost one - the "bad" reward of 0, as on the reward wait
+timeout. The trace (the link qualities and the uniform draws of the deliveries and of the selections) is generated from
+a seed, and can be saved to, and loaded from a JSON file, so all the methods are compared on exactly the same input.
+For each of the estimation methods ("sample_average", "ewma", "window") the benchmark reports the delivery ratio before
+and after the topology change, and the convergence time - the number of packets after the change, until the entry's
+best valued neighbor becomes the new best link for the rest of the trace.
+
+Usage: python benchmarks/bench_estimators.py [trace_file]
+If the trace file exists, the trace is loaded from it. Otherwise, a new trace is generated, and saved to the file.
+"""
+
+# Import necessary python modules from the standard library
+import os
+import sys
+import json
+import random
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("ADHOC_ROUTING_LOG_DIR", tempfile.mkdtemp(prefix="adhoc_routing_"))
+
+# Import the necessary modules of the program
+import RouteTable
+
+## @var METHODS
+# Estimation methods to run the benchmark with.
+METHODS = ["sample_average", "ewma", "window"]
+## @var DST_IP
+# Destination IP address of the route.
+DST_IP = "10.0.0.1"
+## @var DELIVERED_REWARD
+# Reward value of a delivered packet.
+DELIVERED_REWARD = 100
+## @var PACKETS
+# Default number of packets in the trace.
+PACKETS = 4000
+## @var SEED
+# Default seed of the trace.
+SEED = 1
+## @var LINK_QUALITIES
+# Default delivery probabilities of the links, before and after the topology change.
+LINK_QUALITIES = [[0.9, 0.6, 0.5, 0.3],
+                  [0.2, 0.6, 0.5, 0.9]]
+
+
+## A stub of NeighborDiscovery.Neighbor.
+class Neighbor:
+    ## Constructor.
+    # @param self The object pointer.
+    # @param mac MAC address of the neighbor, as a 6-byte binary string.
+    # @return None
+    def __init__(self, mac):
+        self.mac = mac
+        self.l3_addresses = list()
+
+
+## Generate a new reward trace.
+# @param packets Number of packets in the trace.
+# @param seed Seed of the random generator.
+# @return Dictionary with the trace.
+def generate_trace(packets=PACKETS, seed=SEED):
+    generator = random.Random(seed)
+    return {"seed": seed,
+            "change": packets // 2,
+            "qualities": LINK_QUALITIES,
+            "draws": [round(generator.random(), 6) for _ in xrange(packets)]}
+
+
+## Load the trace from the file, or generate a new one and save it to the file.
+# @param trace_file Path to the trace file, or None.
+# @return Dictionary with the trace.
+def get_trace(trace_file):
+    if trace_file is not None and os.path.exists(trace_file):
+        with open(trace_file) as f:
+            return json.load(f)
+    trace = generate_trace()
+    if trace_file is not None:
+        with open(trace_file, "w") as f:
+            json.dump(trace, f)
+    return trace
+
+
+## Replay the trace on a new route table with the given estimation method.
+# @param trace Dictionary with the trace.
+# @param est_method_id Estimation method of the route table.
+# @return Tuple of (delivery ratio before the change, delivery ratio after the change, convergence time).
+def replay(trace, est_method_id):
+    # The selections are driven by the seed of the trace, so the replays are reproducible
+    random.seed(trace["seed"])
+    table = RouteTable.Table("\x00" * 6, est_method_id)
+    macs = ["\x02\x00\x00\x00\x00" + chr(i) for i in xrange(len(trace["qualities"][0]))]
+    for mac in macs:
+        table.add_neighbor(Neighbor(mac))
+    # Create the entry with the initial zero values of all the neighbors
+    table.neighbors_lock.acquire()
+    table.get_entry_for_update(DST_IP, macs[0])
+    table.neighbors_lock.release()
+    table.publish_entries([DST_IP])
+
+    change = trace["change"]
+    best_mac = macs[trace["qualities"][1].index(max(trace["qualities"][1]))]
+    delivered = [0, 0]
+    # Index of the last packet, after which the best valued neighbor was not the best link
+    last_miss = change
+    for i, draw in enumerate(trace["draws"]):
+        phase = int(i >= change)
+        mac = table.get_next_hop_mac(DST_IP)
+        if draw < trace["qualities"][phase][macs.index(mac)]:
+            table.update_entry(DST_IP, mac, DELIVERED_REWARD)
+            delivered[phase] += 1
+        else:
+            table.update_entry(DST_IP, mac, 0)
+
+        entry = table.get_entry(DST_IP)
+        if phase and max(entry.keys(), key=lambda m: entry[m]) != best_mac:
+            last_miss = i + 1
+
+    packets = len(trace["draws"])
+    convergence = last_miss - change if last_miss < packets else None
+    return float(delivered[0]) / change, float(delivered[1]) / (packets - change), convergence
+
+
+## Run the benchmark and print out the results.
+# @param trace_file Path to the trace file, or None.
+# @return None
+def main(trace_file):
+    trace = get_trace(trace_file)
+    print "Packets: %d, topology change at: %d, seed: %s" % (len(trace["draws"]), trace["change"], trace["seed"])
+    print "%16s %14s %14s %18s" % ("method", "before, %", "after, %", "convergence, pkts")
+    for est_method_id in METHODS:
+        before, after, convergence = replay(trace, est_method_id)
+        print "%16s %14.1f %14.1f %18s" % (est_method_id, before * 100, after * 100,
+                                            "never" if convergence is None else convergence)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -0,0 +1,142 @@
+#!/usr/bin/python
+"""
+@package bench_hashes
+Created on Oct 16, 2026
+
+@author: Dmitrii Dugaev
+
+
+Microbenchmark of the ACK and reward hashing on the sending and the receiving side of a link.
+The paths are measured as they are run per message by ArqHandler and RewardHandler:
+    ack sender      - ArqHandler.arq_send: the hashes, which the ACK of the sent message may carry;
+    ack receiver    - ArqHandler.send_ack: the hash of the ACK on the received message;
+    reward sender   - RewardHandler.RewardWaitHandler.wait_for_reward: the hashes of the reward of the forwarded packet;
+    reward receiver - RewardHandler.RewardSendHandler.send_back: the hash of the reward sent back.
+Three variants are compared:
+    baseline  - the md5 hash over the text form of the values, as it was done by the previous versions, which kept the
+                MAC addresses in the text form;
+    known     - the current implementation towards a neighbor, which has advertised its protocol version, so a single
+                hash of the agreed mode is generated;
+    uncertain - the current implementation towards a neighbor, which hasn't been heard from yet, or has missed the
+                reply in the agreed mode, so the hashes of both modes are generated.
+The results are given in microseconds per call, the best of REPEATS runs.
+
+Usage: python benchmarks/bench_hashes.py [calls]
+"""
+
+# Import necessary python modules from the standard library
+import os
+import sys
+import time
+import hashlib
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("ADHOC_ROUTING_LOG_DIR", tempfile.mkdtemp(prefix="adhoc_routing_"))
+
+# Import the necessary modules of the program
+import Messages
+import MessageHash
+import RouteTable
+from Transport import mac_to_str
+
+## @var CALLS
+# Default number of calls per variant.
+CALLS = 200000
+## @var REPEATS
+# Number of runs of each variant.
+REPEATS = 5
+## @var NODE_MAC
+# MAC address of the measuring node, as a 6-byte binary string.
+NODE_MAC = "\x02\x00\x00\x00\x00\x01"
+## @var NEIGHBOR_MAC
+# MAC address of the neighbor, as a 6-byte binary string.
+NEIGHBOR_MAC = "\x02\x00\x00\x00\x00\x02"
+## @var DST_IPS
+# Destination IP addresses of the forwarded packets.
+DST_IPS = ["10.0.0.%d" % i for i in xrange(1, 17)]
+## @var MAX_INT32
+# 32-bit mask constant.
+MAX_INT32 = 0xFFFFFFFF
+
+
+## A stub of NeighborDiscovery.Neighbor.
+class Neighbor:
+    ## Constructor.
+    # @param self The object pointer.
+    # @param mac MAC address of the neighbor, as a 6-byte binary string.
+    # @return None
+    def __init__(self, mac):
+        self.mac = mac
+        self.l3_addresses = list()
+        self.protocol_version = Messages.PROTOCOL_VERSION
+
+
+## Generate the hash in the baseline way: md5 over the text form of the values.
+# @param value Message ID or destination IP.
+# @param mac MAC address in "xx:xx:xx:xx:xx:xx" format.
+# @return 32-bit integer hash value.
+def baseline_hash(value, mac):
+    return int(hashlib.md5(str(value) + mac).hexdigest(), 16) & MAX_INT32
+
+
+## Measure the time of a single call, in the best of REPEATS runs.
+# @param call A function, which is called with the message number.
+# @param calls Number of calls per run.
+# @return Time of a single call, in microseconds.
+def measure(call, calls):
+    times = list()
+    for _ in xrange(REPEATS):
+        start = time.time()
+        for number in xrange(calls):
+            call(number)
+        times.append(time.time() - start)
+    return min(times) / calls * 1e6
+
+
+## Run the benchmark and print out the results.
+# @param calls Number of calls per variant.
+# @return None
+def main(calls):
+    table = RouteTable.Table(NODE_MAC)
+    table.add_neighbor(Neighbor(NEIGHBOR_MAC))
+    hash_modes = MessageHash.HashModes(table)
+    # The other neighbor hasn't been heard from
+    unknown_mac = "\x02\x00\x00\x00\x00\x03"
+    dst_count = len(DST_IPS)
+    node_mac_str = mac_to_str(NODE_MAC)
+    neighbor_mac_str = mac_to_str(NEIGHBOR_MAC)
+
+    paths = [
+        ("ack sender",
+         lambda n: baseline_hash(n, neighbor_mac_str),
+         lambda n: MessageHash.get_ack_hashes(n, NEIGHBOR_MAC, hash_modes.get_mode(NEIGHBOR_MAC)),
+         lambda n: MessageHash.get_ack_hashes(n, unknown_mac, hash_modes.get_mode(unknown_mac))),
+        ("ack receiver",
+         lambda n: baseline_hash(n, node_mac_str),
+         lambda n: MessageHash.get_ack_hash(n, NODE_MAC, table.get_neighbor_version(NEIGHBOR_MAC)),
+         None),
+        ("reward sender",
+         lambda n: baseline_hash(DST_IPS[n % dst_count], neighbor_mac_str),
+         lambda n: MessageHash.get_reward_hashes(DST_IPS[n % dst_count], NEIGHBOR_MAC,
+                                                 hash_modes.get_mode(NEIGHBOR_MAC)),
+         lambda n: MessageHash.get_reward_hashes(DST_IPS[n % dst_count], unknown_mac,
+                                                 hash_modes.get_mode(unknown_mac))),
+        ("reward receiver",
+         lambda n: baseline_hash(DST_IPS[n % dst_count], node_mac_str),
+         lambda n: MessageHash.get_reward_hash(DST_IPS[n % dst_count], NODE_MAC,
+                                               table.get_neighbor_version(NEIGHBOR_MAC)),
+         None)]
+
+    print "Calls per variant: %d, fast hashes: %s" % (calls, MessageHash.is_fast(Messages.PROTOCOL_VERSION))
+    print "%16s %14s %10s %14s %10s" % ("path", "baseline, us", "known, us", "uncertain, us", "speedup")
+    for name, baseline, known, uncertain in paths:
+        baseline_time = measure(baseline, calls)
+        known_time = measure(known, calls)
+        uncertain_time = "-" if uncertain is None else "%.3f" % measure(uncertain, calls)
+        print "%16s %14.3f %10.3f %14s %9.1fx" % (name, baseline_time, known_time, uncertain_time,
+                                                  baseline_time / known_time)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else CALLS)
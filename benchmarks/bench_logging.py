@@ -0,0 +1,151 @@
+#!/usr/bin/python
+"""
+@package bench_logging
+Created on Oct 16, 2026
+
+@author: Dmitrii Dugaev
+
+
+Benchmark of the per-packet logging overhead at each log level.
+For every packet, the benchmark makes the same log calls, which are made on the receive path of a forwarded data
+packet (Transport, DataHandler and RouteTable), and measures the time spent in the calling thread, as well as the time
+until the LoggingHandler thread has written all the queued records (to os.devnull).
+Three variants are compared:
+    queue-all - every call is put to the log queue, regardless of the log level (the previous behaviour);
+    eager     - level-aware LogWrapper, but the arguments are converted to strings at the call site;
+    guarded   - level-aware LogWrapper, with the arguments converted only under the LogWrapper.debug_enabled flag.
+
+Usage: python benchmarks/bench_logging.py [number_of_packets]
+"""
+
+# Import necessary python modules from the standard library
+import os
+import sys
+import tempfile
+import time
+import logging
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("ADHOC_ROUTING_LOG_DIR", tempfile.mkdtemp(prefix="adhoc_routing_"))
+
+# Import the necessary modules of the program
+import routing_logging
+import Messages
+from Transport import mac_to_str
+
+## @var LEVELS
+# Log levels to run the benchmark with.
+LEVELS = ["CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG"]
+## @var PACKETS
+# Default number of packets per run.
+PACKETS = 20000
+
+
+## LogWrapper, which puts all the calls to the log queue, as it has been done before the level-aware wrappers.
+class QueueAllLogWrapper(routing_logging.LogWrapper):
+    ## Constructor.
+    # @param self The object pointer.
+    # @param logger_object Reference to the Python logger object.
+    # @return None
+    def __init__(self, logger_object):
+        self.logger_object = logger_object
+        self.debug_enabled = True
+        self.info_enabled = True
+
+
+## Create a logger, which writes to os.devnull with the routing log format.
+# @param name Name of the logger.
+# @param level Log level name.
+# @return Python logger object.
+def create_logger(name, level):
+    logger = logging.getLogger("bench_logging.%s" % name)
+    logger.propagate = False
+    handler = logging.FileHandler(os.devnull)
+    handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(funcName)s(%(lineno)d) %(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(getattr(logging, level))
+    return logger
+
+
+## Make the log calls of a single forwarded packet, converting the arguments at the call site.
+# @param log LogWrapper object.
+# @param src_mac Source MAC address as a 6-byte binary string.
+# @param message Message object from Messages module.
+# @return None
+def process_packet_eager(log, src_mac, message):
+    log.debug("SRC_MAC from the received frame: %s", mac_to_str(src_mac))
+    log.debug("Got %s: %s", "unicast data packet", str(message))
+    log.debug("Selected next_hop: %s, from available entries: %s", mac_to_str(src_mac), "{}")
+    log.debug("IncomingTraffic: For DST_IP: %s found a next_hop_mac: %s", "10.0.0.2", mac_to_str(src_mac))
+    log.info("Sending ACK back on the message %s", str(message))
+
+
+## Make the log calls of a single forwarded packet, converting the arguments only for the enabled levels.
+# @param log LogWrapper object.
+# @param src_mac Source MAC address as a 6-byte binary string.
+# @param message Message object from Messages module.
+# @return None
+def process_packet_guarded(log, src_mac, message):
+    if log.debug_enabled:
+        log.debug("SRC_MAC from the received frame: %s", mac_to_str(src_mac))
+    if log.debug_enabled:
+        log.debug("Got %s: %s", "unicast data packet", str(message))
+    if log.debug_enabled:
+        log.debug("Selected next_hop: %s, from available entries: %s", mac_to_str(src_mac), "{}")
+    if log.debug_enabled:
+        log.debug("IncomingTraffic: For DST_IP: %s found a next_hop_mac: %s", "10.0.0.2", mac_to_str(src_mac))
+    if log.info_enabled:
+        log.info("Sending ACK back on the message %s", str(message))
+
+
+## Run a single benchmark.
+# @param log LogWrapper object.
+# @param process_packet Function, which makes the log calls of a single packet.
+# @param packets Number of packets.
+# @return (call site time per packet in microseconds), (total time per packet in microseconds)
+def run(log, process_packet, packets):
+    src_mac = "\x00\x11\x22\x33\x44\x55"
+    message = Messages.UnicastPacket()
+
+    start = time.time()
+    for _ in xrange(packets):
+        process_packet(log, src_mac, message)
+    call_site_time = time.time() - start
+
+    # Wait until the log thread has written all the records
+    while not routing_logging.LOG_QUEUE.empty():
+        time.sleep(0.001)
+    total_time = time.time() - start
+
+    return call_site_time * 1e6 / packets, total_time * 1e6 / packets
+
+
+## Main function.
+# @return None
+def main():
+    packets = int(sys.argv[1]) if len(sys.argv) > 1 else PACKETS
+
+    log_thread = routing_logging.LoggingHandler()
+    log_thread.daemon = True
+    log_thread.start()
+
+    # Baseline: the loop without any log calls
+    baseline = run(None, lambda log, src_mac, message: None, packets)[0]
+    print "Packets per run: %s, empty loop: %.2f us/packet" % (packets, baseline)
+    print "%-10s %-10s %22s %22s" % ("LEVEL", "VARIANT", "CALL SITE (us/packet)", "TOTAL (us/packet)")
+
+    for level in LEVELS:
+        variants = [("queue-all", QueueAllLogWrapper(create_logger("queue_all_" + level, level)),
+                     process_packet_eager),
+                    ("eager", routing_logging.LogWrapper(create_logger("eager_" + level, level)),
+                     process_packet_eager),
+                    ("guarded", routing_logging.LogWrapper(create_logger("guarded_" + level, level)),
+                     process_packet_guarded)]
+
+        for name, log, process_packet in variants:
+            call_site, total = run(log, process_packet, packets)
+            print "%-10s %-10s %22.2f %22.2f" % (level, name, call_site - baseline, total - baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+#!/usr/bin/python
+"""
+@package bench_reward_timeouts
+Created on Oct 16, 2026
+
+@author: Dmitrii Dugaev
+
+
+Benchmark of the reward wait timeouts against the number of concurrent destinations.
+For every destination, a packet is "sent" to a single next hop, so that a reward wait is started for each
+(dst_ip, next_hop_mac) pair, and none of the rewards is received, so all of the waits expire. The benchmark measures
+the peak number of threads in the process, the process CPU time, and the time until all the "bad" rewards have been
+applied to the route table.
+Two variants are compared:
+    thread - a sleeping thread per reward wait (the previous RewardWaitThread behaviour);
+    wheel  - RewardHandler.RewardWaitHandler, with the timeouts scheduled on a shared TimerWheel.TimerWheel.
+
+Usage: python benchmarks/bench_reward_timeouts.py [wait_timeout]
+"""
+
+# Import necessary python modules from the standard library
+import os
+import sys
+import tempfile
+import time
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("ADHOC_ROUTING_LOG_DIR", tempfile.mkdtemp(prefix="adhoc_routing_"))
+
+# Import the necessary modules of the program
+import RewardHandler
+import TimerWheel
+
+## @var DESTINATIONS
+# Numbers of concurrent destinations to run the benchmark with.
+DESTINATIONS = [10, 100, 1000, 5000]
+## @var WAIT_TIMEOUT
+# Default reward wait timeout (in seconds).
+WAIT_TIMEOUT = 1.0
+## @var NEXT_HOP_MAC
+# MAC address of the next hop, as a 6-byte binary string.
+NEXT_HOP_MAC = "\x00\x11\x22\x33\x44\x55"
+
+
+## A stub of RouteTable.Table, which only counts the applied rewards.
+class CountingTable:
+    ## Constructor.
+    # @param self The object pointer.
+    # @return None
+    def __init__(self):
+        ## @var updates
+        # Number of the applied rewards.
+        self.updates = 0
+        ## @var lock
+        # threading.Lock object, which protects the counter.
+        self.lock = threading.Lock()
+
+    ## Count a single reward update.
+    # @param self The object pointer.
+    # @param dst_ip Destination IP address of the route.
+    # @param mac MAC address of the neighbor (action ID).
+    # @param reward Reward value to be assigned.
+    # @return None
+    def update_entry(self, dst_ip, mac, reward):
+        self.lock.acquire()
+        self.updates += 1
+        self.lock.release()
+
+    ## Get the protocol version of the given neighbor.
+    # @param self The object pointer.
+    # @param mac MAC address of the neighbor.
+    # @param default Value to return, if there is no such neighbor.
+    # @return Base protocol version, i.e. the legacy reward hashes are used.
+    def get_neighbor_version(self, mac, default=1):
+        return 1
+
+    ## Count a batch of reward updates.
+    # @param self The object pointer.
+    # @param updates List of (dst_ip, mac, reward) tuples.
+    # @return None
+    def update_entries(self, updates):
+        self.lock.acquire()
+        self.updates += len(updates)
+        self.lock.release()
+
+
+## A thread per reward wait, as it was done by the previous RewardWaitThread.
+class SleepingWait(threading.Thread):
+    ## Constructor.
+    # @param self The object pointer.
+    # @param dst_ip Destination IP of the route for this packet.
+    # @param table Reference to CountingTable object.
+    # @param wait_timeout Wait timeout value (in seconds).
+    # @return None
+    def __init__(self, dst_ip, table, wait_timeout):
+        super(SleepingWait, self).__init__()
+        self.dst_ip = dst_ip
+        self.table = table
+        self.wait_timeout = wait_timeout
+
+    ## Main thread routine.
+    # @param self The object pointer.
+    # @return None
+    def run(self):
+        time.sleep(self.wait_timeout)
+        self.table.update_entry(self.dst_ip, NEXT_HOP_MAC, 0)
+
+
+## Start the reward waits with a thread per wait.
+# @param table Reference to CountingTable object.
+# @param dst_ips List of destination IP addresses.
+# @param wait_timeout Wait timeout value (in seconds).
+# @return None
+def start_thread_waits(table, dst_ips, wait_timeout):
+    for dst_ip in dst_ips:
+        SleepingWait(dst_ip, table, wait_timeout).start()
+
+
+## Run a single variant of the benchmark.
+# @param start_waits A function, which starts the reward waits: start_waits(table, dst_ips).
+# @param destinations Number of concurrent destinations.
+# @param wait_timeout Wait timeout value (in seconds).
+# @return (peak number of threads, process CPU time, time until all the rewards are applied).
+def run_variant(start_waits, destinations, wait_timeout):
+    table = CountingTable()
+    dst_ips = ["10.%d.%d.%d" % ((i >> 16) & 0xFF, (i >> 8) & 0xFF, i & 0xFF) for i in xrange(destinations)]
+    base_threads = threading.active_count()
+    cpu_start = sum(os.times()[:2])
+    start = time.time()
+    start_waits(table, dst_ips)
+    peak_threads = threading.active_count()
+    while table.updates < destinations:
+        peak_threads = max(peak_threads, threading.active_count())
+        time.sleep(0.01)
+    result = peak_threads, sum(os.times()[:2]) - cpu_start, time.time() - start
+    # Let the finished threads exit before the next run
+    while threading.active_count() > base_threads:
+        time.sleep(0.01)
+    return result
+
+
+## Run the benchmark and print out the results.
+# @param wait_timeout Wait timeout value (in seconds).
+# @return None
+def main(wait_timeout):
+    timer_wheel = TimerWheel.TimerWheel()
+    timer_wheel.start()
+
+    ## Start the reward waits on the shared timer wheel.
+    # @param table Reference to CountingTable object.
+    # @param dst_ips List of destination IP addresses.
+    # @return None
+    def start_wheel_waits(table, dst_ips):
+        handler = RewardHandler.RewardWaitHandler(table, timer_wheel)
+        handler.wait_timeout = wait_timeout
+        for dst_ip in dst_ips:
+            handler.wait_for_reward(dst_ip, NEXT_HOP_MAC)
+
+    variants = [("thread", lambda table, dst_ips: start_thread_waits(table, dst_ips, wait_timeout)),
+                ("wheel", start_wheel_waits)]
+
+    print "Wait timeout: %s s" % wait_timeout
+    print "%-8s %12s %14s %12s %12s" % ("variant", "destinations", "peak threads", "cpu, s", "elapsed, s")
+    try:
+        for destinations in DESTINATIONS:
+            for name, start_waits in variants:
+                peak_threads, cpu_time, elapsed = run_variant(start_waits, destinations, wait_timeout)
+                print "%-8s %12d %14d %12.3f %12.3f" % (name, destinations, peak_threads, cpu_time, elapsed)
+    finally:
+        timer_wheel.quit()
+
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else WAIT_TIMEOUT)
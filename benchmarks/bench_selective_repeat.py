@@ -0,0 +1,173 @@
+#!/usr/bin/python
+"""
+@package bench_selective_repeat
+Created on Oct 16, 2026
+
+@author: Dmitrii Dugaev
+
+
+Check of the Selective-Repeat ARQ (conf.ARQ_MODE = "selective-repeat") on a single lossy hop of the in-process
+emulated network (see Emulator module). A back-to-back burst of BURST_PACKETS reliable packets is sent over the link
+with each of the LOSSES frame loss probabilities. For each run the check reports:
+    delivered - the number of the delivered packets of the burst;
+    time      - the time until the last packet has been delivered;
+    span      - the maximum distance between the sequence numbers of the oldest unacknowledged packet and the next
+                new packet of the sending window;
+    timeouts  - the number of the retransmission timeouts of the sending window;
+    lost      - the number of the frames (of all types, in both directions), lost on the link.
+Since every lost frame may cause at most one timeout, more timeouts than the lost frames mean, that the packets have
+been retransmitted while their SACKs were still on the way, or couldn't be acknowledged at all. The span must stay
+below the window size, so that every packet in flight can be acknowledged by the SACK bitmap.
+The script exits with the status 1, if either of the conditions is violated. The number of the delivered packets is
+not checked: the burst is generated faster than the link drains it, so the oldest queued packets are dropped from the
+bounded backlog of the window, while it waits for a retransmission.
+
+Usage: python benchmarks/bench_selective_repeat.py [burst_packets]
+The log files are written to the directory from the ADHOC_ROUTING_LOG_DIR environment variable, or to a temporary one.
+"""
+
+# Import necessary python modules from the standard library
+import os
+import sys
+import time
+import random
+import struct
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("ADHOC_ROUTING_LOG_DIR", tempfile.mkdtemp(prefix="adhoc_routing_"))
+
+# Import the necessary modules of the program
+import ArqHandler
+import DataHandler
+import Emulator
+
+## @var BURST_PACKETS
+# Default number of packets in the burst.
+BURST_PACKETS = 3000
+## @var LOSSES
+# Frame loss probabilities of the link to run the check with.
+LOSSES = [0.0, 0.01, 0.05]
+## @var ARQ_PORT
+# UDP port of the reliable traffic, which must be in conf.ARQ_LIST.
+ARQ_PORT = 30000
+## @var HELLO_INTERVAL
+# Time interval (in seconds) between the HELLO messages of the nodes.
+HELLO_INTERVAL = 0.5
+## @var DELIVERY_TIMEOUT
+# Maximum waiting time (in seconds) for the packets of the burst.
+DELIVERY_TIMEOUT = 20
+## @var SEED
+# Seed of the random generators.
+SEED = 1
+## @var PAYLOAD_HEADER
+# Header of the UDP payload of the packets: sequence number.
+PAYLOAD_HEADER = struct.Struct("!I")
+
+
+## Class WindowCounters counts the timeouts and the span of all the sending windows, by wrapping the methods of
+# ArqHandler.SendWindow class.
+class WindowCounters:
+    ## Constructor.
+    # @param self The object pointer.
+    # @return None
+    def __init__(self):
+        ## @var timeouts
+        # Number of the retransmission timeouts of the packets, which are still in flight.
+        self.timeouts = 0
+        ## @var span
+        # Maximum span of the sequence numbers in flight.
+        self.span = 0
+        ## @var window_size
+        # Maximum window size of the measured windows.
+        self.window_size = 0
+        counters = self
+        send_new = ArqHandler.SendWindow.send_new
+        on_timeout = ArqHandler.SendWindow.on_timeout
+
+        def counting_send_new(window, payload, hop_count):
+            send_new(window, payload, hop_count)
+            counters.span = max(counters.span, (window.next_seq - window.base) & ArqHandler.MAX_SEQ)
+            counters.window_size = max(counters.window_size, window.window_size)
+
+        def counting_on_timeout(window, window_slot):
+            if window.in_flight.get(window_slot.message.seq) is window_slot:
+                counters.timeouts += 1
+            on_timeout(window, window_slot)
+
+        ArqHandler.SendWindow.send_new = counting_send_new
+        ArqHandler.SendWindow.on_timeout = counting_on_timeout
+
+    ## Reset the counters before the next run.
+    # @param self The object pointer.
+    # @return None
+    def reset(self):
+        self.timeouts = 0
+        self.span = 0
+
+
+## Send the burst over a single link with the given loss.
+# @param counters WindowCounters object.
+# @param loss Frame loss probability of the link.
+# @param burst_packets Number of packets in the burst.
+# @return Tuple of (delivered, time, lost frames).
+def run_link(counters, loss, burst_packets):
+    random.seed(SEED)
+    network = Emulator.Network(seed=SEED)
+    src, dst = network.add_node(HELLO_INTERVAL), network.add_node(HELLO_INTERVAL)
+    network.connect(src, dst)
+
+    arrivals = dict()
+
+    def receive(packet):
+        arrivals.setdefault(PAYLOAD_HEADER.unpack_from(Emulator.get_udp_payload(packet))[0], time.time())
+    dst.app_transport.receive_callback = receive
+
+    network.start()
+    try:
+        network.wait_for_neighbors(30)
+        # The first packet triggers the path discovery on the lossless link
+        src.send(dst.ip, PAYLOAD_HEADER.pack(burst_packets), ARQ_PORT, ARQ_PORT)
+        deadline = time.time() + DELIVERY_TIMEOUT
+        while time.time() < deadline and burst_packets not in arrivals:
+            time.sleep(0.01)
+        network.connect(src, dst, loss=loss)
+        lost_frames = network.lost_frames
+        counters.reset()
+
+        start = time.time()
+        for number in xrange(burst_packets):
+            src.send(dst.ip, PAYLOAD_HEADER.pack(number), ARQ_PORT, ARQ_PORT)
+        deadline = time.time() + DELIVERY_TIMEOUT
+        while time.time() < deadline and len(arrivals) <= burst_packets:
+            time.sleep(0.01)
+        # Let the retransmissions of the lost SACKs expire
+        time.sleep(1)
+    finally:
+        network.stop()
+
+    burst = [arrival for number, arrival in arrivals.items() if number < burst_packets]
+    return len(burst), (max(burst) - start if burst else 0.0), network.lost_frames - lost_frames
+
+
+## Run the check and print out the results.
+# @param burst_packets Number of packets in the burst.
+# @return Exit status: 0 if the check has passed, 1 otherwise.
+def main(burst_packets):
+    DataHandler.ARQ_MODE = "selective-repeat"
+    counters = WindowCounters()
+    status = 0
+    print "Burst packets: %d" % burst_packets
+    print "%6s %12s %8s %6s %10s %6s" % ("loss", "delivered", "time, s", "span", "timeouts", "lost")
+    for loss in LOSSES:
+        delivered, duration, lost_frames = run_link(counters, loss, burst_packets)
+        print "%6.2f %5d/%-6d %8.2f %6d %10d %6d" % (loss, delivered, burst_packets, duration, counters.span,
+                                                   counters.timeouts, lost_frames)
+        if counters.timeouts > lost_frames or counters.span > counters.window_size:
+            status = 1
+    print "PASSED" if status == 0 else "FAILED"
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else BURST_PACKETS))
@@ -0,0 +1,199 @@
+#!/usr/bin/python
+"""
+@package bench_selectors
+Created on Oct 16, 2026
+
+@author: Dmitrii Dugaev
+
+
+Simulation benchmark of the action selection methods of the route table.
+The network is a GRID_SIZE x GRID_SIZE grid of nodes, each node is connected to its horizontal and vertical neighbors,
+and each link has its own random loss probability. Every node has its own RouteTable.Table, initialized the way the
+program does it: the node's own IP address gets the reward of 100 via the node's own MAC address, the direct neighbors
+get the reward of 50, and the other destinations get the reward of 50 / hop_count via each neighbor, as from the RREP
+messages. Then the packets of a number of flows are forwarded hop by hop: each node selects the next hop by its table,
+and updates the value of the selected neighbor either by the reward of the receiver (the average value of its entry
+towards the destination), or, if the packet is lost on the link, by the "bad" reward of 0. A packet is dropped, if it
+is lost on a link, or if it has made more than MAX_STRETCH times the hops of the shortest path.
+For each selector the benchmark reports the delivery ratio of the packets, and the average path stretch - the ratio of
+the number of hops of the delivered packets to the number of hops of the shortest path.
+
+Usage: python benchmarks/bench_selectors.py [packets_per_flow] [seed]
+"""
+
+# Import necessary python modules from the standard library
+import os
+import sys
+import random
+import tempfile
+from collections import deque
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("ADHOC_ROUTING_LOG_DIR", tempfile.mkdtemp(prefix="adhoc_routing_"))
+
+# Import the necessary modules of the program
+import rl_logic
+import RouteTable
+
+## @var SELECTORS
+# Selectors to run the benchmark with. Format: [(name, rl_logic.ActionSelector arguments)].
+SELECTORS = [("greedy", ("greedy",)),
+             ("e-greedy", ("e-greedy",)),
+             ("soft-max, tau=1", ("soft-max", 1.0)),
+             ("soft-max, tau=5", ("soft-max", 5.0)),
+             ("soft-max, tau=10", ("soft-max", 10.0)),
+             ("annealed-soft-max", ("annealed-soft-max", 1.0, 1.0, 0.9, 2.0, 20.0)),
+             ("ucb1, factor=2", ("ucb1", 1.0, 1.0, 0.9, 2.0)),
+             ("ucb1, factor=10", ("ucb1", 1.0, 1.0, 0.9, 10.0))]
+## @var GRID_SIZE
+# Number of nodes per side of the grid.
+GRID_SIZE = 5
+## @var MAX_LOSS
+# Maximum loss probability of a link.
+MAX_LOSS = 0.3
+## @var FLOWS
+# Number of the flows between the random pairs of nodes.
+FLOWS = 10
+## @var PACKETS
+# Default number of packets per flow.
+PACKETS = 500
+## @var SEED
+# Default seed of the topology and of the flows.
+SEED = 1
+## @var MAX_STRETCH
+# Maximum ratio of the number of hops of a packet to the number of hops of the shortest path.
+MAX_STRETCH = 4
+
+
+## A stub of NeighborDiscovery.Neighbor.
+class Neighbor:
+    ## Constructor.
+    # @param self The object pointer.
+    # @param mac MAC address of the neighbor, as a 6-byte binary string.
+    # @param ip IP address of the neighbor.
+    # @return None
+    def __init__(self, mac, ip):
+        self.mac = mac
+        self.l3_addresses = [ip]
+
+
+## Get the MAC address of the node.
+# @param node Node number.
+# @return MAC address as a 6-byte binary string.
+def get_mac(node):
+    return "\x02\x00\x00\x00" + chr(node >> 8) + chr(node & 0xFF)
+
+
+## Get the IP address of the node.
+# @param node Node number.
+# @return IP address.
+def get_ip(node):
+    return "10.0.%d.%d" % (node >> 8, node & 0xFF)
+
+
+## Generate the grid topology with random link losses.
+# @param generator random.Random object.
+# @return dict() with the links of each node: {node: {neighbor: loss probability}}.
+def generate_topology(generator):
+    links = dict([(node, dict()) for node in xrange(GRID_SIZE * GRID_SIZE)])
+    for node in links:
+        row, column = divmod(node, GRID_SIZE)
+        neighbors = list()
+        if column < GRID_SIZE - 1:
+            neighbors.append(node + 1)
+        if row < GRID_SIZE - 1:
+            neighbors.append(node + GRID_SIZE)
+        for neighbor in neighbors:
+            links[node][neighbor] = links[neighbor][node] = round(generator.uniform(0.0, MAX_LOSS), 2)
+    return links
+
+
+## Calculate the hop counts of the shortest paths from all the nodes to the given one.
+# @param links Links of the nodes.
+# @param dst Destination node.
+# @return dict() with {node: hop_count}.
+def get_hop_counts(links, dst):
+    hop_counts = {dst: 0}
+    queue = deque([dst])
+    while queue:
+        node = queue.popleft()
+        for neighbor in links[node]:
+            if neighbor not in hop_counts:
+                hop_counts[neighbor] = hop_counts[node] + 1
+                queue.append(neighbor)
+    return hop_counts
+
+
+## Create and initialize the route tables of all the nodes.
+# @param links Links of the nodes.
+# @param selector_args Arguments of rl_logic.ActionSelector.
+# @return dict() with {node: RouteTable.Table object}.
+def create_tables(links, selector_args):
+    tables = dict()
+    for node in links:
+        table = tables[node] = RouteTable.Table(get_mac(node))
+        table.action_selector = rl_logic.ActionSelector(*selector_args)
+        for neighbor in links[node]:
+            table.add_neighbor(Neighbor(get_mac(neighbor), get_ip(neighbor)))
+        table.update_entry(get_ip(node), get_mac(node), 100)
+    for dst in links:
+        hop_counts = get_hop_counts(links, dst)
+        for node in links:
+            if node == dst:
+                continue
+            for neighbor in links[node]:
+                tables[node].update_entry(get_ip(dst), get_mac(neighbor), round(50.0 / (hop_counts[neighbor] + 1), 2))
+    return tables
+
+
+## Run the simulation with the given selector.
+# @param links Links of the nodes.
+# @param flows List of (src, dst) pairs.
+# @param packets Number of packets per flow.
+# @param selector_args Arguments of rl_logic.ActionSelector.
+# @param seed Seed of the losses and of the selections.
+# @return Tuple of (delivery ratio, average path stretch).
+def simulate(links, flows, packets, selector_args, seed):
+    random.seed(seed)
+    tables = create_tables(links, selector_args)
+    nodes = dict([(get_mac(node), node) for node in links])
+    hop_counts = dict([(dst, get_hop_counts(links, dst)) for dst in set([dst for _, dst in flows])])
+    delivered = 0
+    stretch = 0.0
+    for _ in xrange(packets):
+        for src, dst in flows:
+            dst_ip = get_ip(dst)
+            max_hops = MAX_STRETCH * hop_counts[dst][src]
+            node = src
+            hops = 0
+            while node != dst and hops < max_hops:
+                next_hop = nodes[tables[node].get_next_hop_mac(dst_ip)]
+                if random.random() < links[node][next_hop]:
+                    tables[node].update_entry(dst_ip, get_mac(next_hop), 0)
+                    break
+                tables[node].update_entry(dst_ip, get_mac(next_hop), tables[next_hop].get_avg_value(dst_ip))
+                node = next_hop
+                hops += 1
+            if node == dst:
+                delivered += 1
+                stretch += float(hops) / hop_counts[dst][src]
+    return float(delivered) / (packets * len(flows)), stretch / delivered if delivered else 0.0
+
+
+## Run the benchmark and print out the results.
+# @param packets Number of packets per flow.
+# @param seed Seed of the topology and of the flows.
+# @return None
+def main(packets, seed):
+    generator = random.Random(seed)
+    links = generate_topology(generator)
+    flows = [tuple(generator.sample(links.keys(), 2)) for _ in xrange(FLOWS)]
+    print "Grid: %dx%d, flows: %d, packets per flow: %d, seed: %d" % (GRID_SIZE, GRID_SIZE, FLOWS, packets, seed)
+    print "%20s %12s %10s" % ("selector", "delivery, %", "stretch")
+    for name, selector_args in SELECTORS:
+        delivery, stretch = simulate(links, flows, packets, selector_args, seed)
+        print "%20s %12.1f %10.2f" % (name, delivery * 100, stretch)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else PACKETS, int(sys.argv[2]) if len(sys.argv) > 2 else SEED)
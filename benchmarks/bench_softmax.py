@@ -0,0 +1,132 @@
+#!/usr/bin/python
+"""
+@package bench_softmax
+Created on Oct 16, 2026
+
+@author: Dmitrii Dugaev
+
+
+Microbenchmark of the "soft-max" action selection against the number of neighbors in the route entry.
+Three variants are compared:
+    legacy   - the previous implementation, which re-calculates the Gibbs-Boltzmann weights on each selection, and
+               walks the weighted items linearly;
+    uncached - rl_logic.ActionSelector.select_action_softmax on a plain dict, which builds the cumulative
+               distribution on each selection;
+    cached   - rl_logic.ActionSelector.select_action_softmax on RouteTable.Entry, which caches the distribution until
+               the values of the entry change.
+The results are given in microseconds per selection.
+
+Usage: python benchmarks/bench_softmax.py [selections]
+"""
+
+# Import necessary python modules from the standard library
+import os
+import sys
+import random
+import tempfile
+import time
+from math import e
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("ADHOC_ROUTING_LOG_DIR", tempfile.mkdtemp(prefix="adhoc_routing_"))
+
+# Import the necessary modules of the program
+import rl_logic
+import RouteTable
+
+## @var NEIGHBOR_COUNTS
+# Numbers of neighbors in the entry to run the benchmark with.
+NEIGHBOR_COUNTS = [1, 2, 4, 8, 16, 32, 64]
+## @var SELECTIONS
+# Default number of selections per variant.
+SELECTIONS = 100000
+
+
+## Select an action using the previous "soft-max" implementation.
+# @param action_values A dictionary containing {action_id: estimation_value}.
+# @return The selected action_id.
+def legacy_select_action_softmax(action_values):
+    if len(action_values) == 0:
+        return None
+    tau = 1
+
+    def calc_gibbs_boltzmann(values):
+        probabilities = []
+        denominator = 0.0
+        for v in values:
+            denominator += pow(e, (v / tau))
+        for v in values:
+            numerator = pow(e, (v / tau))
+            probabilities.append(numerator / denominator)
+        return probabilities
+
+    def weighted_choice(items):
+        weight_total = sum(items.values())
+
+        def choice(uniform=random.uniform):
+            n = uniform(0, weight_total)
+            item = None
+            for item in items:
+                if n < items[item]:
+                    return item
+                n = n - items[item]
+            return item
+        return choice()
+
+    action_weights = calc_gibbs_boltzmann(action_values.values())
+    return weighted_choice(dict(zip(action_values.keys(), action_weights)))
+
+
+## A stub of NeighborDiscovery.Neighbor.
+class Neighbor:
+    ## Constructor.
+    # @param self The object pointer.
+    # @param mac MAC address of the neighbor, as a 6-byte binary string.
+    # @return None
+    def __init__(self, mac):
+        self.mac = mac
+        self.l3_addresses = list()
+
+
+## Create a route entry with the given number of neighbors and random values.
+# @param neighbor_count Number of neighbors.
+# @return RouteTable.Entry object.
+def create_entry(neighbor_count):
+    table = RouteTable.Table("\x00" * 6)
+    for i in xrange(neighbor_count):
+        table.add_neighbor(Neighbor("\x02\x00\x00\x00" + chr(i >> 8) + chr(i & 0xFF)))
+    for mac in table.neighbors_list.keys():
+        table.update_entry("10.0.0.1", mac, random.randint(0, 10))
+    return table.get_entry("10.0.0.1")
+
+
+## Measure the time of a single selection.
+# @param select A function, which selects the action from the given action values.
+# @param action_values Action values to select from.
+# @param selections Number of selections.
+# @return Time of a single selection, in microseconds.
+def measure(select, action_values, selections):
+    start = time.time()
+    for _ in xrange(selections):
+        select(action_values)
+    return (time.time() - start) / selections * 1e6
+
+
+## Run the benchmark and print out the results.
+# @param selections Number of selections per variant.
+# @return None
+def main(selections):
+    selector = rl_logic.ActionSelector("soft-max")
+    print "Selections per variant: %d" % selections
+    print "%10s %12s %12s %12s %10s" % ("neighbors", "legacy, us", "uncached, us", "cached, us", "speedup")
+    for neighbor_count in NEIGHBOR_COUNTS:
+        entry = create_entry(neighbor_count)
+        action_values = dict(entry.items())
+        legacy = measure(legacy_select_action_softmax, action_values, selections)
+        uncached = measure(selector.select_action_softmax, action_values, selections)
+        cached = measure(selector.select_action_softmax, entry, selections)
+        print "%10d %12.2f %12.2f %12.2f %9.1fx" % (neighbor_count, legacy, uncached, cached, legacy / cached)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else SELECTIONS)
@@ -13,3 +13,79 @@ DEFAULT_IPS = []
 # "0" port number corresponds to the upper protocols, which don't use ports, e.g. ICMP
 ENABLE_ARQ = True
 ARQ_LIST = {"TCP": [22], "UDP": [30000], "ICMP6": [0], "ICMP4": [0]}
+# Define the maximum number of frames, which are drained from the raw socket per single wakeup of the receiving thread,
+# and the maximum time interval (in seconds) the first received frame can be held back while the batch is collected.
+RECV_BATCH_SIZE = 32
+RECV_BATCH_TIMEOUT = 0.002
+# Define the receive engine of the raw socket: "socket" - frames are copied to user space by a recv() call per frame,
+# "mmap" - frames are read directly from a PACKET_MMAP (TPACKET_V3) ring buffer, mapped into the process memory.
+# The ring consists of RING_BLOCK_COUNT blocks of RING_BLOCK_SIZE bytes each (must be a multiple of the page size).
+RECV_ENGINE = "socket"
+RING_BLOCK_SIZE = 1 << 18
+RING_BLOCK_COUNT = 16
+# Define the maximum number of log records, which can be queued for writing by the log thread, and the policy applied
+# when the queue is full: "drop_new" - drop the incoming record, "drop_old" - drop the oldest queued record,
+# "sample" - keep only every LOG_SAMPLE_RATE-th incoming record (in place of the oldest one) and drop the rest.
+LOG_QUEUE_SIZE = 10000
+LOG_DROP_POLICY = "drop_new"
+LOG_SAMPLE_RATE = 10
+# Define the maximum number of log records, which are written by the log thread at once.
+LOG_BATCH_SIZE = 256
+# Define whether the handled frames are recorded to the binary in-memory packet trace, and the maximum number of records
+# in the trace. The trace can be read via RoutingManager interface.
+PACKET_TRACE_FLAG = False
+PACKET_TRACE_SIZE = 4096
+# Define the tick interval (in seconds) and the number of slots of the timer wheel, which schedules the delayed actions,
+# such as ARQ retransmissions, in a single thread.
+TIMER_TICK_INTERVAL = 0.01
+TIMER_WHEEL_SIZE = 512
+# Define the ARQ mode of the reliable data packets: "stop-and-go" - each packet is retransmitted on its own until the
+# ACK on this packet is received, "selective-repeat" - up to ARQ_WINDOW_SIZE packets per neighbor are sent without
+# waiting for the ACK, and only the lost ones are retransmitted. The window size can't be larger than 32.
+# The RREQ/RREP service messages are always sent in the "stop-and-go" mode, and so are the data packets towards the
+# neighbors, which don't advertise the support of the "selective-repeat" mode in their HELLO messages.
+ARQ_MODE = "stop-and-go"
+ARQ_WINDOW_SIZE = 16
+# Define the initial, minimum and maximum values (in seconds) of the ARQ retransmission timeout. The timeout towards
+# each neighbor is derived from the measured round-trip time of the messages, and is doubled upon each retransmission
+# timeout. The retransmission is postponed, while the neighbor keeps acknowledging the earlier messages, so the minimum
+# value may stay below the queueing delays of the bursts.
+ARQ_INITIAL_RTO = 0.5
+ARQ_MIN_RTO = 0.15
+ARQ_MAX_RTO = 4.0
+# Define whether the ACKs and rewards, destined to the same neighbor, are aggregated into a single control message, and
+# the maximum time interval (in seconds) the control message is held back before sending. Meanwhile, the pending
+# control message is piggybacked on any other unicast frame to the same neighbor. The control messages are sent only to
+# the neighbors, which advertise their support in the HELLO messages, so the flag may differ between the nodes.
+CONTROL_AGGREGATION_FLAG = False
+CONTROL_FLUSH_INTERVAL = 0.01
+# Define whether the fast (CRC32 and integer math based) hashes of the ACK and reward messages are used in place of
+# the md5 based ones in the replies of this node. The node advertises its support of the fast hashes in the HELLO
+# messages, and the fast hashes are used only towards the neighbors, which support them as well, so the older nodes in
+# the network keep working.
+FAST_HASH_FLAG = True
+# Define the storage backend of the route table's estimation values: "python" - an array of values per route entry,
+# "numpy" - a single dense destinations x neighbors matrix (requires NumPy), with the rewards applied in batches and
+# the soft-max distributions re-calculated for all the changed entries at once. It suits the large networks.
+VALUE_BACKEND = "python"
+# Define the calculation method of the route table's estimation values: "sample_average" - the average of all the
+# received rewards, "ewma" - the exponential recency-weighted average with the constant VALUE_STEP_SIZE step size,
+# "window" - the average of the last VALUE_WINDOW_SIZE rewards (not supported by the "numpy" value backend).
+# Unlike the "sample_average", the other two methods keep following the changes of the links' quality.
+VALUE_ESTIMATION_METHOD = "sample_average"
+VALUE_STEP_SIZE = 0.1
+VALUE_WINDOW_SIZE = 10
+# Define the selection method of the next hop: "greedy", "e-greedy", "soft-max" - the Gibbs-Boltzmann distribution
+# with the constant SOFTMAX_TAU temperature, "annealed-soft-max" - the temperature starts from SOFTMAX_START_TAU, and
+# is multiplied by SOFTMAX_TAU_DECAY on each reward of the route, down to SOFTMAX_MIN_TAU, "ucb1" - the upper confidence
+# bound, with the UCB_FACTOR exploration factor. Since the estimation values range up to 100, the "soft-max" with the
+# temperature of 1 is nearly "greedy", and the temperatures of about 10 let the routes explore the other neighbors.
+# With the default values, the "annealed-soft-max" cools down to SOFTMAX_MIN_TAU after about 30 rewards of the route.
+# The exploring methods pay off only on the links, which quality changes: on the static links of
+# benchmarks/bench_selectors.py all of them deliver a few percent less than "greedy".
+SELECTION_METHOD = "soft-max"
+SOFTMAX_TAU = 1.0
+SOFTMAX_START_TAU = 20.0
+SOFTMAX_MIN_TAU = 1.0
+SOFTMAX_TAU_DECAY = 0.9
+UCB_FACTOR = 2.0
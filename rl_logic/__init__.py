@@ -23,32 +23,58 @@ More information about the selection and calculation methods in RL can be found
 
 The module has two main classes - ValueEstimator and ActionSelector.
 The ValueEstimator class provides methods for estimating the current action values based on the last given reward which
-has been received by selecting the action.
+has been received by selecting the action. Besides the "sample average", the values can be estimated by the exponential
+recency-weighted average ("ewma", with a constant step size) or by the average over a sliding window of the last rewards
+("window"). Unlike the "sample average", whose step size shrinks toward zero as the number of rewards grows, both of
+them keep reacting to the changes of the network, e.g. to the degradation of a link.
 The ActionSelector class provides methods for selecting the action based on the given list of actions and their current
-estimation values.
+estimation values. Besides the "greedy", "e-greedy" and "soft-max" with a constant temperature, the action can be
+selected by the "annealed-soft-max", whose temperature decreases with the number of rewards the route has received,
+and by the "ucb1", which adds an exploration bonus to the values of the rarely selected actions.
 """
 
 # Import necessary python modules from the standard library
 import random
-from math import e
+from array import array
+from bisect import bisect_right
+from collections import deque
+from math import exp, log, sqrt
 
 
 ## Class for assigning current estimated value for a given action and provides method for returning this value.
 class ValueEstimator:
     ## Constructor
     # @param self The object pointer.
-    # @param est_method_id Default calculation method of the estimation value
-    def __init__(self, est_method_id="sample_average"):
+    # @param est_method_id Default calculation method of the estimation value: "sample_average", "ewma" or "window".
+    # @param step_size Constant step size of the "ewma" method.
+    # @param window_size Number of the last rewards, which are averaged by the "window" method.
+    def __init__(self, est_method_id="sample_average", step_size=0.1, window_size=10):
         ## @var actions
-        # Store current action ids and their current estimated value and step: {action_id: [est_value, step_count]}
+        # Store current action ids and their current estimated value and step: {action_id: [est_value, step_count]}.
+        # The "window" method also stores the deque of the last rewards: {action_id: [est_value, step_count, rewards]}.
         self.actions = dict()
+        ## @var step_size
+        # Constant step size of the "ewma" method.
+        self.step_size = step_size
+        ## @var window_size
+        # Number of the last rewards, which are averaged by the "window" method.
+        self.window_size = window_size
         # Override the default method
         ## @var estimate_value
         # A reference to the estimation method chosen by the est_method_id.
-        if est_method_id == "sample_average":
-            self.estimate_value = self.estimate_value_by_sample_average
+        ## @var est_method_id
+        # Store an estimation method ID value.
+        if est_method_id == "ewma":
+            self.estimate_value = self.estimate_value_by_ewma
+            self.est_method_id = "ewma"
+
+        elif est_method_id == "window":
+            self.estimate_value = self.estimate_value_by_window
+            self.est_method_id = "window"
+
         else:
             self.estimate_value = self.estimate_value_by_sample_average
+            self.est_method_id = "sample_average"
 
     ## Main method for estimation value calculation.
     # It is being overridden in the constructor, depending on the chosen estimation method ID.
@@ -81,6 +107,45 @@ class ValueEstimator:
         # Return the value
         return estimated_value
 
+    ## Estimate value by using the exponential recency-weighted average, i.e. with a constant step size.
+    # Reference to the method can be found in R.Sutton's book: Reinforcement Learning: An Introduction.
+    # The first reward of the action is taken as its value, so the value doesn't need to grow from zero.
+    # @param self The object pointer.
+    # @param action_id ID of the action having been chosen.
+    # @param reward Reward value received on the corresponding action ID.
+    # @return Estimated value in float().
+    def estimate_value_by_ewma(self, action_id, reward):
+        if action_id not in self.actions:
+            # Assign initial values
+            self.actions.update({action_id: [0.0, 0]})
+
+        action = self.actions[action_id]
+        if action[1] == 0:
+            estimated_value = float(reward)
+        else:
+            estimated_value = action[0] + self.step_size * (reward - action[0])
+        # Round it up, update the value and increment the counter
+        action[0] = round(estimated_value, 2)
+        action[1] += 1
+        return action[0]
+
+    ## Estimate value by averaging the last window_size rewards of the action.
+    # @param self The object pointer.
+    # @param action_id ID of the action having been chosen.
+    # @param reward Reward value received on the corresponding action ID.
+    # @return Estimated value in float().
+    def estimate_value_by_window(self, action_id, reward):
+        if action_id not in self.actions:
+            # Assign initial values
+            self.actions.update({action_id: [0.0, 0, deque(maxlen=self.window_size)]})
+
+        action = self.actions[action_id]
+        action[2].append(reward)
+        # Round it up, update the value and increment the counter
+        action[0] = round(float(sum(action[2])) / len(action[2]), 2)
+        action[1] += 1
+        return action[0]
+
     ## Delete an action_id from the current actions list.
     # @param self The object pointer.
     # @param action_id ID of the action being deleted.
@@ -89,13 +154,58 @@ class ValueEstimator:
             del self.actions[action_id]
 
 
+## Class for the precomputed Gibbs (Boltzmann) distribution of the actions, which is used by the "soft-max" selection.
+# The cumulative weights of the actions are calculated once, and each selection is a binary search over them.
+class SoftmaxDistribution:
+    ## Constructor.
+    # @param self The object pointer.
+    # @param action_items List of (action_id, estimation_value) pairs.
+    # @param tau Temperature factor of the distribution.
+    # @param version Version of the action values, which the distribution has been calculated from, or None.
+    # @return None
+    def __init__(self, action_items, tau, version=None):
+        ## @var actions
+        # List of the action IDs.
+        self.actions = [action_id for action_id, _ in action_items]
+        ## @var tau
+        # Temperature factor of the distribution.
+        self.tau = tau
+        ## @var version
+        # Version of the action values, which the distribution has been calculated from.
+        self.version = version
+        ## @var cumulative_weights
+        # Array of the cumulative weights of the actions.
+        self.cumulative_weights = array("d")
+        # The maximum value is subtracted from all the values, which doesn't change the distribution, but keeps
+        # the exponents from overflowing
+        max_value = max([value for _, value in action_items])
+        total = 0.0
+        for _, value in action_items:
+            total += exp((value - max_value) / tau)
+            self.cumulative_weights.append(total)
+
+    ## Draw a random action according to its weight.
+    # @param self The object pointer.
+    # @param uniform A function, which returns a random float in [0.0, 1.0) range.
+    # @return The selected action_id.
+    def draw(self, uniform=random.random):
+        index = bisect_right(self.cumulative_weights, uniform() * self.cumulative_weights[-1])
+        return self.actions[min(index, len(self.actions) - 1)]
+
+
 ## Class for selecting the action from the list of actions and their corresponding values.
 # The interface is provided via select_action() method.
 class ActionSelector:
     ## Constructor.
     # @param self The object pointer.
-    # @param self ID of used selection method.
-    def __init__(self, selection_method_id="greedy"):
+    # @param selection_method_id ID of used selection method.
+    # @param tau Temperature factor of the "soft-max" method.
+    # @param min_tau Minimum temperature factor of the "annealed-soft-max" method.
+    # @param tau_decay Multiplier of the temperature factor of the "annealed-soft-max" method per received reward.
+    # @param ucb_factor Exploration factor of the "ucb1" method.
+    # @param start_tau Initial temperature factor of the "annealed-soft-max" method.
+    def __init__(self, selection_method_id="greedy", tau=1.0, min_tau=1.0, tau_decay=0.9, ucb_factor=2.0,
+                 start_tau=20.0):
         # Override the default method
         ## @var select_action
         # A reference to the selection method being used.
@@ -114,9 +224,33 @@ class ActionSelector:
             self.selection_method_id = "e-greedy"
 
         elif selection_method_id == "soft-max":
+            ## @var tau
+            # Temperature factor of the Gibbs-Boltzmann distribution of the soft-max method. Default value is 1.
+            self.tau = tau
             self.select_action = self.select_action_softmax
             self.selection_method_id = "soft-max"
 
+        elif selection_method_id == "annealed-soft-max":
+            ## @var start_tau
+            # Initial temperature factor of the annealed-soft-max method.
+            self.start_tau = start_tau
+            ## @var min_tau
+            # Minimum temperature factor of the annealed-soft-max method.
+            self.min_tau = min_tau
+            ## @var tau_decay
+            # Multiplier of the temperature factor of the annealed-soft-max method per received reward.
+            self.tau_decay = tau_decay
+            self.select_action = self.select_action_annealed_softmax
+            self.selection_method_id = "annealed-soft-max"
+
+        elif selection_method_id == "ucb1":
+            ## @var ucb_factor
+            # Exploration factor of the ucb1 method. The rewards are not normalized to [0, 1], but the values of the
+            # neighbors of a route differ by a few units only, so the small factors explore enough.
+            self.ucb_factor = ucb_factor
+            self.select_action = self.select_action_ucb1
+            self.selection_method_id = "ucb1"
+
         else:
             self.select_action = self.select_action_greedy
             self.selection_method_id = "greedy"
@@ -161,45 +295,73 @@ class ActionSelector:
 
     ## Select an action using "soft-max" algorithm, based on Gibbs (Boltzmann) distribution.
     # See the reference in R.Sutton's book: Reinforcement Learning: An Introduction.
+    # If the action_values object provides get_softmax_distribution(tau) method (e.g., RouteTable.Entry), the
+    # distribution is taken from it, so that it can be cached until the values change.
     # @param self The object pointer.
     # @param action_values A dictionary containing {action_id: estimation_value}.
     # @return The selected action_id.
     def select_action_softmax(self, action_values):
-        if len(action_values) == 0:
+        get_softmax_distribution = getattr(action_values, "get_softmax_distribution", None)
+        if get_softmax_distribution is not None:
+            distribution = get_softmax_distribution(self.tau)
+        else:
+            action_items = action_values.items()
+            distribution = SoftmaxDistribution(action_items, self.tau) if action_items else None
+        if distribution is None:
+            return None
+        return distribution.draw()
+
+    ## Select an action using "soft-max" algorithm with the annealed temperature.
+    # The temperature starts from start_tau, and is multiplied by tau_decay on each reward the route has received,
+    # until it reaches min_tau. So, the route explores its actions while it is young, and turns to the best ones later.
+    # The number of the rewards is taken from the get_step_total() method of the action_values object
+    # (e.g., RouteTable.Entry). If there is no such one, the initial temperature is used.
+    # @param self The object pointer.
+    # @param action_values A dictionary containing {action_id: estimation_value}.
+    # @return The selected action_id.
+    def select_action_annealed_softmax(self, action_values):
+        get_step_total = getattr(action_values, "get_step_total", None)
+        tau = self.start_tau
+        if get_step_total is not None:
+            tau = max(self.min_tau, tau * self.tau_decay ** get_step_total())
+        get_softmax_distribution = getattr(action_values, "get_softmax_distribution", None)
+        if get_softmax_distribution is not None:
+            distribution = get_softmax_distribution(tau)
+        else:
+            action_items = action_values.items()
+            distribution = SoftmaxDistribution(action_items, tau) if action_items else None
+        if distribution is None:
+            return None
+        return distribution.draw()
+
+    ## Select an action using "UCB1" (upper confidence bound) algorithm.
+    # See the reference in R.Sutton's book: Reinforcement Learning: An Introduction.
+    # Each action gets the bonus of ucb_factor * sqrt(2 * ln(N) / n) to its value, where n is the number of the rewards
+    # of the action, and N is the total number of the rewards. The actions without the rewards are selected first.
+    # The numbers of the rewards are taken from the get_step_counts() method of the action_values object
+    # (e.g., RouteTable.Entry). If there is no such one, the "greedy" selection is used.
+    # @param self The object pointer.
+    # @param action_values A dictionary containing {action_id: estimation_value}.
+    # @return The selected action_id.
+    def select_action_ucb1(self, action_values):
+        get_step_counts = getattr(action_values, "get_step_counts", None)
+        if get_step_counts is None:
+            return self.select_action_greedy(action_values)
+        step_counts = get_step_counts()
+        if len(step_counts) == 0:
             return None
-        # Define the temperature factor in the distribution
-        tau = 1
-
-        # Outputs a list of probabilities according to Gibbs-Boltzmann distribution and a given list of values
-        def calc_gibbs_boltzmann(values):
-            probabilities = []
-            # Calculate a denominator first, since it is constant
-            denominator = 0.0
-            for v in values:
-                denominator += pow(e, (v / tau))
-            # Calculate a numerator for each value, divide it by the denominator and append the result to
-            # probabilities list
-            for v in values:
-                numerator = pow(e, (v / tau))
-                probabilities.append(numerator / denominator)
-            return probabilities
-
-        # Returns a random item according to its weight. Items: {action: weight}
-        def weighted_choice(items):
-            weight_total = sum(items.values())
-
-            def choice(uniform=random.uniform):
-                n = uniform(0, weight_total)
-                item = None
-                for item in items:
-                    if n < items[item]:
-                        return item
-                    n = n - items[item]
-                return item
-            return choice()
-
-        # Calculate weights for each action value
-        action_weights = calc_gibbs_boltzmann(action_values.values())
-        # Select an action
-        action = weighted_choice(dict(zip(action_values.keys(), action_weights)))
-        return action
+        untried_action_ids = [action_id for action_id, count in step_counts.iteritems() if count == 0]
+        if untried_action_ids:
+            return random.choice(untried_action_ids)
+        log_total = 2.0 * log(sum(step_counts.values()))
+        best_action_id = None
+        best_value = None
+        for action_id, value in action_values.items():
+            count = step_counts.get(action_id)
+            # The action has been added after the counts were taken
+            if not count:
+                return action_id
+            value += self.ucb_factor * sqrt(log_total / count)
+            if best_value is None or value > best_value:
+                best_action_id, best_value = action_id, value
+        return best_action_id
@@ -0,0 +1,326 @@
+#!/usr/bin/python
+"""
+@package rl_logic.value_matrix
+Created on Oct 16, 2026
+
+@author: Dmitrii Dugaev
+
+
+This module provides the NumPy backed storage of the estimation values of the whole route table. The values and
+the step counts of the "sample average" or "ewma" estimation are stored in the dense destinations x neighbors
+matrices, where each row corresponds to a route entry, and each column corresponds to a slot of a neighbor. The rewards
+are applied to the matrix in batches, and the soft-max distributions of all the changed rows are re-calculated at once.
+The cells, which the entry doesn't have an estimated value for, contain NaN.
+NumPy is an optional dependency of the program, this module is imported only if the "numpy" value backend is chosen.
+"""
+
+# Import necessary python modules from the standard library
+import random
+import threading
+
+# Import the optional NumPy module
+import numpy
+
+
+## Class RowDistribution represents the soft-max distribution of a single row of the ValueMatrix.
+# It provides the same draw() interface as rl_logic.SoftmaxDistribution.
+class RowDistribution:
+    ## Constructor.
+    # @param self The object pointer.
+    # @param value_matrix Reference to the ValueMatrix object.
+    # @param row Row number.
+    # @param tau Temperature factor of the distribution.
+    # @param actions List of the action IDs, indexed by the column numbers.
+    # @return None
+    def __init__(self, value_matrix, row, tau, actions):
+        ## @var value_matrix
+        # Reference to the ValueMatrix object.
+        self.value_matrix = value_matrix
+        ## @var row
+        # Row number.
+        self.row = row
+        ## @var tau
+        # Temperature factor of the distribution.
+        self.tau = tau
+        ## @var actions
+        # List of the action IDs, indexed by the column numbers.
+        self.actions = actions
+
+    ## Draw a random action according to its weight.
+    # @param self The object pointer.
+    # @return The selected action_id, or None if the row is empty.
+    def draw(self):
+        column = self.value_matrix.draw_softmax(self.row, self.tau)
+        if column is None:
+            return None
+        return self.actions[column]
+
+
+## Class ValueMatrix stores the estimation values of all the route entries.
+class ValueMatrix:
+    ## Constructor.
+    # @param self The object pointer.
+    # @param est_method_id Calculation method of the estimation values: "sample_average" or "ewma".
+    # @param step_size Constant step size of the "ewma" method.
+    # @param rows Initial number of rows (destinations) of the matrix.
+    # @param columns Initial number of columns (neighbor slots) of the matrix.
+    # @return None
+    def __init__(self, est_method_id="sample_average", step_size=0.1, rows=64, columns=16):
+        ## @var values
+        # Matrix of the estimated values. The empty cells contain NaN.
+        self.values = numpy.full((rows, columns), numpy.nan)
+        ## @var counts
+        # Matrix of the step counts of the estimation.
+        self.counts = numpy.zeros((rows, columns), dtype=numpy.int64)
+        ## @var row_totals
+        # Array of the total numbers of the rewards of the rows, including the ones of the removed columns.
+        self.row_totals = numpy.zeros(rows, dtype=numpy.int64)
+        ## @var cumulative_weights
+        # Matrix of the cumulative weights of the soft-max distributions of the rows.
+        self.cumulative_weights = numpy.zeros((rows, columns))
+        ## @var dirty
+        # Array of the flags of the rows, which values have been changed since the last soft-max calculation.
+        self.dirty = numpy.ones(rows, dtype=bool)
+        ## @var taus
+        # Array of the temperature factors of the last soft-max calculations of the rows.
+        self.taus = numpy.ones(rows)
+        ## @var row_count
+        # Number of the used rows of the matrix.
+        self.row_count = 0
+        ## @var lock
+        # threading.Lock object, which serializes the writers of the matrix.
+        self.lock = threading.Lock()
+        ## @var step_size
+        # Constant step size of the "ewma" method.
+        self.step_size = step_size
+        ## @var calc_values
+        # A reference to the estimation method chosen by the est_method_id.
+        ## @var est_method_id
+        # Store an estimation method ID value.
+        if est_method_id == "ewma":
+            self.calc_values = self.calc_values_by_ewma
+            self.est_method_id = "ewma"
+        else:
+            self.calc_values = self.calc_values_by_sample_average
+            self.est_method_id = "sample_average"
+
+    ## Resize all the matrices to the given shape, keeping the current values.
+    # Must be called under the lock.
+    # @param self The object pointer.
+    # @param rows New number of rows.
+    # @param columns New number of columns.
+    # @return None
+    def resize(self, rows, columns):
+        old_rows, old_columns = self.values.shape
+        values = numpy.full((rows, columns), numpy.nan)
+        values[:old_rows, :old_columns] = self.values
+        counts = numpy.zeros((rows, columns), dtype=numpy.int64)
+        counts[:old_rows, :old_columns] = self.counts
+        taus = numpy.ones(rows)
+        taus[:old_rows] = self.taus
+        row_totals = numpy.zeros(rows, dtype=numpy.int64)
+        row_totals[:old_rows] = self.row_totals
+        # The arrays are replaced as a whole, so the lock-free readers always see the consistent ones.
+        # The cumulative weights are dropped, so all the rows are re-calculated on the next selection.
+        self.cumulative_weights = numpy.zeros((rows, columns))
+        self.values, self.counts, self.taus, self.dirty = values, counts, taus, numpy.ones(rows, dtype=bool)
+        self.row_totals = row_totals
+
+    ## Make sure the matrix has the given column. The number of the columns is doubled, if needed.
+    # Must be called under the lock.
+    # @param self The object pointer.
+    # @param column Column number.
+    # @return None
+    def ensure_column(self, column):
+        rows, columns = self.values.shape
+        if column >= columns:
+            self.resize(rows, max(column + 1, columns * 2))
+
+    ## Add a new empty row to the matrix. The number of the rows is doubled, if needed.
+    # @param self The object pointer.
+    # @return Row number.
+    def add_row(self):
+        self.lock.acquire()
+        rows, columns = self.values.shape
+        if self.row_count == rows:
+            self.resize(rows * 2, columns)
+        row = self.row_count
+        self.row_count += 1
+        self.lock.release()
+        return row
+
+    ## Initialize the value of the given cell with zero, if the cell is empty.
+    # @param self The object pointer.
+    # @param row Row number.
+    # @param column Column number.
+    # @return None
+    def init_value(self, row, column):
+        self.lock.acquire()
+        self.ensure_column(column)
+        if numpy.isnan(self.values[row, column]):
+            self.values[row, column] = 0.0
+            self.counts[row, column] = 0
+            self.dirty[row] = True
+        self.lock.release()
+
+    ## Insert the column of the new neighbor: initialize all its empty cells with zero.
+    # @param self The object pointer.
+    # @param column Column number.
+    # @return None
+    def insert_column(self, column):
+        self.lock.acquire()
+        self.ensure_column(column)
+        values = self.values[:self.row_count, column]
+        empty = numpy.isnan(values)
+        values[empty] = 0.0
+        self.counts[:self.row_count, column][empty] = 0
+        self.dirty[:self.row_count][empty] = True
+        self.lock.release()
+
+    ## Remove the column of the expired neighbor: clear all its cells.
+    # @param self The object pointer.
+    # @param column Column number.
+    # @return None
+    def remove_column(self, column):
+        self.lock.acquire()
+        if column < self.values.shape[1]:
+            self.values[:, column] = numpy.nan
+            self.counts[:, column] = 0
+            self.dirty[:] = True
+        self.lock.release()
+
+    ## Apply the batch of rewards to the matrix, using the chosen estimation method.
+    # The rewards for the same cell are applied together in a single step, and the result is rounded once.
+    # @param self The object pointer.
+    # @param rows List of row numbers.
+    # @param columns List of column numbers.
+    # @param rewards List of reward values.
+    # @return None
+    def apply_rewards(self, rows, columns, rewards):
+        if not len(rewards):
+            return
+        rows = numpy.asarray(rows, dtype=numpy.int64)
+        columns = numpy.asarray(columns, dtype=numpy.int64)
+        rewards = numpy.asarray(rewards, dtype=numpy.float64)
+        self.lock.acquire()
+        self.ensure_column(int(columns.max()))
+        # Sum up the rewards and their numbers per cell
+        cells, inverse = numpy.unique(rows * self.values.shape[1] + columns, return_inverse=True)
+        reward_sums = numpy.bincount(inverse, weights=rewards)
+        reward_counts = numpy.bincount(inverse)
+        cell_rows, cell_columns = numpy.divmod(cells, self.values.shape[1])
+        # The empty cells start from the zero value and the zero count
+        values = numpy.nan_to_num(self.values[cell_rows, cell_columns])
+        counts = self.counts[cell_rows, cell_columns]
+        self.values[cell_rows, cell_columns] = numpy.round(self.calc_values(values, counts, reward_sums,
+                                                                           reward_counts), 2)
+        self.counts[cell_rows, cell_columns] = counts + reward_counts
+        numpy.add.at(self.row_totals, cell_rows, reward_counts)
+        self.dirty[cell_rows] = True
+        self.lock.release()
+
+    ## Default method for calculating the new values of the cells. It is overridden in the constructor.
+    # Calculate the values by using a simple "sample average" method.
+    # @param self The object pointer.
+    # @param values Array of the current values of the cells.
+    # @param counts Array of the current step counts of the cells.
+    # @param reward_sums Array of the sums of the rewards of the cells.
+    # @param reward_counts Array of the numbers of the rewards of the cells.
+    # @return Array of the new values.
+    def calc_values_by_sample_average(self, values, counts, reward_sums, reward_counts):
+        return (values * counts + reward_sums) / (counts + reward_counts)
+
+    ## Calculate the values by using the exponential recency-weighted average, i.e. with a constant step size.
+    # The k rewards of a cell are applied as their mean with the step size of 1 - (1 - step_size) ^ k, which is the
+    # total weight they would have got if applied one by one. The first rewards of a cell are taken as its value.
+    # @param self The object pointer.
+    # @param values Array of the current values of the cells.
+    # @param counts Array of the current step counts of the cells.
+    # @param reward_sums Array of the sums of the rewards of the cells.
+    # @param reward_counts Array of the numbers of the rewards of the cells.
+    # @return Array of the new values.
+    def calc_values_by_ewma(self, values, counts, reward_sums, reward_counts):
+        reward_means = reward_sums / reward_counts
+        steps = 1.0 - (1.0 - self.step_size) ** reward_counts
+        return numpy.where(counts == 0, reward_means, values + steps * (reward_means - values))
+
+    ## Get the values of the given row.
+    # @param self The object pointer.
+    # @param row Row number.
+    # @return list() of the values, indexed by the column numbers. The empty cells contain NaN.
+    def get_row(self, row):
+        return self.values[row].tolist()
+
+    ## Get the step counts of the given row.
+    # @param self The object pointer.
+    # @param row Row number.
+    # @return list() of the step counts, indexed by the column numbers.
+    def get_row_counts(self, row):
+        return self.counts[row].tolist()
+
+    ## Get the total number of the rewards of the given row, including the ones of the removed columns.
+    # @param self The object pointer.
+    # @param row Row number.
+    # @return Number of the rewards.
+    def get_row_total(self, row):
+        return int(self.row_totals[row])
+
+    ## Re-calculate the soft-max distributions of all the changed rows at once, each with its own temperature factor.
+    # Must be called under the lock.
+    # @param self The object pointer.
+    # @return None
+    def calc_softmax(self):
+        rows = numpy.flatnonzero(self.dirty[:self.row_count])
+        if not len(rows):
+            return
+        values = self.values[rows]
+        present = ~numpy.isnan(values)
+        values = numpy.where(present, values, -numpy.inf)
+        # The maximum value of each row is subtracted from its values, which keeps the exponents from overflowing
+        max_values = values.max(axis=1)
+        max_values[numpy.isinf(max_values)] = 0.0
+        weights = numpy.where(present, numpy.exp((values - max_values[:, numpy.newaxis]) /
+                                                 self.taus[rows][:, numpy.newaxis]), 0.0)
+        self.cumulative_weights[rows] = numpy.cumsum(weights, axis=1)
+        self.dirty[rows] = False
+
+    ## Draw a random column of the given row according to the soft-max distribution of the row's values.
+    # @param self The object pointer.
+    # @param row Row number.
+    # @param tau Temperature factor of the distribution.
+    # @param uniform A function, which returns a random float in [0.0, 1.0) range.
+    # @return Column number, or None if the row is empty.
+    def draw_softmax(self, row, tau, uniform=random.random):
+        if self.dirty[row] or tau != self.taus[row]:
+            self.lock.acquire()
+            if tau != self.taus[row]:
+                self.taus[row] = tau
+                self.dirty[row] = True
+            self.calc_softmax()
+            self.lock.release()
+        cumulative_weights = self.cumulative_weights[row]
+        total = cumulative_weights[-1]
+        if total <= 0.0:
+            # A concurrent resize() may have replaced the weights with the zeroed ones after the check above, so the
+            # row is re-calculated under the lock before it is considered empty
+            self.lock.acquire()
+            self.taus[row] = tau
+            self.dirty[row] = True
+            self.calc_softmax()
+            cumulative_weights = self.cumulative_weights[row]
+            self.lock.release()
+            total = cumulative_weights[-1]
+            if total <= 0.0:
+                return None
+        column = int(numpy.searchsorted(cumulative_weights, uniform() * total, side="right"))
+        # Guard against the rounding of the uniform value up to the total weight
+        return min(column, int(numpy.searchsorted(cumulative_weights, total, side="left")))
+
+    ## Get the soft-max distribution of the given row.
+    # @param self The object pointer.
+    # @param row Row number.
+    # @param tau Temperature factor of the distribution.
+    # @param actions List of the action IDs, indexed by the column numbers.
+    # @return RowDistribution object.
+    def get_softmax_distribution(self, row, tau, actions):
+        return RowDistribution(self, row, tau, actions)
@@ -13,22 +13,23 @@ It also performs all log writing operations in a single thread, while receiving
 # Import necessary python modules from the standard library
 import os
 import threading
-import Queue
 import logging
 from logging.handlers import RotatingFileHandler
+from collections import deque
 
 # Import the necessary modules of the program
-from conf import LOG_LEVEL
+from conf import LOG_LEVEL, LOG_QUEUE_SIZE, LOG_DROP_POLICY, LOG_SAMPLE_RATE, LOG_BATCH_SIZE
 
 ## @var ABSOLUTE_PATH
 # Define an absolute path to the program's directory.
 ABSOLUTE_PATH = os.path.dirname(os.path.abspath(__file__))
 ## @var PATH_TO_LOGS
-# Define a default path to log directory.
-PATH_TO_LOGS = "/var/log/adhoc_routing/"
-## @var LOG_QUEUE
-# Define a global queue for receiving the methods from the Logger objects and its arguments.
-LOG_QUEUE = Queue.Queue()
+# Define a default path to log directory. It can be overridden by the ADHOC_ROUTING_LOG_DIR environment variable, e.g.
+# for running the emulated nodes (see Emulator module) without the root permissions.
+PATH_TO_LOGS = os.path.join(os.environ.get("ADHOC_ROUTING_LOG_DIR", "/var/log/adhoc_routing"), "")
+## @var BATCH_HANDLERS
+# List of all created BatchRotatingFileHandler objects, which are flushed by the log thread after each batch.
+BATCH_HANDLERS = list()
 
 ## @var LOG_LEVEL
 # Set a global variable LOG_LEVEL according to the string variable in conf file.
@@ -48,6 +49,174 @@ else:
     LOG_LEVEL = logging.INFO
 
 
+## Bounded queue of the log records.
+# When the queue is full, the records are dropped according to the given policy, and the dropped records are counted.
+class LogQueue:
+    ## Constructor.
+    # @param self The object pointer.
+    # @param maxsize Maximum number of the queued records.
+    # @param drop_policy Policy applied when the queue is full: "drop_new", "drop_old" or "sample".
+    # @param sample_rate Every sample_rate-th incoming record is kept, if the "sample" policy is used.
+    # @return None
+    def __init__(self, maxsize, drop_policy, sample_rate):
+        ## @var records
+        # Queued log records. Format: deque([(log_object_method, msg, args, kwargs)]).
+        self.records = deque()
+        ## @var maxsize
+        # Maximum number of the queued records.
+        self.maxsize = max(1, maxsize)
+        ## @var drop_policy
+        # Policy applied when the queue is full.
+        self.drop_policy = drop_policy
+        ## @var sample_rate
+        # Every sample_rate-th incoming record is kept, if the "sample" policy is used.
+        self.sample_rate = max(1, sample_rate)
+        ## @var overflow_count
+        # Number of the records, which have arrived while the queue was full.
+        self.overflow_count = 0
+        ## @var dropped
+        # Counters of the dropped records. Format: {log_method_name: count}.
+        self.dropped = dict()
+        ## @var not_empty
+        # Condition object for waiting for the new records.
+        self.not_empty = threading.Condition(threading.Lock())
+
+    ## Count the dropped record.
+    # @param self The object pointer.
+    # @param record The dropped log record.
+    # @return None
+    def count_dropped(self, record):
+        name = record[0].__name__
+        self.dropped[name] = self.dropped.get(name, 0) + 1
+
+    ## Put the record to the queue.
+    # @param self The object pointer.
+    # @param record Log record: (log_object_method, msg, args, kwargs).
+    # @return True if the record has been queued, False if it has been dropped.
+    def put(self, record):
+        self.not_empty.acquire()
+        try:
+            if len(self.records) >= self.maxsize:
+                self.overflow_count += 1
+                if self.drop_policy == "drop_old" or \
+                        (self.drop_policy == "sample" and self.overflow_count % self.sample_rate == 0):
+                    self.count_dropped(self.records.popleft())
+                else:
+                    self.count_dropped(record)
+                    return False
+
+            self.records.append(record)
+            self.not_empty.notify()
+            return True
+
+        finally:
+            self.not_empty.release()
+
+    ## Get a batch of the records from the queue. Block until at least one record is available, or until woken up by
+    # the LogQueue.wake_up method.
+    # @param self The object pointer.
+    # @param max_records Maximum number of the records in the batch.
+    # @return list() of the records.
+    def get_batch(self, max_records):
+        self.not_empty.acquire()
+        try:
+            if not self.records:
+                self.not_empty.wait()
+
+            return [self.records.popleft() for _ in xrange(min(max_records, len(self.records)))]
+
+        finally:
+            self.not_empty.release()
+
+    ## Wake up the thread, waiting in the LogQueue.get_batch method.
+    # @param self The object pointer.
+    # @return None
+    def wake_up(self):
+        self.not_empty.acquire()
+        self.not_empty.notify_all()
+        self.not_empty.release()
+
+    ## Check if the queue is empty.
+    # @param self The object pointer.
+    # @return True if the queue is empty, False otherwise.
+    def empty(self):
+        return not self.records
+
+    ## Get the total number of the dropped records.
+    # @param self The object pointer.
+    # @return Number of the dropped records.
+    def get_dropped_count(self):
+        return sum(self.dropped.values())
+
+
+## @var LOG_QUEUE
+# Define a global bounded queue for receiving the methods from the Logger objects and its arguments.
+LOG_QUEUE = LogQueue(LOG_QUEUE_SIZE, LOG_DROP_POLICY, LOG_SAMPLE_RATE)
+
+
+## Rotating file handler, which collects the formatted records and writes them to the file at once.
+# The records are written by the BatchRotatingFileHandler.flush_batch method, which is called by the log thread
+# after processing each batch of the records from the log queue.
+class BatchRotatingFileHandler(RotatingFileHandler):
+    ## Constructor.
+    # @param self The object pointer.
+    # @param *args Arguments to the RotatingFileHandler constructor.
+    # @param **kwargs Key arguments to the RotatingFileHandler constructor.
+    # @return None
+    def __init__(self, *args, **kwargs):
+        RotatingFileHandler.__init__(self, *args, **kwargs)
+        ## @var pending
+        # List of the formatted records, which haven't been written to the file yet.
+        self.pending = list()
+
+    ## Format the record and add it to the pending list.
+    # @param self The object pointer.
+    # @param record logging.LogRecord object.
+    # @return None
+    def emit(self, record):
+        try:
+            self.pending.append(self.format(record) + "\n")
+        except Exception:
+            self.handleError(record)
+
+    ## Write all the pending records to the file with a single write call, rotating the file beforehand if needed.
+    # @param self The object pointer.
+    # @return None
+    def flush_batch(self):
+        self.acquire()
+        try:
+            if not self.pending:
+                return None
+
+            data = "".join(self.pending)
+            del self.pending[:]
+
+            if self.stream is None:
+                self.stream = self._open()
+
+            if self.maxBytes > 0:
+                self.stream.seek(0, 2)
+                if self.stream.tell() + len(data) >= self.maxBytes:
+                    self.doRollover()
+
+            self.stream.write(data)
+            self.stream.flush()
+
+        # Failing to write the logs should never break the log thread
+        except (IOError, OSError):
+            pass
+
+        finally:
+            self.release()
+
+
+## Write the pending records of all the batch handlers to the files.
+# @return None
+def flush_batch_handlers():
+    for handler in BATCH_HANDLERS:
+        handler.flush_batch()
+
+
 ## A thread class which performs all writing operations to the given logging instance.
 class LoggingHandler(threading.Thread):
     ## Constructor.
@@ -69,11 +238,19 @@ class LoggingHandler(threading.Thread):
     def run(self):
         self.running = True
         self.root_logger.info("STARTING THE LOG THREAD...")
+        dropped_count = 0
         while self.running:
-            # loglevel, msg, args, kwargs = self.logging_queue.get()
-            log_object_method, msg, args, kwargs = LOG_QUEUE.get()
-            # Execute the method
-            log_object_method(msg, *args, **kwargs)
+            for log_object_method, msg, args, kwargs in LOG_QUEUE.get_batch(LOG_BATCH_SIZE):
+                # Execute the method
+                log_object_method(msg, *args, **kwargs)
+
+            # Report the records, which have been dropped since the previous batch
+            if LOG_QUEUE.get_dropped_count() != dropped_count:
+                self.root_logger.warning("The log queue is full. Dropped log records so far: %s", LOG_QUEUE.dropped)
+                dropped_count = LOG_QUEUE.get_dropped_count()
+
+            # Write the whole batch to the log files
+            flush_batch_handlers()
 
     ## Stop and quit the thread operation.
     # @param self The object pointer.
@@ -81,11 +258,49 @@ class LoggingHandler(threading.Thread):
     def quit(self):
         self.running = False
         self.root_logger.info("STOPPING THE LOG THREAD...")
+        LOG_QUEUE.wake_up()
+
+
+## Log method, which is used instead of the LogWrapper methods for the disabled log levels.
+# @param msg Message to be logged.
+# @param *args Arguments to the message, if any.
+# @param **kwargs Key arguments to the message, if any.
+# @return None
+def skip_log(msg, *args, **kwargs):
+    pass
+
+
+## Class for the lazy formatting of the log message arguments.
+# The given function is called only when the message is actually written by the LoggingHandler thread, so the
+# conversion cost is not paid in the calling thread.
+# Note that the arguments are referenced, not copied, and should not be changed after the log call.
+class LazyFormat:
+    ## Constructor.
+    # @param self The object pointer.
+    # @param function Function, which returns the value to be logged.
+    # @param *args Arguments to the function.
+    # @return None
+    def __init__(self, function, *args):
+        ## @var function
+        # Function, which returns the value to be logged.
+        self.function = function
+        ## @var args
+        # Arguments to the function.
+        self.args = args
+
+    ## Default print method.
+    # @param self The object pointer.
+    # @return String representation of the function's result.
+    def __str__(self):
+        return str(self.function(*self.args))
 
 
 ## Class for overriding default logging methods.
 # Handles the log methods (info, debug, error, etc.) called from the modules, and forwards them into the global queue
 # so the LoggingHandler thread will perform the actual writing operation.
+# The methods of the log levels, which are disabled for the logger object, are replaced with the skip_log function,
+# so that such calls do not create and enqueue any log records. The expensive arguments on the hot paths should be
+# additionally guarded with the LogWrapper.<level>_enabled flags, or wrapped into LazyFormat objects.
 class LogWrapper:
     ## Constructor.
     # @param self The object pointer.
@@ -95,6 +310,27 @@ class LogWrapper:
         ## @var logger_object
         # Reference to the Python logger object.
         self.logger_object = logger_object
+        ## @var debug_enabled
+        # Flag, which indicates whether the DEBUG level messages are written or not.
+        self.debug_enabled = logger_object.isEnabledFor(logging.DEBUG)
+        ## @var info_enabled
+        # Flag, which indicates whether the INFO level messages are written or not.
+        self.info_enabled = logger_object.isEnabledFor(logging.INFO)
+        ## @var warning_enabled
+        # Flag, which indicates whether the WARNING level messages are written or not.
+        self.warning_enabled = logger_object.isEnabledFor(logging.WARNING)
+        ## @var error_enabled
+        # Flag, which indicates whether the ERROR level messages are written or not.
+        self.error_enabled = logger_object.isEnabledFor(logging.ERROR)
+        ## @var critical_enabled
+        # Flag, which indicates whether the CRITICAL level messages are written or not.
+        self.critical_enabled = logger_object.isEnabledFor(logging.CRITICAL)
+
+        # Replace the methods of the disabled levels
+        for level_name in ("debug", "info", "warning", "error", "critical"):
+            if not getattr(self, level_name + "_enabled"):
+                setattr(self, level_name, skip_log)
+
         self.info("THE LOG INSTANCE IS CREATED: %s", self.logger_object.name)
 
     # Define callbacks which will be used by other modules to send their logging messages to.
@@ -155,8 +391,8 @@ def create_routing_log(log_name, log_hierarchy):
 
     log_formatter = logging.Formatter('%(asctime)s %(levelname)s %(funcName)s(%(lineno)d) %(message)s')
     log_file = PATH_TO_LOGS + log_name
-    log_handler = RotatingFileHandler(log_file, mode='a', maxBytes=5*1024*1024,
-                                      backupCount=10, encoding=None, delay=0)
+    log_handler = BatchRotatingFileHandler(log_file, mode='a', maxBytes=5*1024*1024,
+                                           backupCount=10, encoding=None, delay=0)
 
     log_handler.setFormatter(log_formatter)
     log_handler.setLevel(LOG_LEVEL)
@@ -174,6 +410,7 @@ def create_routing_log(log_name, log_hierarchy):
 
     routing_log.setLevel(LOG_LEVEL)
     routing_log.addHandler(log_handler)
+    BATCH_HANDLERS.append(log_handler)
 
     # Create and return the log wrapper object
     log_wrapper_object = LogWrapper(routing_log)